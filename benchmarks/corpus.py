@@ -0,0 +1,228 @@
+import argparse
+import json
+import logging
+import os
+import random
+from typing import Any, Dict, List, Optional, Sequence
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+FORMATS = ("txt", "pdf", "docx")
+
+# Canonical skills of the parser's taxonomy, plus skills it does not know (noise for the matchers)
+TAXONOMY_SKILLS = [
+    "Python", "Java", "JavaScript", "HTML", "CSS", "SQL", "React", "Angular", "Vue", "Node.js", "Django",
+    "Flask", "Spring", "Docker", "Kubernetes", "AWS", "Azure", "GCP", "Machine Learning", "Data Science",
+    "AI", "DevOps", "CI/CD", "Git", "Agile", "Scrum", "REST API", "GraphQL"
+]
+OTHER_SKILLS = [
+    "Terraform", "Kafka", "Spark", "Airflow", "Redis", "PostgreSQL", "MongoDB", "Go", "Rust", "Scala",
+    "TypeScript", "Tableau", "Excel", "Figma", "Jira", "Linux", "Bash", "Statistics", "Pandas", "NumPy"
+]
+
+FIRST_NAMES = ["Alex", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Sam", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Okafor", "Novak", "Silva", "Kumar", "Larsen", "Moreau", "Tanaka"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Data Scientist", "DevOps Engineer",
+          "Backend Developer", "Engineering Manager", "Data Analyst", "Lead Architect", "Junior Developer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Systems", "Hooli"]
+VERBS = ["Led", "Designed", "Implemented", "Developed", "Built", "Optimized", "Improved", "Mentored"]
+OBJECTS = ["a data pipeline", "the payments API", "an internal platform", "a recommendation service",
+           "the CI pipeline", "a reporting dashboard", "a customer portal", "the search backend"]
+DEGREES = ["Bachelor of Science in Computer Science", "Master of Science in Data Science",
+           "Bachelor of Engineering", "PhD in Statistics", "Associate Degree in IT"]
+SCHOOLS = ["State University", "Institute of Technology", "City College", "National University"]
+CERTIFICATIONS = ["AWS Certified Solutions Architect", "PMP", "CISSP", "Certified Kubernetes Administrator"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September",
+          "October", "November", "December"]
+
+# Most recent year in generated dates (fixed, so a seed gives the same corpus on any day)
+CORPUS_YEAR = 2024
+
+# Characters per PDF line and lines per PDF page
+_PDF_LINE_WIDTH = 95
+_PDF_PAGE_LINES = 60
+
+
+def skill_weights(skills: Sequence[str], distribution: str = "zipf", zipf_s: float = 1.1) -> List[float]:
+    """Sampling weight of each skill: uniform, or Zipf-like so a few skills dominate the corpus."""
+    if distribution == "uniform":
+        return [1.0] * len(skills)
+    if distribution == "zipf":
+        return [1.0 / (rank ** zipf_s) for rank in range(1, len(skills) + 1)]
+    raise ValueError(f"Unknown skill distribution '{distribution}' (uniform or zipf)")
+
+
+def _sample_skills(rng: random.Random, skills: Sequence[str], weights: Sequence[float], k: int) -> List[str]:
+    chosen: List[str] = []
+    while len(chosen) < min(k, len(skills)):
+        skill = rng.choices(skills, weights)[0]
+        if skill not in chosen:
+            chosen.append(skill)
+    return chosen
+
+
+def generate_resume_text(rng: random.Random, experience_entries: int = 3, bullets_per_entry: int = 4,
+                         skills_per_entry: int = 3, distribution: str = "zipf") -> str:
+    """Plain-text resume laid out the way the parser expects (sections separated by blank lines)."""
+    skills = TAXONOMY_SKILLS + OTHER_SKILLS
+    weights = skill_weights(skills, distribution)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(" ", ".")
+    lines = [
+        name,
+        f"{handle}@example.com | +1-555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        "",
+        "Summary",
+        f"{rng.choice(TITLES)} skilled in {', '.join(_sample_skills(rng, skills, weights, 3))}.",
+        "",
+        "Experience"
+    ]
+    year = CORPUS_YEAR
+    for _ in range(experience_entries):
+        start = year - rng.randint(1, 4)
+        # Dates share the title line: the parser starts a new entry at every capitalized line
+        lines.append(f"{rng.choice(TITLES)} | {rng.choice(COMPANIES)} | {rng.choice(MONTHS)} {start} - {rng.choice(MONTHS)} {year}")
+        entry_skills = _sample_skills(rng, skills, weights, skills_per_entry)
+        for i in range(bullets_per_entry):
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {entry_skills[i % len(entry_skills)]}")
+        year = start
+    lines += [
+        "",
+        "Education",
+        rng.choice(DEGREES),
+        f"{rng.choice(SCHOOLS)}, {year - rng.randint(0, 3)}",
+        "",
+        "Skills",
+        ", ".join(_sample_skills(rng, skills, weights, rng.randint(4, 12))),
+        "",
+        "Certifications",
+        rng.choice(CERTIFICATIONS)
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(text: str, path: str):
+    """Write text as a minimal PDF (Helvetica, one text object per page) without a PDF library."""
+    lines: List[str] = []
+    for line in text.encode("latin-1", "replace").decode("latin-1").split("\n"):
+        lines.extend([line[i:i + _PDF_LINE_WIDTH] for i in range(0, len(line), _PDF_LINE_WIDTH)] or [""])
+    pages = [lines[i:i + _PDF_PAGE_LINES] for i in range(0, len(lines), _PDF_PAGE_LINES)] or [[]]
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then a (page, content stream) pair per page
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{page_id} 0 R' for page_id in page_ids)}] /Count {len(pages)} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    for page_id, page_lines in zip(page_ids, pages):
+        stream = "BT /F1 10 Tf 12 TL 50 790 Td\n" + "".join(
+            f"({_pdf_escape(line)}) Tj T*\n" for line in page_lines
+        ) + "ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def write_docx(text: str, path: str):
+    """Write text as a DOCX document, one paragraph per line."""
+    from docx import Document
+
+    document = Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def generate_corpus(directory: str, count: int = 50, formats: Sequence[str] = FORMATS,
+                    experience_entries: int = 3, bullets_per_entry: int = 4, skills_per_entry: int = 3,
+                    distribution: str = "zipf", seed: int = 0) -> List[Dict[str, Any]]:
+    """Write count synthetic resumes in each format to directory, with a manifest.json describing them.
+
+    The same seed always produces the same corpus.
+    """
+    unknown = [fmt for fmt in formats if fmt not in FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown formats {unknown}, expected some of {list(FORMATS)}")
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    manifest: List[Dict[str, Any]] = []
+    writers = {"pdf": write_pdf, "docx": write_docx}
+    for i in range(count):
+        text = generate_resume_text(rng, experience_entries, bullets_per_entry, skills_per_entry, distribution)
+        for fmt in formats:
+            path = os.path.join(directory, f"resume_{i:05d}.{fmt}")
+            if fmt == "txt":
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(text)
+            else:
+                writers[fmt](text, path)
+            manifest.append({"path": os.path.basename(path), "format": fmt, "bytes": os.path.getsize(path)})
+    config = {
+        "count": count, "formats": list(formats), "experience_entries": experience_entries,
+        "bullets_per_entry": bullets_per_entry, "skills_per_entry": skills_per_entry,
+        "distribution": distribution, "seed": seed
+    }
+    with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"config": config, "files": manifest}, f, indent=2)
+    logger.info(f"Wrote {len(manifest)} synthetic resumes to {directory}")
+    return manifest
+
+
+def load_manifest(directory: str) -> Optional[Dict[str, Any]]:
+    path = os.path.join(directory, "manifest.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def add_corpus_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--count", type=int, default=50, help="resumes per format (default 50)")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="comma-separated formats (default txt,pdf,docx)")
+    parser.add_argument("--entries", type=int, default=3, help="experience entries per resume (default 3)")
+    parser.add_argument("--bullets", type=int, default=4, help="bullet lines per experience entry (default 4)")
+    parser.add_argument("--skills-per-entry", type=int, default=3, help="distinct skills per entry (default 3)")
+    parser.add_argument("--distribution", choices=["zipf", "uniform"], default="zipf",
+                        help="skill frequency distribution (default zipf)")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def corpus_from_args(directory: str, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    return generate_corpus(
+        directory, args.count, [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()],
+        args.entries, args.bullets, args.skills_per_entry, args.distribution, args.seed
+    )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume corpus for benchmarking.")
+    parser.add_argument("--out", default="bench_corpus", help="output directory (default bench_corpus)")
+    add_corpus_arguments(parser)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    corpus_from_args(args.out, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from benchmarks.corpus import add_corpus_arguments, corpus_from_args, load_manifest
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+IN_PROCESS_BENCHMARKS = ("extract_pdf", "extract_pdf_backends", "extract_docx", "extract_entities", "rank_resume", "score_batch")
+HTTP_BENCHMARKS = ("http_upload_resume", "http_analyze_resume", "http_batch_analyze", "http_top_k")
+
+# Job every resume is ranked against
+BENCH_JOB = {
+    "title": "Senior Backend Engineer",
+    "required_skills": ["Python", "SQL", "Docker", "AWS"],
+    "preferred_skills": ["Kubernetes", "Kafka", "CI/CD"],
+    "experience_years": 5,
+    "education_level": "Bachelor's Degree",
+    "industry": "Technology",
+    "keywords": ["backend", "api", "cloud"],
+    "required_certifications": ["AWS Certified Solutions Architect"],
+    "company_values": ["innovation", "collaboration"]
+}
+
+# Latency metrics where higher is worse, compared against the baseline
+LATENCY_METRICS = ("p50_ms", "p95_ms")
+
+
+def summarize(latencies: Sequence[float], wall_seconds: float) -> Dict[str, float]:
+    """Throughput and latency percentiles (nearest-rank) of one benchmark."""
+    ordered = sorted(latencies)
+    count = len(ordered)
+
+    def percentile(p: float) -> float:
+        return ordered[min(count - 1, max(0, math.ceil(p / 100 * count) - 1))] * 1000 if count else 0.0
+
+    return {
+        "count": count,
+        "wall_seconds": round(wall_seconds, 6),
+        "throughput_per_s": round(count / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+        "mean_ms": round(sum(ordered) / count * 1000, 4) if count else 0.0,
+        "p50_ms": round(percentile(50), 4),
+        "p90_ms": round(percentile(90), 4),
+        "p95_ms": round(percentile(95), 4),
+        "p99_ms": round(percentile(99), 4),
+        "max_ms": round(ordered[-1] * 1000, 4) if count else 0.0
+    }
+
+
+def measure(fn: Callable[[Any], Any], items: Sequence[Any], repeat: int = 1, warmup: int = 1,
+            concurrency: int = 1) -> Dict[str, float]:
+    """Call fn once per item (repeat times over the items) and summarize the per-call latencies.
+
+    The first `warmup` items are run once beforehand and not measured (model
+    loading, lazy pools). With repeat > 1 later rounds see warm caches.
+    """
+    for item in items[:warmup]:
+        fn(item)
+    work = [item for _ in range(repeat) for item in items]
+
+    def timed_call(item) -> float:
+        start = time.perf_counter()
+        fn(item)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    if concurrency <= 1:
+        latencies = [timed_call(item) for item in work]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(timed_call, work))
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def _corpus_files(corpus: str, manifest: Dict[str, Any], fmt: str) -> List[str]:
+    return [os.path.join(corpus, entry["path"]) for entry in manifest["files"] if entry["format"] == fmt]
+
+
+def _read_texts(corpus: str, manifest: Dict[str, Any]) -> List[str]:
+    texts = []
+    for path in _corpus_files(corpus, manifest, "txt"):
+        with open(path, encoding="utf-8") as f:
+            texts.append(f.read())
+    return texts
+
+
+def run_in_process(corpus: str, manifest: Dict[str, Any], selected: Sequence[str], repeat: int) -> Dict[str, Any]:
+    """Benchmark text extraction, entity extraction and ranking in this process."""
+    results: Dict[str, Any] = {}
+    if "extract_pdf" in selected:
+        from parser.extract_text import extract_text_from_pdf
+        files = _corpus_files(corpus, manifest, "pdf")
+        if files:
+            results["extract_pdf"] = measure(extract_text_from_pdf, files, repeat)
+    if "extract_pdf_backends" in selected:
+        # Every installed PDF backend on the same files, to pick PDF_BACKEND for this machine
+        from parser.extract_text import available_pdf_backends, extract_text_from_pdf_bytes
+        files = _corpus_files(corpus, manifest, "pdf")
+        contents = []
+        for path in files:
+            with open(path, "rb") as f:
+                contents.append(f.read())
+        for backend in available_pdf_backends() if contents else []:
+            results[f"extract_pdf[{backend}]"] = measure(
+                lambda data, backend=backend: extract_text_from_pdf_bytes(data, backend), contents, repeat
+            )
+    if "extract_docx" in selected:
+        from parser.extract_text import extract_text_from_docx
+        files = _corpus_files(corpus, manifest, "docx")
+        if files:
+            results["extract_docx"] = measure(extract_text_from_docx, files, repeat)
+
+    if not {"extract_entities", "rank_resume", "score_batch"} & set(selected):
+        return results
+    from parser.extract_entities import extract_entities
+    texts = _read_texts(corpus, manifest)
+    if not texts:
+        logger.warning("The corpus has no txt resumes, skipping the parsing and ranking benchmarks")
+        return results
+    if "extract_entities" in selected:
+        results["extract_entities"] = measure(extract_entities, texts, repeat)
+
+    if {"rank_resume", "score_batch"} & set(selected):
+        from models.job_model import JobRequirement
+        from parser.resume_ranker import ResumeRanker
+        resumes = [extract_entities(text) for text in texts]
+        job = JobRequirement(**BENCH_JOB)
+        ranker = ResumeRanker()
+        if "rank_resume" in selected:
+            results["rank_resume"] = measure(lambda resume: ranker.rank_resume(resume, job), resumes, repeat)
+        if "score_batch" in selected:
+            # One call scores the whole corpus; throughput is batches per second
+            stats = measure(lambda batch: ranker.score_components(batch, job), [resumes], max(repeat, 5))
+            stats["batch_size"] = len(resumes)
+            results["score_batch"] = stats
+    return results
+
+
+def _post(url: str, body: bytes, content_type: str, timeout: float = 300) -> Any:
+    request = urllib.request.Request(url, data=body, method="POST", headers={"Content-Type": content_type})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def _post_json(url: str, payload: Any) -> Any:
+    return _post(url, json.dumps(payload).encode("utf-8"), "application/json")
+
+
+def _post_file(url: str, path: str) -> Any:
+    boundary = uuid.uuid4().hex
+    with open(path, "rb") as f:
+        contents = f.read()
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{os.path.basename(path)}\"\r\n"
+        f"Content-Type: application/octet-stream\r\n\r\n"
+    ).encode("utf-8") + contents + f"\r\n--{boundary}--\r\n".encode("utf-8")
+    return _post(url, body, f"multipart/form-data; boundary={boundary}")
+
+
+def run_http(base_url: str, corpus: str, manifest: Dict[str, Any], selected: Sequence[str], repeat: int,
+             concurrency: int) -> Dict[str, Any]:
+    """Benchmark the HTTP endpoints of a running server end-to-end.
+
+    Uploads hit the server's parse cache after the first round; start it with
+    PARSE_CACHE_BACKEND=none to measure parsing on every request.
+    """
+    base_url = base_url.rstrip("/")
+    results: Dict[str, Any] = {}
+    files = _corpus_files(corpus, manifest, "pdf") + _corpus_files(corpus, manifest, "docx")
+    if not files:
+        logger.warning("The corpus has no pdf or docx resumes, skipping the HTTP benchmarks")
+        return results
+
+    if "http_upload_resume" in selected:
+        results["http_upload_resume"] = measure(
+            lambda path: _post_file(f"{base_url}/upload-resume", path), files, repeat, concurrency=concurrency
+        )
+    resumes = [_post_file(f"{base_url}/upload-resume", path) for path in files]
+    if "http_analyze_resume" in selected:
+        results["http_analyze_resume"] = measure(
+            lambda resume: _post_json(f"{base_url}/analyze-resume", {"resume_data": resume, "job_requirement": BENCH_JOB}),
+            resumes, repeat, concurrency=concurrency
+        )
+    if "http_batch_analyze" in selected:
+        stats = measure(
+            lambda batch: _post_json(f"{base_url}/batch-analyze", {"resumes": batch, "job_requirement": BENCH_JOB}),
+            [resumes], max(repeat, 3), concurrency=concurrency
+        )
+        stats["batch_size"] = len(resumes)
+        results["http_batch_analyze"] = stats
+    if "http_top_k" in selected:
+        stats = measure(
+            lambda batch: _post_json(
+                f"{base_url}/batch-analyze/top-k", {"resumes": batch, "job_requirement": BENCH_JOB, "k": 5}
+            ),
+            [resumes], max(repeat, 3), concurrency=concurrency
+        )
+        stats["batch_size"] = len(resumes)
+        results["http_top_k"] = stats
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2) -> List[Dict[str, Any]]:
+    """Benchmarks whose latency grew, or throughput fell, by more than threshold relative to the baseline."""
+    regressions = []
+    for name, current in results.get("benchmarks", {}).items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous:
+            continue
+        for metric in LATENCY_METRICS:
+            before, after = previous.get(metric, 0.0), current.get(metric, 0.0)
+            if before > 0 and after > before * (1 + threshold):
+                regressions.append({"benchmark": name, "metric": metric, "baseline": before, "current": after,
+                                    "change": round(after / before - 1, 4)})
+        before, after = previous.get("throughput_per_s", 0.0), current.get("throughput_per_s", 0.0)
+        if before > 0 and after < before * (1 - threshold):
+            regressions.append({"benchmark": name, "metric": "throughput_per_s", "baseline": before, "current": after,
+                                "change": round(after / before - 1, 4)})
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_table(results: Dict[str, Any], baseline: Optional[Dict[str, Any]]):
+    print(f"{'benchmark':<22}{'count':>7}{'ops/s':>12}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}{'vs base p50':>13}")
+    for name, stats in results["benchmarks"].items():
+        previous = (baseline or {}).get("benchmarks", {}).get(name)
+        change = ""
+        if previous and previous.get("p50_ms"):
+            change = f"{stats['p50_ms'] / previous['p50_ms'] - 1:+.1%}"
+        print(f"{name:<22}{stats['count']:>7}{stats['throughput_per_s']:>12.2f}{stats['p50_ms']:>11.2f}"
+              f"{stats['p95_ms']:>11.2f}{stats['p99_ms']:>11.2f}{change:>13}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark extraction, parsing, ranking and the HTTP endpoints.")
+    parser.add_argument("--corpus", default="bench_corpus", help="corpus directory, generated when missing")
+    parser.add_argument("--regenerate", action="store_true", help="regenerate the corpus even if it exists")
+    add_corpus_arguments(parser)
+    parser.add_argument("--benchmarks", default=",".join(IN_PROCESS_BENCHMARKS),
+                        help=f"comma-separated benchmarks to run (of {', '.join(IN_PROCESS_BENCHMARKS + HTTP_BENCHMARKS)})")
+    parser.add_argument("--repeat", type=int, default=1, help="rounds over the corpus per benchmark (default 1)")
+    parser.add_argument("--url", help="base URL of a running server; adds the http_* benchmarks")
+    parser.add_argument("--concurrency", type=int, default=1, help="concurrent HTTP clients (default 1)")
+    parser.add_argument("--out", default="bench_results.json", help="where to write the results JSON")
+    parser.add_argument("--baseline", default="benchmarks/baseline.json", help="baseline results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown flagged as a regression (default 0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    selected = [name.strip() for name in args.benchmarks.split(",") if name.strip()]
+    if args.url and args.benchmarks == parser.get_default("benchmarks"):
+        selected += list(HTTP_BENCHMARKS)
+    unknown = [name for name in selected if name not in IN_PROCESS_BENCHMARKS + HTTP_BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    manifest = None if args.regenerate else load_manifest(args.corpus)
+    if manifest is None:
+        corpus_from_args(args.corpus, args)
+        manifest = load_manifest(args.corpus)
+
+    benchmarks = run_in_process(args.corpus, manifest, selected, args.repeat)
+    if any(name in HTTP_BENCHMARKS for name in selected):
+        if not args.url:
+            parser.error("the http_* benchmarks need --url")
+        benchmarks.update(run_http(args.url, args.corpus, manifest, selected, args.repeat, args.concurrency))
+
+    results = {
+        "meta": {
+            "created_at": time.time(),
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "corpus": manifest["config"],
+            "repeat": args.repeat,
+            "concurrency": args.concurrency
+        },
+        "benchmarks": benchmarks
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    _print_table(results, baseline)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if baseline is None:
+        return 0
+    if baseline["meta"].get("corpus") != results["meta"]["corpus"]:
+        print("Warning: the baseline was measured on a different corpus, comparisons may not be meaningful")
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression['benchmark']} {regression['metric']}: "
+              f"{regression['baseline']} -> {regression['current']} ({regression['change']:+.1%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,35 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Response, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from parser.extract_text import extract_text_from_pdf, extract_text_from_docx
-from parser.extract_entities import extract_entities
+from starlette.background import BackgroundTask
+from parser.extract_text import extract_pdf_bytes, extract_text_from_docx_bytes
+from parser.pdf_extraction import page_pool
+from parser.extract_entities import extract_entities, extract_entities_batch
+from parser.batch_ranker import BatchRanker
 from parser.resume_ranker import ResumeRanker
-from models.response_model import ResumeData, Experience
-from models.job_model import JobRequirement, JobMatch
-from models.request_model import AnalyzeResumeRequest, BatchAnalyzeRequest
+from parser.job_profile import SCORE_COMPONENTS
+from parser.nlp_registry import model_stats
+from models.response_model import ResumeData, Experience, TextExtraction, UploadResult
+from models.job_model import JobRequirement, JobMatch, CandidateScore, TopKResult, PoolRankResult, PoolCandidateScore, PoolScoreResult, SemanticMatch, RerankResult, JobRerankResult
+from models.request_model import AnalyzeResumeRequest, BatchAnalyzeRequest, TopKAnalyzeRequest, ExpandDetailsRequest, RankPoolRequest, ScorePoolRequest, SemanticSearchRequest, SearchRequest, RerankRequest, JobUpdateRequest
+from services.executor import TrackedExecutor, EndpointLimiter, ServerBusyError, env_int
+from services.parse_cache import create_parse_cache
+from services.candidate_store import CandidateSummary, StoredCandidate, create_candidate_store, store_upload
+from services.rank_sessions import CULTURAL_COMPONENTS, RankSessionStore
+from services.skill_index import SkillIndex
+from services.semantic_index import create_semantic_index
+from services.ann_index import create_ann_index
+from services.pool_snapshot import PoolSnapshot, load_snapshot
+from services.metrics import REGISTRY, MetricsMiddleware, cleanup_multiprocess, enable_multiprocess, gauge, record_fallback, timed
+from services.profiling import PROFILE_ID_HEADER, ProfileStore, ProfilingMiddleware
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+import asyncio
+import json
+import math
 import os
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
 import logging
 
 app = FastAPI(title="AI Resume Parser and Ranker")
@@ -21,15 +41,150 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Ranking-Session", PROFILE_ID_HEADER],
 )
 
+# Request latency per endpoint, exported on /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Opt-in per-request profiles (X-Profile header or PROFILE_SAMPLE_RATE), served by /admin/profiles
+profile_store = ProfileStore.from_env()
+app.add_middleware(ProfilingMiddleware, store=profile_store)
+
 # Create static directory if it doesn't exist
 os.makedirs("static", exist_ok=True)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-ranker = ResumeRanker()
+# Worker processes publish their stage timings through METRICS_MULTIPROC_DIR (a fresh temp dir by default)
+enable_multiprocess()
+
+batch_ranker = BatchRanker()
+
+# Executors: threads for file extraction, the batch ranker's process pool for NLP/ranking
+io_pool = TrackedExecutor("io", lambda: ThreadPoolExecutor(max_workers=env_int("IO_WORKERS", 8)))
+cpu_pool = batch_ranker.pool
+
+# Content-addressed cache of parsed uploads (see PARSE_CACHE_BACKEND)
+parse_cache = create_parse_cache()
+
+# Parsed resumes kept server-side, so ranking requests can refer to them by id (see CANDIDATE_STORE_BACKEND)
+candidate_store = create_candidate_store()
+
+# Skill -> candidate postings over the store, so /rank-pool only ranks candidates with the required skills
+skill_index = SkillIndex.from_store(candidate_store) if candidate_store else None
+
+# TF-IDF matrix of the stored candidates for fuzzy job matching (see SEMANTIC_INDEX_PATH)
+semantic_index = create_semantic_index(candidate_store)
+semantic_refit: Optional[asyncio.Task] = None
+
+# Approximate nearest-neighbour index of candidate vectors for /search on large pools (see ANN_INDEX_DIR)
+ann_index = create_ann_index(candidate_store)
+ann_training: Optional[asyncio.Task] = None
+
+# Memory-mapped columnar snapshot of the encoded pool, built with `python -m services.pool_snapshot build`
+POOL_SNAPSHOT_DIR = os.getenv("POOL_SNAPSHOT_DIR", "pool_snapshot")
+pool_snapshot: Optional[PoolSnapshot] = None
+
+# Score components of ranked batches, so /rerank can re-weight them without re-scoring
+rank_sessions = RankSessionStore.from_env()
+
+# Ranker used in this process to re-score sessions whose job requirement was edited (no NLP needed)
+session_ranker = ResumeRanker()
+
+# Maximum number of files accepted by /upload-resumes
+MAX_UPLOAD_FILES = env_int("MAX_UPLOAD_FILES", 20)
+
+# Per-endpoint concurrency limits (overridable, e.g. UPLOAD_RESUME_MAX_CONCURRENCY)
+endpoint_limiters = {
+    "upload-resume": EndpointLimiter.from_env("upload-resume", 8, 32),
+    "upload-resumes": EndpointLimiter.from_env("upload-resumes", 2, 4),
+    "analyze-resume": EndpointLimiter.from_env("analyze-resume", 8, 32),
+    "batch-analyze": EndpointLimiter.from_env("batch-analyze", 2, 4),
+}
+
+@app.exception_handler(ServerBusyError)
+async def server_busy_handler(request: Request, exc: ServerBusyError):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+@app.on_event("shutdown")
+def shutdown_executors():
+    if semantic_index:
+        semantic_index.save()
+    if ann_index:
+        ann_index.save()
+    io_pool.shutdown()
+    batch_ranker.shutdown()
+    page_pool.shutdown()
+    # Worker processes have flushed their last metrics by now
+    cleanup_multiprocess()
+    profile_store.close()
+
+@app.get("/model-stats")
+async def nlp_model_stats():
+    # spaCy is loaded in the ranking workers, whose stats arrive through the metrics directory
+    return {"models": await io_pool.run(model_stats)}
+
+@app.get("/cache-stats")
+async def cache_stats():
+    snapshot = _current_snapshot()
+    return {
+        "parse_cache": parse_cache.stats() if parse_cache else None,
+        "candidate_store": candidate_store.stats() if candidate_store else None,
+        "skill_index": skill_index.stats() if skill_index else None,
+        "semantic_index": semantic_index.stats() if semantic_index else None,
+        "ann_index": ann_index.stats() if ann_index else None,
+        "pool_snapshot": snapshot.stats() if snapshot else None,
+        "rank_sessions": rank_sessions.stats()
+    }
+
+@app.get("/executor-stats")
+async def executor_stats():
+    return {
+        "pools": {pool.name: pool.stats() for pool in (io_pool, cpu_pool, page_pool)},
+        "endpoints": {name: limiter.stats() for name, limiter in endpoint_limiters.items()}
+    }
+
+# Sampled when /metrics is scraped
+EXECUTOR_PENDING = gauge("executor_pending_tasks", "Tasks submitted to an executor and not finished yet", ["pool"])
+ENDPOINT_ACTIVE = gauge("endpoint_active_requests", "Requests holding one of an endpoint's slots", ["endpoint"])
+ENDPOINT_WAITING = gauge("endpoint_waiting_requests", "Requests queued for one of an endpoint's slots", ["endpoint"])
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Stage latencies, cache, error and fallback counters of this process and its workers (Prometheus text format)."""
+    for pool in (io_pool, cpu_pool, page_pool):
+        EXECUTOR_PENDING.set(pool.pending, pool=pool.name)
+    for name, limiter in endpoint_limiters.items():
+        ENDPOINT_ACTIVE.set(limiter.active, endpoint=name)
+        ENDPOINT_WAITING.set(limiter.waiting, endpoint=name)
+    return PlainTextResponse(REGISTRY.exposition(), media_type="text/plain; version=0.0.4")
+
+def _check_admin_token(token: Optional[str]):
+    # ADMIN_TOKEN unset leaves the admin endpoints open (development)
+    expected = os.getenv("ADMIN_TOKEN")
+    if expected and token != expected:
+        raise HTTPException(status_code=403, detail="Invalid or missing X-Admin-Token")
+
+@app.get("/admin/profiles")
+async def list_profiles(x_admin_token: Optional[str] = Header(None)):
+    """Stored request profiles, newest first."""
+    _check_admin_token(x_admin_token)
+    return {"profiles": await io_pool.run(profile_store.list)}
+
+@app.get("/admin/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str, x_admin_token: Optional[str] = Header(None)):
+    """Collapsed stacks of one request (input for flamegraph.pl, speedscope or inferno)."""
+    _check_admin_token(x_admin_token)
+    collapsed = await io_pool.run(profile_store.collapsed_text, profile_id)
+    if collapsed is None:
+        raise HTTPException(status_code=404, detail=f"Unknown profile id: {profile_id}")
+    return PlainTextResponse(collapsed)
 
 @app.get("/", response_class=HTMLResponse)
 async def root():
@@ -2839,6 +2994,7 @@ async def root():
                 } else {
                     otherContainer.classList.remove('active');
                     input.value = dropdown.value;
+                    scheduleJobUpdate();
                 }
             }
             
@@ -2853,6 +3009,7 @@ async def root():
                 } else {
                     otherContainer.classList.remove('active');
                     input.value = dropdown.value;
+                    scheduleJobUpdate();
                 }
             }
             
@@ -2867,6 +3024,7 @@ async def root():
                 } else {
                     otherContainer.classList.remove('active');
                     input.value = dropdown.value;
+                    scheduleJobUpdate();
                 }
             }
             
@@ -2983,6 +3141,7 @@ async def root():
                     `;
                     container.appendChild(tag);
                 });
+                scheduleJobUpdate();
             }
             
             // Drag and drop functionality
@@ -3315,14 +3474,127 @@ async def root():
                     return;
                 }
                 
-                // If we have results already, recalculate them with new weights
+                // If we have results already, re-order them server-side with the new weights
                 if (parsedResumes.length > 0 && document.getElementById('analysisResult').innerHTML !== '') {
-                    analyzeResumes();
+                    if (rankingSessionId) {
+                        rerankResults();
+                    } else {
+                        analyzeResumes();
+                    }
                 }
                 
                 weightsChanged = false;
                 updateApplyButton();
             }
+            
+            // Ranking session of the last analysis (cached score components on the server) and its results by index
+            let rankingSessionId = null;
+            let analysisResults = {};
+            
+            // Slider values map onto the server's score weights; the default sliders (40/30/30) give its defaults
+            function serverScoreWeights() {
+                return {
+                    skill: 0.35 * scoreWeights.skillMatch / 40,
+                    experience: 0.15 * scoreWeights.experienceMatch / 30,
+                    relevance: 0.10 * scoreWeights.techRelevance / 30,
+                    education: 0.15,
+                    certification: 0.10,
+                    cultural: 0.15
+                };
+            }
+            
+            function usingDefaultWeights() {
+                return scoreWeights.skillMatch === 40 && scoreWeights.experienceMatch === 30 && scoreWeights.techRelevance === 30;
+            }
+            
+            // Re-weight the current results from the server's cached components instead of re-analyzing
+            async function rerankResults() {
+                try {
+                    const response = await fetch('/rerank', {
+                        method: 'POST',
+                        headers: {
+                            'Content-Type': 'application/json',
+                            'X-Ranking-Session': rankingSessionId
+                        },
+                        body: JSON.stringify({ weights: serverScoreWeights() })
+                    });
+                    
+                    if (response.status === 404) {
+                        // Session expired on the server: fall back to a full analysis
+                        rankingSessionId = null;
+                        analyzeResumes();
+                        return;
+                    }
+                    if (!response.ok) {
+                        throw new Error(`HTTP error! status: ${response.status}`);
+                    }
+                    
+                    applyRanking(await response.json());
+                    
+                    // Show the weights now in effect in the ranking criteria summary
+                    const summaryValues = document.querySelectorAll('.weights-summary .weight-summary-value');
+                    [scoreWeights.skillMatch, scoreWeights.experienceMatch, scoreWeights.techRelevance].forEach((value, i) => {
+                        if (summaryValues[i]) {
+                            summaryValues[i].textContent = `${value}%`;
+                        }
+                    });
+                } catch (error) {
+                    console.error('Rerank error:', error);
+                    alert(`Could not apply weights: ${error.message}`);
+                }
+            }
+
+            // Update the scores and order of the rendered candidates from a /rerank response
+            function applyRanking(rerank) {
+                const candidateList = document.getElementById('candidateList');
+                rerank.ranking.forEach(index => {
+                    const entry = candidateList.querySelector(`.candidate-entry[data-index="${index}"]`);
+                    const result = analysisResults[index];
+                    if (entry && result) {
+                        result.match_score = rerank.scores[index];
+                        entry.dataset.score = result.match_score;
+                        entry.innerHTML = buildCandidateCard(result, index);
+                        candidateList.appendChild(entry);
+                    }
+                });
+            }
+            
+            // Re-score the current results live while the job requirement is edited (debounced)
+            let jobUpdateTimer = null;
+            function scheduleJobUpdate() {
+                if (!rankingSessionId || Object.keys(analysisResults).length === 0) {
+                    return;
+                }
+                clearTimeout(jobUpdateTimer);
+                jobUpdateTimer = setTimeout(updateJobRequirement, 400);
+            }
+            
+            async function updateJobRequirement() {
+                try {
+                    const response = await fetch('/rerank/job-requirement', {
+                        method: 'POST',
+                        headers: {
+                            'Content-Type': 'application/json',
+                            'X-Ranking-Session': rankingSessionId
+                        },
+                        body: JSON.stringify({ job_requirement: buildJobRequirement() })
+                    });
+                    
+                    if (response.status === 404 || response.status === 409) {
+                        // Session expired or cannot be re-scored: the next analysis starts a new one
+                        rankingSessionId = null;
+                        return;
+                    }
+                    if (!response.ok) {
+                        throw new Error(`HTTP error! status: ${response.status}`);
+                    }
+                    
+                    // Scores and order are updated; candidate details refresh on the next full analysis
+                    applyRanking(await response.json());
+                } catch (error) {
+                    console.error('Job update error:', error);
+                }
+            }
 
             // Function to update navigation indicators
             function updateNavigation(activeSectionId) {
@@ -3371,32 +3643,33 @@ async def root():
                         fileList.appendChild(fileItem);
                     });
                     
-                    for (let i = 0; i < selectedFiles.length; i++) {
-                        const file = selectedFiles[i];
-                        const formData = new FormData();
-                        formData.append('file', file);
+                    // Send every file in one request; the server parses them in parallel
+                    const formData = new FormData();
+                    selectedFiles.forEach(file => formData.append('files', file));
+                    
+                    const response = await fetch('/upload-resumes', {
+                        method: 'POST',
+                        body: formData
+                    });
+                    
+                    if (!response.ok) {
+                        const errorData = await response.json();
+                        throw new Error(errorData.detail || `Error uploading resumes: ${response.status}`);
+                    }
+                    
+                    const uploadResults = await response.json();
+                    
+                    uploadResults.forEach((result, i) => {
+                        const fileItem = document.getElementById(`file-item-${i}`);
+                        const statusElement = document.getElementById(`file-status-${i}`);
                         
-                        try {
-                            const response = await fetch('/upload-resume', {
-                                method: 'POST',
-                                body: formData
-                            });
-                            
-                            if (!response.ok) {
-                                const errorData = await response.json();
-                                throw new Error(errorData.detail || `Error processing ${file.name}: ${response.status}`);
-                            }
-                            
-                            const data = await response.json();
+                        if (result.success) {
                             parsedResumes.push({
-                                name: file.name,
-                                data: data
+                                name: result.filename,
+                                data: result.data
                             });
                             
                             // Update status for this file
-                            const fileItem = document.getElementById(`file-item-${i}`);
-                            const statusElement = document.getElementById(`file-status-${i}`);
-                            
                             if (fileItem && statusElement) {
                                 fileItem.classList.add('success');
                                 statusElement.innerHTML = '✓ Processed';
@@ -3404,11 +3677,8 @@ async def root():
                             }
                             
                             successCount++;
-                        } catch (fileError) {
+                        } else {
                             // Update status for this file to show error
-                            const fileItem = document.getElementById(`file-item-${i}`);
-                            const statusElement = document.getElementById(`file-status-${i}`);
-                            
                             if (fileItem && statusElement) {
                                 fileItem.classList.add('error');
                                 statusElement.innerHTML = '✗ Failed';
@@ -3416,10 +3686,10 @@ async def root():
                             }
                             
                             errorCount++;
-                            errorDetails.push(`<li><strong>${file.name}</strong>: ${fileError.message}</li>`);
-                            console.error(`Error processing ${file.name}:`, fileError);
+                            errorDetails.push(`<li><strong>${result.filename}</strong>: ${result.error}</li>`);
+                            console.error(`Error processing ${result.filename}:`, result.error);
                         }
-                    }
+                    });
                     
                     // Display results
                     let resultHtml = '<h3>Resume Processing Results</h3>';
@@ -3459,533 +3729,582 @@ async def root():
                 }
             }
 
-            // Fix analyzeResumes function to properly display results
-            async function analyzeResumes() {
-                if (parsedResumes.length === 0) {
-                    alert('Please upload and parse resumes first');
-                    return;
-                }
+            // Build the result card for one candidate (index is the candidate's position in parsedResumes)
+            function buildCandidateCard(result, index) {
+                const resume = parsedResumes[index];
+                const score = (result.match_score * 100).toFixed(1);
+                const scoreClass = score >= 70 ? 'high-score' : score >= 40 ? 'medium-score' : 'low-score';
                 
-                const jobRequirement = {
-                    title: document.getElementById('jobTitle').value,
-                    required_skills: requiredSkills,
-                    preferred_skills: preferredSkills,
-                    experience_years: parseFloat(document.getElementById('experienceYears').value) || 0,
-                    education_level: document.getElementById('educationLevel').value || document.getElementById('educationLevelInput').value,
-                    industry: document.getElementById('industry').value,
-                    keywords: keywords,
-                    required_certifications: certifications,
-                    company_values: companyValues,
-                    // Add weight configuration
-                    score_weights: {
-                        skill_match: scoreWeights.skillMatch / 100,
-                        experience_match: scoreWeights.experienceMatch / 100,
-                        tech_relevance: scoreWeights.techRelevance / 100
-                    }
-                };
+                // Calculate component scores for visualization
+                const skillScore = result.skill_match_score * 100 * (scoreWeights.skillMatch / 40);
+                const expScore = result.experience_match * 100 * (scoreWeights.experienceMatch / 30);
+                const techScore = result.tech_relevance_score * 100 * (scoreWeights.techRelevance / 30);
                 
-                document.getElementById('analysisLoading').style.display = 'block';
-                document.getElementById('analysisResult').innerHTML = '';
+                // Store missing certifications data for this candidate
+                const candidateMissingCerts = {
+                    name: resume.name,
+                    missing_certifications: result.missing_certifications || []
+                };
+                missingCertificationsData[index] = candidateMissingCerts;
                 
-                try {
-                    const response = await fetch('/batch-analyze', {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify({
-                            resumes: parsedResumes.map(r => r.data),
-                            job_requirement: jobRequirement
-                        })
-                    });
-                    
-                    if (!response.ok) {
-                        throw new Error(`HTTP error! status: ${response.status}`);
-                    }
-                    
-                    const results = await response.json();
-                    
-                    // Reset missing certifications data array
-                    missingCertificationsData = [];
-                    
-                    // Generate result HTML
-                    let resultsHtml = '';
-                    
-                    // Add a summary of the weights used for this ranking
-                    resultsHtml += `
-                        <div class="weights-summary">
-                            <h3>Ranking Criteria</h3>
-                            <div class="weights-summary-content">
-                                <div class="weight-summary-item">
-                                    <div class="weight-summary-label">Skill Match</div>
-                                    <div class="weight-summary-value">${scoreWeights.skillMatch}%</div>
+                return `
+                    <div class="candidate-card ${scoreClass}">
+                        <div class="candidate-header">
+                            <div class="candidate-name">${resume.name}</div>
+                            <div class="match-score">${score}% Match</div>
+                        </div>
+                        <div class="progress-bar">
+                            <div class="progress-fill" style="width: ${score}%"></div>
+                        </div>
+                        
+                        <div class="candidate-summary">
+                            <div class="summary-item">
+                                <div class="summary-label">Skills Match</div>
+                                <div class="summary-value">${result.matching_skills.length}/${result.matching_skills.length + result.missing_skills.length}</div>
+                            </div>
+                            <div class="summary-item">
+                                <div class="summary-label">Experience</div>
+                                <div class="summary-value">${(result.experience_match * 100).toFixed(0)}%</div>
+                            </div>
+                            <div class="summary-item">
+                                <div class="summary-label">Education</div>
+                                <div class="summary-value">${result.education_match ? '✓' : '✗'}</div>
+                            </div>
+                            ${result.certification_match_score !== undefined ? `
+                            <div class="summary-item">
+                                <div class="summary-label">Certifications</div>
+                                <div class="summary-value">${(result.certification_match_score * 100).toFixed(0)}%</div>
+                                <button class="missing-cert-btn" onclick="showMissingCertifications(${index})">
+                                    <span class="cert-badge">${candidateMissingCerts.missing_certifications.length || 3}</span>
+                                    Missing
+                                </button>
+                            </div>` : ''}
+                            <div class="summary-item">
+                                <div class="summary-label">Cultural Fit</div>
+                                <div class="summary-value">${(result.cultural_fit_score * 100).toFixed(0)}%</div>
+                                <div class="fit-badge-small ${result.cultural_fit_score >= 0.7 ? 'high-fit' : result.cultural_fit_score >= 0.4 ? 'moderate-fit' : 'low-fit'}">
+                                    ${result.cultural_fit_score >= 0.7 ? '✅' : result.cultural_fit_score >= 0.4 ? '⚠️' : '❌'}
                                 </div>
-                                <div class="weight-summary-item">
-                                    <div class="weight-summary-label">Experience Match</div>
-                                    <div class="weight-summary-value">${scoreWeights.experienceMatch}%</div>
+                            </div>
+                        </div>
+                        
+                        <div class="score-breakdown">
+                            <h4>Score Breakdown</h4>
+                            <div class="breakdown-item">
+                                <div class="breakdown-label">Skill Match (35%)</div>
+                                <div class="breakdown-bar">
+                                    <div class="breakdown-fill skill-fill" style="width: ${skillScore.toFixed(1)}%"></div>
                                 </div>
-                                <div class="weight-summary-item">
-                                    <div class="weight-summary-label">Technology Relevance</div>
-                                    <div class="weight-summary-value">${scoreWeights.techRelevance}%</div>
+                                <div class="breakdown-value">${(result.skill_match_score * 100).toFixed(1)}%</div>
+                            </div>
+                            <div class="breakdown-item">
+                                <div class="breakdown-label">Experience Match (25%)</div>
+                                <div class="breakdown-bar">
+                                    <div class="breakdown-fill experience-fill" style="width: ${expScore.toFixed(1)}%"></div>
+                                </div>
+                                <div class="breakdown-value">${(result.experience_match * 100).toFixed(1)}%</div>
+                            </div>
+                            <div class="breakdown-item">
+                                <div class="breakdown-label">Technology Relevance (25%)</div>
+                                <div class="breakdown-bar">
+                                    <div class="breakdown-fill tech-fill" style="width: ${techScore.toFixed(1)}%"></div>
+                                </div>
+                                <div class="breakdown-value">${(result.tech_relevance_score * 100).toFixed(1)}%</div>
+                            </div>
+                            <div class="breakdown-item">
+                                <div class="breakdown-label">Cultural Fit (15%)</div>
+                                <div class="breakdown-bar">
+                                    <div class="breakdown-fill culture-fill" style="width: ${(result.cultural_fit_score * 100).toFixed(1)}%"></div>
                                 </div>
+                                <div class="breakdown-value">${(result.cultural_fit_score * 100).toFixed(1)}%</div>
                             </div>
                         </div>
-                    `;
-                    
-                    results.forEach((result, index) => {
-                        const resume = parsedResumes[index];
-                        const score = (result.match_score * 100).toFixed(1);
-                        const scoreClass = score >= 70 ? 'high-score' : score >= 40 ? 'medium-score' : 'low-score';
-                        
-                        // Calculate component scores for visualization
-                        const skillScore = result.skill_match_score * 100 * (scoreWeights.skillMatch / 40);
-                        const expScore = result.experience_match * 100 * (scoreWeights.experienceMatch / 30);
-                        const techScore = result.tech_relevance_score * 100 * (scoreWeights.techRelevance / 30);
-                        
-                        // Store missing certifications data for this candidate
-                        const candidateMissingCerts = {
-                            name: resume.name,
-                            missing_certifications: result.missing_certifications || []
-                        };
-                        missingCertificationsData[index] = candidateMissingCerts;
                         
-                        resultsHtml += `
-                            <div class="candidate-card ${scoreClass}">
-                                <div class="candidate-header">
-                                    <div class="candidate-name">${resume.name}</div>
-                                    <div class="match-score">${score}% Match</div>
-                                </div>
-                                <div class="progress-bar">
-                                    <div class="progress-fill" style="width: ${score}%"></div>
+                        <div class="candidate-details">
+                            <div class="detail-section">
+                                <h3>Skills Analysis</h3>
+                                <div class="skill-section">
+                                    <h4>Skills with Proficiency</h4>
+                                    <div class="skill-list">
+                                        ${resume.data.skills_with_seniority && resume.data.skills_with_seniority.length > 0 ? 
+                                            resume.data.skills_with_seniority.map(skillObj => {
+                                                let iconMap = {
+                                                    'Beginner': '🟢',
+                                                    'Intermediate': '🔵',
+                                                    'Advanced': '🟣',
+                                                    'Expert': '🟠'
+                                                };
+                                                let className = `skill-badge skill-${skillObj.seniority.toLowerCase()}`;
+                                                return `<span class="${className}"><span class="seniority-icon">${iconMap[skillObj.seniority]}</span>${skillObj.name}</span>`;
+                                            }).join(' ') + 
+                                            '<div class="skill-legend"><span>🟢 Beginner</span><span>🔵 Intermediate</span><span>🟣 Advanced</span><span>🟠 Expert</span></div>'
+                                            : resume.data.skills.map(skill => `<span class="skill-badge">${skill}</span>`).join(' ')
+                                            || '<span class="no-skills">No skills detected</span>'
+                                        }
+                                    </div>
                                 </div>
                                 
-                                <div class="candidate-summary">
-                                    <div class="summary-item">
-                                        <div class="summary-label">Skills Match</div>
-                                        <div class="summary-value">${result.matching_skills.length}/${result.matching_skills.length + result.missing_skills.length}</div>
-                                    </div>
-                                    <div class="summary-item">
-                                        <div class="summary-label">Experience</div>
-                                        <div class="summary-value">${(result.experience_match * 100).toFixed(0)}%</div>
-                                    </div>
-                                    <div class="summary-item">
-                                        <div class="summary-label">Education</div>
-                                        <div class="summary-value">${result.education_match ? '✓' : '✗'}</div>
-                                    </div>
-                                    ${result.certification_match_score !== undefined ? `
-                                    <div class="summary-item">
-                                        <div class="summary-label">Certifications</div>
-                                        <div class="summary-value">${(result.certification_match_score * 100).toFixed(0)}%</div>
-                                        <button class="missing-cert-btn" onclick="showMissingCertifications(${index})">
-                                            <span class="cert-badge">${candidateMissingCerts.missing_certifications.length || 3}</span>
-                                            Missing
-                                        </button>
-                                    </div>` : ''}
-                                    <div class="summary-item">
-                                        <div class="summary-label">Cultural Fit</div>
-                                        <div class="summary-value">${(result.cultural_fit_score * 100).toFixed(0)}%</div>
-                                        <div class="fit-badge-small ${result.cultural_fit_score >= 0.7 ? 'high-fit' : result.cultural_fit_score >= 0.4 ? 'moderate-fit' : 'low-fit'}">
-                                            ${result.cultural_fit_score >= 0.7 ? '✅' : result.cultural_fit_score >= 0.4 ? '⚠️' : '❌'}
-                                        </div>
+                                <div class="skill-section">
+                                    <h4>Matching Skills</h4>
+                                    <div class="skill-list">
+                                        ${result.matching_skills.map(skill => `<span class="skill-badge badge-success">${skill}</span>`).join(' ') || '<span class="no-skills">No matching skills</span>'}
                                     </div>
                                 </div>
                                 
-                                <div class="score-breakdown">
-                                    <h4>Score Breakdown</h4>
-                                    <div class="breakdown-item">
-                                        <div class="breakdown-label">Skill Match (35%)</div>
-                                        <div class="breakdown-bar">
-                                            <div class="breakdown-fill skill-fill" style="width: ${skillScore.toFixed(1)}%"></div>
-                                        </div>
-                                        <div class="breakdown-value">${(result.skill_match_score * 100).toFixed(1)}%</div>
-                                    </div>
-                                    <div class="breakdown-item">
-                                        <div class="breakdown-label">Experience Match (25%)</div>
-                                        <div class="breakdown-bar">
-                                            <div class="breakdown-fill experience-fill" style="width: ${expScore.toFixed(1)}%"></div>
-                                        </div>
-                                        <div class="breakdown-value">${(result.experience_match * 100).toFixed(1)}%</div>
+                                <div class="skill-section">
+                                    <h4>Missing Skills</h4>
+                                    <div class="skill-list">
+                                        ${result.missing_skills.map(skill => `<span class="skill-badge missing-skill">${skill}</span>`).join(' ') || '<span class="no-skills">No missing skills</span>'}
                                     </div>
-                                    <div class="breakdown-item">
-                                        <div class="breakdown-label">Technology Relevance (25%)</div>
-                                        <div class="breakdown-bar">
-                                            <div class="breakdown-fill tech-fill" style="width: ${techScore.toFixed(1)}%"></div>
+                                </div>
+                            </div>
+
+                            <div class="detail-section">
+                                <h3>Cultural Fit Score</h3>
+                                <div class="cultural-fit-section">
+                                    <div class="cultural-fit-header">
+                                        <div class="cultural-fit-score">${(result.cultural_fit_score * 100).toFixed(0)}%</div>
+                                        <div class="cultural-fit-badge ${result.cultural_fit_score >= 0.7 ? 'high-fit' : result.cultural_fit_score >= 0.4 ? 'moderate-fit' : 'low-fit'}">
+                                            ${result.cultural_fit_score >= 0.7 ? '✅' : result.cultural_fit_score >= 0.4 ? '⚠️' : '❌'}
                                         </div>
-                                        <div class="breakdown-value">${(result.tech_relevance_score * 100).toFixed(1)}%</div>
-                                    </div>
-                                    <div class="breakdown-item">
-                                        <div class="breakdown-label">Cultural Fit (15%)</div>
-                                        <div class="breakdown-bar">
-                                            <div class="breakdown-fill culture-fill" style="width: ${(result.cultural_fit_score * 100).toFixed(1)}%"></div>
+                                        <div class="cultural-fit-tooltip-trigger" onclick="toggleCulturalFitDetails('cultural-fit-details-${index}')">
+                                            Why this score? <span class="info-icon">ⓘ</span>
                                         </div>
-                                        <div class="breakdown-value">${(result.cultural_fit_score * 100).toFixed(1)}%</div>
                                     </div>
-                                </div>
-                                
-                                <div class="candidate-details">
-                                    <div class="detail-section">
-                                        <h3>Skills Analysis</h3>
-                                        <div class="skill-section">
-                                            <h4>Skills with Proficiency</h4>
-                                            <div class="skill-list">
-                                                ${resume.data.skills_with_seniority && resume.data.skills_with_seniority.length > 0 ? 
-                                                    resume.data.skills_with_seniority.map(skillObj => {
-                                                        let iconMap = {
-                                                            'Beginner': '🟢',
-                                                            'Intermediate': '🔵',
-                                                            'Advanced': '🟣',
-                                                            'Expert': '🟠'
-                                                        };
-                                                        let className = `skill-badge skill-${skillObj.seniority.toLowerCase()}`;
-                                                        return `<span class="${className}"><span class="seniority-icon">${iconMap[skillObj.seniority]}</span>${skillObj.name}</span>`;
-                                                    }).join(' ') + 
-                                                    '<div class="skill-legend"><span>🟢 Beginner</span><span>🔵 Intermediate</span><span>🟣 Advanced</span><span>🟠 Expert</span></div>'
-                                                    : resume.data.skills.map(skill => `<span class="skill-badge">${skill}</span>`).join(' ')
-                                                    || '<span class="no-skills">No skills detected</span>'
-                                                }
+                                    
+                                    <div id="cultural-fit-details-${index}" class="cultural-fit-details" style="display: none;">
+                                        <div class="cultural-fit-detail-section">
+                                            <h4>Company Values</h4>
+                                            <div class="company-values-list">
+                                                ${result.company_values?.map(value => 
+                                                    `<span class="company-value-badge ${result.cultural_fit_details?.matched_values?.includes(value) ? 'matched-value' : ''}">${value}</span>`
+                                                ).join(' ') || '<span class="no-values">No company values defined</span>'}
                                             </div>
                                         </div>
                                         
-                                        <div class="skill-section">
-                                            <h4>Matching Skills</h4>
-                                            <div class="skill-list">
-                                                ${result.matching_skills.map(skill => `<span class="skill-badge badge-success">${skill}</span>`).join(' ') || '<span class="no-skills">No matching skills</span>'}
+                                        <div class="cultural-fit-detail-section">
+                                            <h4>Matched Keywords</h4>
+                                            <div class="matched-keywords-list">
+                                                ${result.cultural_fit_details?.matched_keywords?.map(keyword => 
+                                                    `<span class="keyword-badge">${keyword}</span>`
+                                                ).join(' ') || '<span class="no-keywords">No matching keywords found</span>'}
                                             </div>
                                         </div>
                                         
-                                        <div class="skill-section">
-                                            <h4>Missing Skills</h4>
-                                            <div class="skill-list">
-                                                ${result.missing_skills.map(skill => `<span class="skill-badge missing-skill">${skill}</span>`).join(' ') || '<span class="no-skills">No missing skills</span>'}
-                                            </div>
+                                        ${result.cultural_fit_details?.improvement_suggestions?.length > 0 ? `
+                                        <div class="cultural-fit-detail-section">
+                                            <h4>Improvement Suggestions</h4>
+                                            <ul class="cultural-improvement-list">
+                                                ${result.cultural_fit_details.improvement_suggestions.map(suggestion => 
+                                                    `<li>${suggestion}</li>`
+                                                ).join('')}
+                                            </ul>
                                         </div>
+                                        ` : ''}
                                     </div>
+                                </div>
+                            </div>
 
-                                    <div class="detail-section">
-                                        <h3>Cultural Fit Score</h3>
-                                        <div class="cultural-fit-section">
-                                            <div class="cultural-fit-header">
-                                                <div class="cultural-fit-score">${(result.cultural_fit_score * 100).toFixed(0)}%</div>
-                                                <div class="cultural-fit-badge ${result.cultural_fit_score >= 0.7 ? 'high-fit' : result.cultural_fit_score >= 0.4 ? 'moderate-fit' : 'low-fit'}">
-                                                    ${result.cultural_fit_score >= 0.7 ? '✅' : result.cultural_fit_score >= 0.4 ? '⚠️' : '❌'}
-                                                </div>
-                                                <div class="cultural-fit-tooltip-trigger" onclick="toggleCulturalFitDetails('cultural-fit-details-${index}')">
-                                                    Why this score? <span class="info-icon">ⓘ</span>
-                                                </div>
+                            <div class="detail-section">
+                                <h3>Career Progression Analysis</h3>
+                                <div class="career-progression-section">
+                                    <div class="career-progression-tabs">
+                                        <div class="career-tab active" onclick="showCareerTab(this, 'promotion-trajectory-${index}')">
+                                            <i class="career-icon">📈</i> Promotion Trajectory
+                                        </div>
+                                        <div class="career-tab" onclick="showCareerTab(this, 'job-switching-${index}')">
+                                            <i class="career-icon">🔄</i> Job Switching
+                                        </div>
+                                        <div class="career-tab" onclick="showCareerTab(this, 'employment-gaps-${index}')">
+                                            <i class="career-icon">⏱️</i> Employment Gaps
+                                        </div>
+                                    </div>
+                                    
+                                    <div class="career-content-container">
+                                        <div id="promotion-trajectory-${index}" class="career-content active">
+                                            <div class="promotion-trajectory-header">
+                                                ${result.career_progression?.has_upward_mobility ? 
+                                                    `<div class="trajectory-badge upward"><i class="trend-icon">↗️</i> Upward Trajectory</div>` : 
+                                                    `<div class="trajectory-badge neutral"><i class="trend-icon">→</i> Lateral Movement</div>`
+                                                }
                                             </div>
                                             
-                                            <div id="cultural-fit-details-${index}" class="cultural-fit-details" style="display: none;">
-                                                <div class="cultural-fit-detail-section">
-                                                    <h4>Company Values</h4>
-                                                    <div class="company-values-list">
-                                                        ${result.company_values?.map(value => 
-                                                            `<span class="company-value-badge ${result.cultural_fit_details?.matched_values?.includes(value) ? 'matched-value' : ''}">${value}</span>`
-                                                        ).join(' ') || '<span class="no-values">No company values defined</span>'}
-                                                    </div>
+                                            <div class="career-timeline">
+                                                ${result.promotion_trajectory && result.promotion_trajectory.length > 0 ? 
+                                                    result.promotion_trajectory.map(promotion => `
+                                                        <div class="timeline-item ${promotion.is_promotion ? 'promotion' : promotion.is_company_change ? 'company-change' : 'lateral'}">
+                                                            <div class="timeline-marker ${promotion.is_promotion ? 'promotion' : promotion.is_company_change ? 'company-change' : 'lateral'}">
+                                                                ${promotion.is_promotion ? '↗️' : promotion.is_company_change ? '🔄' : '→'}
+                                                            </div>
+                                                            <div class="timeline-content">
+                                                                <div class="timeline-title">
+                                                                    <span class="from-title">${promotion.from_title}</span>
+                                                                    <span class="arrow">→</span>
+                                                                    <span class="to-title">${promotion.to_title}</span>
+                                                                </div>
+                                                                <div class="timeline-subtitle">
+                                                                    ${promotion.is_company_change ? 
+                                                                        `<span class="company-change-label">Company Change:</span> ${promotion.from_company} → ${promotion.to_company}` : 
+                                                                        `<span class="internal-move-label">Internal:</span> ${promotion.to_company}`
+                                                                    }
+                                                                </div>
+                                                                <div class="timeline-level-change">
+                                                                    ${promotion.is_promotion ? 
+                                                                        `<span class="promotion-label">Promotion:</span>` : 
+                                                                        `<span class="move-label">Move:</span>`
+                                                                    }
+                                                                    ${promotion.from_level} → ${promotion.to_level}
+                                                                </div>
+                                                            </div>
+                                                        </div>
+                                                    `).join('') : 
+                                                    '<div class="no-data">Not enough data to analyze promotion trajectory</div>'
+                                                }
+                                            </div>
+                                        </div>
+                                        
+                                        <div id="job-switching-${index}" class="career-content">
+                                            <div class="job-switching-summary">
+                                                <div class="switch-frequency-badge ${
+                                                    result.job_switch_frequency?.frequency_tag === 'Frequent Switcher' ? 'frequent' : 
+                                                    result.job_switch_frequency?.frequency_tag === 'Moderate Switcher' ? 'moderate' : 'stable'
+                                                }">
+                                                    <i class="switch-icon">${
+                                                        result.job_switch_frequency?.frequency_tag === 'Frequent Switcher' ? '🔄' : 
+                                                        result.job_switch_frequency?.frequency_tag === 'Moderate Switcher' ? '↔️' : '🔒'
+                                                    }</i>
+                                                    ${result.job_switch_frequency?.frequency_tag || 'Unknown'}
                                                 </div>
                                                 
-                                                <div class="cultural-fit-detail-section">
-                                                    <h4>Matched Keywords</h4>
-                                                    <div class="matched-keywords-list">
-                                                        ${result.cultural_fit_details?.matched_keywords?.map(keyword => 
-                                                            `<span class="keyword-badge">${keyword}</span>`
-                                                        ).join(' ') || '<span class="no-keywords">No matching keywords found</span>'}
+                                                <div class="switch-stats">
+                                                    <div class="switch-stat">
+                                                        <div class="stat-value">${result.job_switch_frequency?.total_switches || 0}</div>
+                                                        <div class="stat-label">Job Changes</div>
+                                                    </div>
+                                                    <div class="switch-stat">
+                                                        <div class="stat-value">${result.job_switch_frequency?.years_of_experience || 0}</div>
+                                                        <div class="stat-label">Years Experience</div>
+                                                    </div>
+                                                    <div class="switch-stat">
+                                                        <div class="stat-value">${result.job_switch_frequency?.switches_per_year || 0}</div>
+                                                        <div class="stat-label">Changes/Year</div>
                                                     </div>
                                                 </div>
-                                                
-                                                ${result.cultural_fit_details?.improvement_suggestions?.length > 0 ? `
-                                                <div class="cultural-fit-detail-section">
-                                                    <h4>Improvement Suggestions</h4>
-                                                    <ul class="cultural-improvement-list">
-                                                        ${result.cultural_fit_details.improvement_suggestions.map(suggestion => 
-                                                            `<li>${suggestion}</li>`
-                                                        ).join('')}
-                                                    </ul>
-                                                </div>
-                                                ` : ''}
                                             </div>
                                         </div>
-                                    </div>
-
-                                    <div class="detail-section">
-                                        <h3>Career Progression Analysis</h3>
-                                        <div class="career-progression-section">
-                                            <div class="career-progression-tabs">
-                                                <div class="career-tab active" onclick="showCareerTab(this, 'promotion-trajectory-${index}')">
-                                                    <i class="career-icon">📈</i> Promotion Trajectory
-                                                </div>
-                                                <div class="career-tab" onclick="showCareerTab(this, 'job-switching-${index}')">
-                                                    <i class="career-icon">🔄</i> Job Switching
-                                                </div>
-                                                <div class="career-tab" onclick="showCareerTab(this, 'employment-gaps-${index}')">
-                                                    <i class="career-icon">⏱️</i> Employment Gaps
-                                                </div>
-                                            </div>
-                                            
-                                            <div class="career-content-container">
-                                                <div id="promotion-trajectory-${index}" class="career-content active">
-                                                    <div class="promotion-trajectory-header">
-                                                        ${result.career_progression?.has_upward_mobility ? 
-                                                            `<div class="trajectory-badge upward"><i class="trend-icon">↗️</i> Upward Trajectory</div>` : 
-                                                            `<div class="trajectory-badge neutral"><i class="trend-icon">→</i> Lateral Movement</div>`
-                                                        }
-                                                    </div>
-                                                    
-                                                    <div class="career-timeline">
-                                                        ${result.promotion_trajectory && result.promotion_trajectory.length > 0 ? 
-                                                            result.promotion_trajectory.map(promotion => `
-                                                                <div class="timeline-item ${promotion.is_promotion ? 'promotion' : promotion.is_company_change ? 'company-change' : 'lateral'}">
-                                                                    <div class="timeline-marker ${promotion.is_promotion ? 'promotion' : promotion.is_company_change ? 'company-change' : 'lateral'}">
-                                                                        ${promotion.is_promotion ? '↗️' : promotion.is_company_change ? '🔄' : '→'}
-                                                                    </div>
-                                                                    <div class="timeline-content">
-                                                                        <div class="timeline-title">
-                                                                            <span class="from-title">${promotion.from_title}</span>
-                                                                            <span class="arrow">→</span>
-                                                                            <span class="to-title">${promotion.to_title}</span>
-                                                                        </div>
-                                                                        <div class="timeline-subtitle">
-                                                                            ${promotion.is_company_change ? 
-                                                                                `<span class="company-change-label">Company Change:</span> ${promotion.from_company} → ${promotion.to_company}` : 
-                                                                                `<span class="internal-move-label">Internal:</span> ${promotion.to_company}`
-                                                                            }
-                                                                        </div>
-                                                                        <div class="timeline-level-change">
-                                                                            ${promotion.is_promotion ? 
-                                                                                `<span class="promotion-label">Promotion:</span>` : 
-                                                                                `<span class="move-label">Move:</span>`
-                                                                            }
-                                                                            ${promotion.from_level} → ${promotion.to_level}
-                                                                        </div>
-                                                                    </div>
-                                                                </div>
-                                                            `).join('') : 
-                                                            '<div class="no-data">Not enough data to analyze promotion trajectory</div>'
+                                        
+                                        <div id="employment-gaps-${index}" class="career-content">
+                                            ${result.employment_gaps && result.employment_gaps.length > 0 ? `
+                                                <div class="gaps-header">
+                                                    <div class="gaps-badge ${result.career_progression?.has_significant_gaps ? 'has-gaps' : 'no-gaps'}">
+                                                        ${result.career_progression?.has_significant_gaps ? 
+                                                            `<i class="gap-icon">⚠️</i> ${result.employment_gaps.length} Significant Gap(s)` : 
+                                                            `<i class="gap-icon">✅</i> No Significant Gaps`
                                                         }
                                                     </div>
                                                 </div>
                                                 
-                                                <div id="job-switching-${index}" class="career-content">
-                                                    <div class="job-switching-summary">
-                                                        <div class="switch-frequency-badge ${
-                                                            result.job_switch_frequency?.frequency_tag === 'Frequent Switcher' ? 'frequent' : 
-                                                            result.job_switch_frequency?.frequency_tag === 'Moderate Switcher' ? 'moderate' : 'stable'
-                                                        }">
-                                                            <i class="switch-icon">${
-                                                                result.job_switch_frequency?.frequency_tag === 'Frequent Switcher' ? '🔄' : 
-                                                                result.job_switch_frequency?.frequency_tag === 'Moderate Switcher' ? '↔️' : '🔒'
-                                                            }</i>
-                                                            ${result.job_switch_frequency?.frequency_tag || 'Unknown'}
-                                                        </div>
-                                                        
-                                                        <div class="switch-stats">
-                                                            <div class="switch-stat">
-                                                                <div class="stat-value">${result.job_switch_frequency?.total_switches || 0}</div>
-                                                                <div class="stat-label">Job Changes</div>
+                                                <div class="gaps-list">
+                                                    ${result.employment_gaps.map(gap => `
+                                                        <div class="gap-item">
+                                                            <div class="gap-duration ${gap.duration_months > 12 ? 'long-gap' : gap.duration_months > 6 ? 'medium-gap' : 'short-gap'}">
+                                                                ${gap.duration_months} ${gap.duration_months === 1 ? 'month' : 'months'}
                                                             </div>
-                                                            <div class="switch-stat">
-                                                                <div class="stat-value">${result.job_switch_frequency?.years_of_experience || 0}</div>
-                                                                <div class="stat-label">Years Experience</div>
-                                                            </div>
-                                                            <div class="switch-stat">
-                                                                <div class="stat-value">${result.job_switch_frequency?.switches_per_year || 0}</div>
-                                                                <div class="stat-label">Changes/Year</div>
+                                                            <div class="gap-details">
+                                                                <div class="gap-positions">
+                                                                    ${gap.previous_position} → ${gap.next_position}
+                                                                </div>
+                                                                <div class="gap-timeframe">
+                                                                    ${new Date(gap.start_date).toLocaleDateString()} - ${new Date(gap.end_date).toLocaleDateString()}
+                                                                </div>
                                                             </div>
                                                         </div>
-                                                    </div>
+                                                    `).join('')}
                                                 </div>
-                                                
-                                                <div id="employment-gaps-${index}" class="career-content">
-                                                    ${result.employment_gaps && result.employment_gaps.length > 0 ? `
-                                                        <div class="gaps-header">
-                                                            <div class="gaps-badge ${result.career_progression?.has_significant_gaps ? 'has-gaps' : 'no-gaps'}">
-                                                                ${result.career_progression?.has_significant_gaps ? 
-                                                                    `<i class="gap-icon">⚠️</i> ${result.employment_gaps.length} Significant Gap(s)` : 
-                                                                    `<i class="gap-icon">✅</i> No Significant Gaps`
-                                                                }
-                                                            </div>
-                                                        </div>
-                                                        
-                                                        <div class="gaps-list">
-                                                            ${result.employment_gaps.map(gap => `
-                                                                <div class="gap-item">
-                                                                    <div class="gap-duration ${gap.duration_months > 12 ? 'long-gap' : gap.duration_months > 6 ? 'medium-gap' : 'short-gap'}">
-                                                                        ${gap.duration_months} ${gap.duration_months === 1 ? 'month' : 'months'}
-                                                                    </div>
-                                                                    <div class="gap-details">
-                                                                        <div class="gap-positions">
-                                                                            ${gap.previous_position} → ${gap.next_position}
-                                                                        </div>
-                                                                        <div class="gap-timeframe">
-                                                                            ${new Date(gap.start_date).toLocaleDateString()} - ${new Date(gap.end_date).toLocaleDateString()}
-                                                                        </div>
-                                                                    </div>
-                                                                </div>
-                                                            `).join('')}
-                                                        </div>
-                                                    ` : `
-                                                        <div class="no-gaps-message">
-                                                            <i class="gap-icon">✅</i> No significant employment gaps detected
-                                                        </div>
-                                                    `}
+                                            ` : `
+                                                <div class="no-gaps-message">
+                                                    <i class="gap-icon">✅</i> No significant employment gaps detected
                                                 </div>
-                                            </div>
+                                            `}
                                         </div>
                                     </div>
+                                </div>
+                            </div>
 
-                                    <div class="detail-section">
-                                        <h3>Career Fit</h3>
-                                        <div class="career-stats">
-                                            <div class="stat-item">
-                                                <div class="stat-label">Market Alignment</div>
-                                                <div class="stat-value">${(result.market_alignment_score * 100).toFixed(0)}%</div>
-                                            </div>
-                                            <div class="stat-item">
-                                                <div class="stat-label">Overall Fitment</div>
-                                                <div class="stat-value">${(result.overall_fitment_score * 100).toFixed(0)}%</div>
-                                            </div>
+                            <div class="detail-section">
+                                <h3>Career Fit</h3>
+                                <div class="career-stats">
+                                    <div class="stat-item">
+                                        <div class="stat-label">Market Alignment</div>
+                                        <div class="stat-value">${(result.market_alignment_score * 100).toFixed(0)}%</div>
+                                    </div>
+                                    <div class="stat-item">
+                                        <div class="stat-label">Overall Fitment</div>
+                                        <div class="stat-value">${(result.overall_fitment_score * 100).toFixed(0)}%</div>
+                                    </div>
+                                </div>
+                                
+                                <h4>Strength Areas</h4>
+                                <div class="skill-list strengths-list">
+                                    ${result.strength_areas.map(area => `<span class="skill-badge badge-success">${area}</span>`).join(' ')}
+                                </div>
+                            </div>
+                        </div>
+                        
+                        <div class="career-forecast-section">
+                            <div class="forecast-header">
+                                <h3>
+                                    Career Forecast
+                                    <span class="info-tooltip" data-tooltip="AI-powered 3-year career projection based on sequence modeling of real-world career trajectories">ⓘ</span>
+                                </h3>
+                                <div class="model-info">
+                                    <div class="model-badge">
+                                        <span class="model-icon">🧠</span> ${result.career_forecast?.model_type || 'AI'} Model
+                                    </div>
+                                    <div class="model-accuracy">
+                                        <div class="accuracy-item">
+                                            <span class="accuracy-label">AI Model:</span>
+                                            <span class="accuracy-value">${((result.career_forecast?.ml_model_accuracy || 0) * 100).toFixed(0)}%</span>
                                         </div>
-                                        
-                                        <h4>Strength Areas</h4>
-                                        <div class="skill-list strengths-list">
-                                            ${result.strength_areas.map(area => `<span class="skill-badge badge-success">${area}</span>`).join(' ')}
+                                        <div class="accuracy-item">
+                                            <span class="accuracy-label">Baseline:</span>
+                                            <span class="accuracy-value">${((result.career_forecast?.baseline_accuracy || 0) * 100).toFixed(0)}%</span>
                                         </div>
                                     </div>
                                 </div>
-                                
-                                <div class="career-forecast-section">
-                                    <div class="forecast-header">
-                                        <h3>
-                                            Career Forecast
-                                            <span class="info-tooltip" data-tooltip="AI-powered 3-year career projection based on sequence modeling of real-world career trajectories">ⓘ</span>
-                                        </h3>
-                                        <div class="model-info">
-                                            <div class="model-badge">
-                                                <span class="model-icon">🧠</span> ${result.career_forecast?.model_type || 'AI'} Model
-                                            </div>
-                                            <div class="model-accuracy">
-                                                <div class="accuracy-item">
-                                                    <span class="accuracy-label">AI Model:</span>
-                                                    <span class="accuracy-value">${((result.career_forecast?.ml_model_accuracy || 0) * 100).toFixed(0)}%</span>
-                                                </div>
-                                                <div class="accuracy-item">
-                                                    <span class="accuracy-label">Baseline:</span>
-                                                    <span class="accuracy-value">${((result.career_forecast?.baseline_accuracy || 0) * 100).toFixed(0)}%</span>
+                            </div>
+                            
+                            <div class="forecast-timeline">
+                                ${result.career_forecast?.forecast_timeline.map((prediction, idx) => `
+                                    <div class="timeline-year">
+                                        <div class="year-marker ${idx === 0 ? 'current' : ''}">
+                                            <div class="year-label">${prediction.timepoint}</div>
+                                            <div class="year-confidence">
+                                                <div class="confidence-bar">
+                                                    <div class="confidence-fill" style="width: ${(prediction.confidence_score * 100).toFixed(0)}%"></div>
                                                 </div>
+                                                <div class="confidence-value">${(prediction.confidence_score * 100).toFixed(0)}% confidence</div>
                                             </div>
                                         </div>
-                                    </div>
-                                    
-                                    <div class="forecast-timeline">
-                                        ${result.career_forecast?.forecast_timeline.map((prediction, idx) => `
-                                            <div class="timeline-year">
-                                                <div class="year-marker ${idx === 0 ? 'current' : ''}">
-                                                    <div class="year-label">${prediction.timepoint}</div>
-                                                    <div class="year-confidence">
-                                                        <div class="confidence-bar">
-                                                            <div class="confidence-fill" style="width: ${(prediction.confidence_score * 100).toFixed(0)}%"></div>
-                                                        </div>
-                                                        <div class="confidence-value">${(prediction.confidence_score * 100).toFixed(0)}% confidence</div>
-                                                    </div>
+                                        
+                                        <div class="prediction-card">
+                                            <div class="prediction-role">
+                                                <div class="role-title">${prediction.predicted_role}</div>
+                                                <div class="role-salary">${prediction.salary_range ? 
+                                                    `$${prediction.salary_range.min.toLocaleString()} - $${prediction.salary_range.max.toLocaleString()}` : 
+                                                    ''}
                                                 </div>
-                                                
-                                                <div class="prediction-card">
-                                                    <div class="prediction-role">
-                                                        <div class="role-title">${prediction.predicted_role}</div>
-                                                        <div class="role-salary">${prediction.salary_range ? 
-                                                            `$${prediction.salary_range.min.toLocaleString()} - $${prediction.salary_range.max.toLocaleString()}` : 
-                                                            ''}
-                                                        </div>
-                                                    </div>
-                                                    
-                                                    <div class="alternative-roles">
-                                                        <div class="alt-roles-label">Alternative Paths:</div>
-                                                        <div class="alt-roles-list">
-                                                            ${prediction.alternative_roles.map(role => 
-                                                                `<span class="alt-role">${role}</span>`
-                                                            ).join(' ')}
-                                                        </div>
-                                                    </div>
-                                                    
-                                                    <div class="skill-gaps-container">
-                                                        <div class="skill-gaps-label">Skills to Acquire:</div>
-                                                        <div class="skill-gaps-list">
-                                                            ${prediction.skill_gaps.map(gap => `
-                                                                <div class="skill-gap-item ${gap.priority_level.toLowerCase()}-priority">
-                                                                    <div class="gap-skill">${gap.skills_needed.join(', ')}</div>
-                                                                    <div class="gap-priority">${gap.priority_level}</div>
-                                                                    ${gap.learning_resources ? `
-                                                                        <div class="gap-resources" data-tooltip="Learning Resources: ${gap.learning_resources.join(', ')}">
-                                                                            <span class="resource-icon">📚</span>
-                                                                        </div>
-                                                                    ` : ''}
+                                            </div>
+                                            
+                                            <div class="alternative-roles">
+                                                <div class="alt-roles-label">Alternative Paths:</div>
+                                                <div class="alt-roles-list">
+                                                    ${prediction.alternative_roles.map(role => 
+                                                        `<span class="alt-role">${role}</span>`
+                                                    ).join(' ')}
+                                                </div>
+                                            </div>
+                                            
+                                            <div class="skill-gaps-container">
+                                                <div class="skill-gaps-label">Skills to Acquire:</div>
+                                                <div class="skill-gaps-list">
+                                                    ${prediction.skill_gaps.map(gap => `
+                                                        <div class="skill-gap-item ${gap.priority_level.toLowerCase()}-priority">
+                                                            <div class="gap-skill">${gap.skills_needed.join(', ')}</div>
+                                                            <div class="gap-priority">${gap.priority_level}</div>
+                                                            ${gap.learning_resources ? `
+                                                                <div class="gap-resources" data-tooltip="Learning Resources: ${gap.learning_resources.join(', ')}">
+                                                                    <span class="resource-icon">📚</span>
                                                                 </div>
-                                                            `).join('')}
-                                                        </div>
-                                                    </div>
-                                                    
-                                                    <div class="market-demand">
-                                                        <div class="demand-label">Market Demand:</div>
-                                                        <div class="demand-gauge">
-                                                            <div class="demand-fill" style="width: ${(prediction.market_demand_score * 100).toFixed(0)}%"></div>
+                                                            ` : ''}
                                                         </div>
-                                                        <div class="demand-value">${(prediction.market_demand_score * 100).toFixed(0)}%</div>
-                                                    </div>
+                                                    `).join('')}
                                                 </div>
                                             </div>
-                                            ${idx < result.career_forecast.forecast_timeline.length - 1 ? `<div class="timeline-connector"></div>` : ''}
-                                        `).join('') || `<div class="no-forecast">Insufficient data to generate career forecast</div>`}
-                                    </div>
-                                    
-                                    <div class="forecast-summary">
-                                        <div class="top-skills-section">
-                                            <h4>Top Skills to Acquire</h4>
-                                            <div class="top-skills-list">
-                                                ${result.career_forecast?.top_skills_to_acquire.map(skill => 
-                                                    `<div class="top-skill-item"><span class="top-skill-icon">⭐</span> ${skill}</div>`
-                                                ).join('') || 'No skill recommendations available'}
-                                            </div>
-                                        </div>
-                                        
-                                        <div class="industry-alignment">
-                                            <h4>Industry Alignment</h4>
-                                            <div class="alignment-score">
-                                                <div class="alignment-gauge">
-                                                    <div class="alignment-fill" style="width: ${((result.career_forecast?.industry_alignment_score || 0) * 100).toFixed(0)}%"></div>
+                                            
+                                            <div class="market-demand">
+                                                <div class="demand-label">Market Demand:</div>
+                                                <div class="demand-gauge">
+                                                    <div class="demand-fill" style="width: ${(prediction.market_demand_score * 100).toFixed(0)}%"></div>
                                                 </div>
-                                                <div class="alignment-value">${((result.career_forecast?.industry_alignment_score || 0) * 100).toFixed(0)}%</div>
+                                                <div class="demand-value">${(prediction.market_demand_score * 100).toFixed(0)}%</div>
                                             </div>
                                         </div>
-                                        
-                                        <div class="forecast-explainer">
-                                            <p>This forecast combines time-series modeling of career trajectories with industry-specific insights to predict career growth over the next 3 years.</p>
-                                        </div>
+                                    </div>
+                                    ${idx < result.career_forecast.forecast_timeline.length - 1 ? `<div class="timeline-connector"></div>` : ''}
+                                `).join('') || `<div class="no-forecast">Insufficient data to generate career forecast</div>`}
+                            </div>
+                            
+                            <div class="forecast-summary">
+                                <div class="top-skills-section">
+                                    <h4>Top Skills to Acquire</h4>
+                                    <div class="top-skills-list">
+                                        ${result.career_forecast?.top_skills_to_acquire.map(skill => 
+                                            `<div class="top-skill-item"><span class="top-skill-icon">⭐</span> ${skill}</div>`
+                                        ).join('') || 'No skill recommendations available'}
                                     </div>
                                 </div>
                                 
-                                <div class="career-insights">
-                                    <div class="insights-section">
-                                        <h3>Best Matched Roles</h3>
-                                        <div class="roles-list">
-                                            ${result.best_matched_roles.slice(0, 3).map(suggestion => `
-                                                <div class="role-item">${suggestion.role_title}</div>
-                                            `).join('')}
+                                <div class="industry-alignment">
+                                    <h4>Industry Alignment</h4>
+                                    <div class="alignment-score">
+                                        <div class="alignment-gauge">
+                                            <div class="alignment-fill" style="width: ${((result.career_forecast?.industry_alignment_score || 0) * 100).toFixed(0)}%"></div>
                                         </div>
-                                    </div>
-                                    
-                                    <div class="insights-section">
-                                        <h3>Growth Opportunities</h3>
-                                        <ul class="growth-list">
-                                            ${result.growth_opportunities.map(opportunity => `
-                                                <li><span class="growth-item">${opportunity}</span></li>
-                                            `).join('')}
-                                        </ul>
+                                        <div class="alignment-value">${((result.career_forecast?.industry_alignment_score || 0) * 100).toFixed(0)}%</div>
                                     </div>
                                 </div>
+                                
+                                <div class="forecast-explainer">
+                                    <p>This forecast combines time-series modeling of career trajectories with industry-specific insights to predict career growth over the next 3 years.</p>
+                                </div>
                             </div>
-                        `;
+                        </div>
+                        
+                        <div class="career-insights">
+                            <div class="insights-section">
+                                <h3>Best Matched Roles</h3>
+                                <div class="roles-list">
+                                    ${result.best_matched_roles.slice(0, 3).map(suggestion => `
+                                        <div class="role-item">${suggestion.role_title}</div>
+                                    `).join('')}
+                                </div>
+                            </div>
+                            
+                            <div class="insights-section">
+                                <h3>Growth Opportunities</h3>
+                                <ul class="growth-list">
+                                    ${result.growth_opportunities.map(opportunity => `
+                                        <li><span class="growth-item">${opportunity}</span></li>
+                                    `).join('')}
+                                </ul>
+                            </div>
+                        </div>
+                    </div>
+                `;
+            }
+
+            // Insert a candidate card, keeping the list ordered by match score while results stream in
+            function insertCandidateCard(container, result, index) {
+                const entry = document.createElement('div');
+                entry.className = 'candidate-entry';
+                entry.dataset.index = index;
+                entry.dataset.score = result.match_score;
+                entry.innerHTML = buildCandidateCard(result, index);
+                
+                const next = Array.from(container.children).find(child => parseFloat(child.dataset.score) < result.match_score);
+                container.insertBefore(entry, next || null);
+            }
+
+            // Read a newline-delimited JSON response, calling onMessage for each object as it arrives
+            async function readNdjsonStream(response, onMessage) {
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                let buffer = '';
+                
+                while (true) {
+                    const { done, value } = await reader.read();
+                    if (done) {
+                        break;
+                    }
+                    buffer += decoder.decode(value, { stream: true });
+                    const lines = buffer.split('\\n');
+                    buffer = lines.pop();
+                    lines.filter(line => line.trim()).forEach(line => onMessage(JSON.parse(line)));
+                }
+                
+                if (buffer.trim()) {
+                    onMessage(JSON.parse(buffer));
+                }
+            }
+
+            // Job requirement described by the form
+            function buildJobRequirement() {
+                return {
+                    title: document.getElementById('jobTitle').value,
+                    required_skills: requiredSkills,
+                    preferred_skills: preferredSkills,
+                    experience_years: parseFloat(document.getElementById('experienceYears').value) || 0,
+                    education_level: document.getElementById('educationLevel').value || document.getElementById('educationLevelInput').value,
+                    industry: document.getElementById('industry').value,
+                    keywords: keywords,
+                    required_certifications: certifications,
+                    company_values: companyValues,
+                    // Add weight configuration
+                    score_weights: {
+                        skill_match: scoreWeights.skillMatch / 100,
+                        experience_match: scoreWeights.experienceMatch / 100,
+                        tech_relevance: scoreWeights.techRelevance / 100
+                    }
+                };
+            }
+            
+            // Fix analyzeResumes function to properly display results
+            async function analyzeResumes() {
+                if (parsedResumes.length === 0) {
+                    alert('Please upload and parse resumes first');
+                    return;
+                }
+                
+                const jobRequirement = buildJobRequirement();
+                
+                document.getElementById('analysisLoading').style.display = 'block';
+                document.getElementById('analysisResult').innerHTML = '';
+                
+                // Refer to stored candidates by id instead of re-sending every parsed resume
+                const batch = parsedResumes.every(r => r.data.candidate_id)
+                    ? { candidate_ids: parsedResumes.map(r => r.data.candidate_id) }
+                    : { resumes: parsedResumes.map(r => r.data) };
+                
+                try {
+                    const response = await fetch('/batch-analyze/stream', {
+                        method: 'POST',
+                        headers: {
+                            'Content-Type': 'application/json',
+                        },
+                        body: JSON.stringify({
+                            ...batch,
+                            job_requirement: jobRequirement
+                        })
                     });
                     
+                    if (!response.ok) {
+                        throw new Error(`HTTP error! status: ${response.status}`);
+                    }
+                    
+                    // Session used by applyWeights() to re-weight these results without re-analyzing
+                    rankingSessionId = response.headers.get('X-Ranking-Session');
+                    analysisResults = {};
+                    
+                    // Reset missing certifications data array
+                    missingCertificationsData = [];
+                    
+                    // Generate result HTML
+                    let resultsHtml = '';
+                    
+                    // Add a summary of the weights used for this ranking
+                    resultsHtml += `
+                        <div class="weights-summary">
+                            <h3>Ranking Criteria</h3>
+                            <div class="weights-summary-content">
+                                <div class="weight-summary-item">
+                                    <div class="weight-summary-label">Skill Match</div>
+                                    <div class="weight-summary-value">${scoreWeights.skillMatch}%</div>
+                                </div>
+                                <div class="weight-summary-item">
+                                    <div class="weight-summary-label">Experience Match</div>
+                                    <div class="weight-summary-value">${scoreWeights.experienceMatch}%</div>
+                                </div>
+                                <div class="weight-summary-item">
+                                    <div class="weight-summary-label">Technology Relevance</div>
+                                    <div class="weight-summary-value">${scoreWeights.techRelevance}%</div>
+                                </div>
+                            </div>
+                        </div>
+                    `;
+                    
+                    resultsHtml += '<div id="candidateList"></div>';
+                    
                     // Insert results HTML
                     document.getElementById('analysisResult').innerHTML = resultsHtml;
                     
@@ -4001,14 +4320,38 @@ async def root():
                         
                         // Add/refresh styles for career progression analysis
                         addMissingStyles();
-                        
-                        // Initialize tooltips for new content
-                        if (window.initializeTooltips) {
-                            window.initializeTooltips();
-                        }
                     } else {
                         console.error('Results section not found');
                     }
+                    
+                    // Render each candidate as soon as the server has ranked it
+                    const candidateList = document.getElementById('candidateList');
+                    await readNdjsonStream(response, message => {
+                        if (message.type === 'result') {
+                            analysisResults[message.index] = message.result;
+                            insertCandidateCard(candidateList, message.result, message.index);
+                        } else if (message.type === 'summary') {
+                            // Apply the server's final ranked order
+                            message.ranking.forEach(index => {
+                                const entry = candidateList.querySelector(`.candidate-entry[data-index="${index}"]`);
+                                if (entry) {
+                                    candidateList.appendChild(entry);
+                                }
+                            });
+                        } else if (message.type === 'error') {
+                            throw new Error(message.detail);
+                        }
+                    });
+                    
+                    // Results are ranked with the default weights; apply the sliders if they were changed
+                    if (rankingSessionId && !usingDefaultWeights()) {
+                        await rerankResults();
+                    }
+                    
+                    // Initialize tooltips for new content
+                    if (window.initializeTooltips) {
+                        window.initializeTooltips();
+                    }
                 } catch (error) {
                     console.error('Analysis error:', error);
                     document.getElementById('analysisResult').innerHTML = `
@@ -4991,71 +5334,161 @@ async def root():
     </html>
     """
 
+def _extract_upload_text(filename: str, contents: bytes) -> Tuple[str, Optional[TextExtraction]]:
+    """Extract text from an upload's in-memory contents (runs on the I/O pool).
+
+    PDFs also report whether a page, character or time budget cut their text short.
+    """
+    # Extract text based on file type
+    if filename.endswith(".pdf"):
+        extraction = extract_pdf_bytes(contents)
+        return extraction.text, TextExtraction(
+            truncated=extraction.truncated,
+            limit=extraction.limit,
+            page_count=extraction.page_count,
+            pages_extracted=extraction.pages_extracted
+        )
+    return extract_text_from_docx_bytes(contents), None
+
+def _upload_result(filename: str, data: ResumeData) -> UploadResult:
+    extraction = data.extraction
+    return UploadResult(
+        filename=filename,
+        success=True,
+        data=data,
+        truncated=bool(extraction and extraction.truncated),
+        limit=extraction.limit if extraction else None
+    )
+
 @app.post("/upload-resume", response_model=ResumeData)
 async def upload_resume(file: UploadFile = File(...)):
+    async with endpoint_limiters["upload-resume"].slot():
+        return await _process_upload(file)
+
+@app.post("/upload-resumes", response_model=List[UploadResult])
+async def upload_resumes(files: List[UploadFile] = File(...)):
+    if len(files) > MAX_UPLOAD_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files: {len(files)}. At most {MAX_UPLOAD_FILES} resumes can be uploaded at once."
+        )
+    async with endpoint_limiters["upload-resumes"].slot():
+        return await _process_uploads(files)
+
+def _unknown_resume() -> ResumeData:
+    """Placeholder returned when a resume cannot be parsed."""
+    from datetime import datetime
+    record_fallback("unknown_resume", "parse_failed")
+    return ResumeData(
+        name="Unknown",
+        email="unknown@example.com",
+        skills=["Unknown"],
+        education=[],
+        experience=[
+            Experience(
+                title="Unknown Position",
+                company="Unknown Company",
+                start_date=datetime.now().date(),
+                end_date=datetime.now().date(),
+                description=["Unknown description"],
+                skills_used=["Unknown Skill"]
+            )
+        ]
+    )
+
+async def _read_upload(file: UploadFile) -> Tuple[bytes, str, Optional[ResumeData], Optional[TextExtraction]]:
+    """Validate an upload and extract its text, or return its cached parse result."""
     contents = await file.read()
-    text = ""
-    temp_file_path = ""
+    
+    # Validate file extension
+    if not (file.filename.endswith(".pdf") or file.filename.endswith(".docx")):
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Unsupported file format: {file.filename}. Only PDF and DOCX files are supported."
+        )
+    
+    # Re-uploads of an identical file skip extraction and parsing entirely
+    if parse_cache:
+        cached = await io_pool.run(parse_cache.get, contents)
+        if cached:
+            logging.debug(f"Parse cache hit for {file.filename}")
+            return contents, cached.text, cached.resume_data, cached.resume_data.extraction
+    
+    # Extract text off the event loop
+    text, extraction = await io_pool.run(_extract_upload_text, file.filename, contents)
+    
+    # Check if text extraction was successful
+    if not text or not text.strip():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Could not extract text from {file.filename}. The file might be empty, corrupted, or contain only images."
+        )
+    
+    # Log the extracted text for debugging
+    logging.debug(f"Extracted text from {file.filename}: {text[:500]}...")
+    return contents, text, None, extraction
+
+async def _finish_upload(filename: str, contents: bytes, text: str, extracted_data: ResumeData,
+                         extraction: Optional[TextExtraction] = None) -> ResumeData:
+    """Fill in missing experience data, record how much of the file was extracted and cache the parse result."""
+    extracted_data.extraction = extraction
+    # Log the extracted data for debugging
+    logging.debug(f"Extracted data from {filename}: {extracted_data}")
+    
+    from datetime import datetime
+    # Validate that we have at least one experience entry with valid dates
+    if not extracted_data.experience:
+        logging.warning(f"No experience found in {filename}, adding default experience")
+        record_fallback("default_position", "upload_without_experience")
+        extracted_data.experience.append(
+            Experience(
+                title="Default Position",
+                company="Default Company",
+                start_date=datetime.now().date(),
+                end_date=datetime.now().date(),
+                description=["Default description"],
+                skills_used=["Default Skill"]
+            )
+        )
+    
+    # Ensure all experience entries have valid dates
+    for exp in extracted_data.experience:
+        if exp.start_date is None:
+            exp.start_date = datetime.now().date()
+        if exp.end_date is None:
+            exp.end_date = datetime.now().date()
+    
+    if parse_cache:
+        await io_pool.run(parse_cache.put, contents, text, extracted_data)
+    
+    return await _store_candidate(filename, contents, extracted_data)
+
+async def _store_candidate(filename: str, contents: bytes, resume_data: ResumeData) -> ResumeData:
+    """Keep a parsed resume in the candidate store and tag it with its candidate id."""
+    if not candidate_store:
+        return resume_data
+    try:
+        stored = await io_pool.run(store_upload, candidate_store, contents, resume_data, filename)
+        skill_index.add(stored.candidate_id, stored.resume_data)
+        await io_pool.run(semantic_index.add, stored.candidate_id, stored.resume_data)
+        await io_pool.run(ann_index.add, stored.candidate_id, stored.resume_data)
+        _schedule_semantic_refit()
+        _schedule_ann_training()
+        return stored.resume_data
+    except Exception as e:
+        logging.error(f"Error storing candidate {filename}: {str(e)}")
+        return resume_data
 
+async def _process_upload(file: UploadFile) -> ResumeData:
     try:
-        # Validate file extension
-        if not (file.filename.endswith(".pdf") or file.filename.endswith(".docx")):
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Unsupported file format: {file.filename}. Only PDF and DOCX files are supported."
-            )
-        
-        # Create temp file with appropriate extension
-        temp_file_path = f"temp_{file.filename}"
-        with open(temp_file_path, "wb") as f:
-            f.write(contents)
-        
-        # Extract text based on file type
-        if file.filename.endswith(".pdf"):
-            text = extract_text_from_pdf(temp_file_path)
-        else:  # .docx
-            text = extract_text_from_docx(temp_file_path)
-        
-        # Check if text extraction was successful
-        if not text or not text.strip():
-            raise HTTPException(
-                status_code=400,
-                detail=f"Could not extract text from {file.filename}. The file might be empty, corrupted, or contain only images."
-            )
+        contents, text, cached, extraction = await _read_upload(file)
+        if cached:
+            return await _store_candidate(file.filename, contents, cached)
         
         # Extract entities from text
         try:
-            # Log the extracted text for debugging
-            logging.debug(f"Extracted text from {file.filename}: {text[:500]}...")
-            
-            extracted_data = extract_entities(text)
-            
-            # Log the extracted data for debugging
-            logging.debug(f"Extracted data from {file.filename}: {extracted_data}")
-            
-            # Validate that we have at least one experience entry with valid dates
-            if not extracted_data.experience:
-                logging.warning(f"No experience found in {file.filename}, adding default experience")
-                from datetime import datetime
-                extracted_data.experience.append(
-                    Experience(
-                        title="Default Position",
-                        company="Default Company",
-                        start_date=datetime.now().date(),
-                        end_date=datetime.now().date(),
-                        description=["Default description"],
-                        skills_used=["Default Skill"]
-                    )
-                )
-            
-            # Ensure all experience entries have valid dates
-            for exp in extracted_data.experience:
-                if exp.start_date is None:
-                    exp.start_date = datetime.now().date()
-                if exp.end_date is None:
-                    exp.end_date = datetime.now().date()
-            
-            return extracted_data
+            extracted_data = await cpu_pool.run(extract_entities, text)
+            return await _finish_upload(file.filename, contents, text, extracted_data, extraction)
         except Exception as entity_error:
             # Log the full error for debugging
             import traceback
@@ -5063,23 +5496,7 @@ async def upload_resume(file: UploadFile = File(...)):
             logging.error(f"Error extracting information from {file.filename}: {error_details}")
             
             # Return a default ResumeData object instead of raising an exception
-            from datetime import datetime
-            return ResumeData(
-                name="Unknown",
-                email="unknown@example.com",
-                skills=["Unknown"],
-                education=[],
-                experience=[
-                    Experience(
-                        title="Unknown Position",
-                        company="Unknown Company",
-                        start_date=datetime.now().date(),
-                        end_date=datetime.now().date(),
-                        description=["Unknown description"],
-                        skills_used=["Unknown Skill"]
-                    )
-                ]
-            )
+            return _unknown_resume()
             
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -5091,35 +5508,75 @@ async def upload_resume(file: UploadFile = File(...)):
         logging.error(f"Error processing {file.filename}: {error_details}")
         
         # Return a default ResumeData object instead of raising an exception
-        from datetime import datetime
-        return ResumeData(
-            name="Unknown",
-            email="unknown@example.com",
-            skills=["Unknown"],
-            education=[],
-            experience=[
-                Experience(
-                    title="Unknown Position",
-                    company="Unknown Company",
-                    start_date=datetime.now().date(),
-                    end_date=datetime.now().date(),
-                    description=["Unknown description"],
-                    skills_used=["Unknown Skill"]
-                )
-            ]
-        )
-    finally:
-        # Clean up temp file
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except Exception as e:
-                logging.error(f"Error removing temp file {temp_file_path}: {str(e)}")
+        return _unknown_resume()
+
+async def _process_uploads(files: List[UploadFile]) -> List[UploadResult]:
+    """Parse a bulk upload, batching entity extraction across files; results keep upload order."""
+    results: List[Optional[UploadResult]] = [None] * len(files)
+    pending = []  # (position, contents, text, extraction) of files that still need parsing
+    
+    # Read and extract text from all files concurrently
+    reads = await asyncio.gather(*[_read_upload(file) for file in files], return_exceptions=True)
+    for position, (file, read) in enumerate(zip(files, reads)):
+        if isinstance(read, HTTPException):
+            results[position] = UploadResult(filename=file.filename, success=False, error=str(read.detail))
+        elif isinstance(read, Exception):
+            logging.error(f"Error processing {file.filename}: {str(read)}")
+            results[position] = UploadResult(filename=file.filename, success=False, error=str(read))
+        else:
+            contents, text, cached, extraction = read
+            if cached:
+                data = await _store_candidate(file.filename, contents, cached)
+                results[position] = _upload_result(file.filename, data)
+            else:
+                pending.append((position, contents, text, extraction))
+    
+    if pending:
+        parsed = await _parse_texts([text for _, _, text, _ in pending])
+        for (position, contents, text, extraction), extracted_data in zip(pending, parsed):
+            filename = files[position].filename
+            if isinstance(extracted_data, Exception):
+                results[position] = UploadResult(filename=filename, success=False, error=str(extracted_data))
+            else:
+                data = await _finish_upload(filename, contents, text, extracted_data, extraction)
+                results[position] = _upload_result(filename, data)
+    
+    return results
+
+async def _parse_texts(texts: List[str]) -> List[Union[ResumeData, Exception]]:
+    """Run entity extraction on the process pool, one nlp.pipe batch per worker chunk.
+    
+    Texts of a chunk whose worker failed get the chunk's exception instead of a result.
+    """
+    size = math.ceil(len(texts) / batch_ranker.max_workers)
+    chunks = [texts[start:start + size] for start in range(0, len(texts), size)]
+    outcomes = await asyncio.gather(
+        *[cpu_pool.run(extract_entities_batch, chunk) for chunk in chunks],
+        return_exceptions=True
+    )
+    
+    parsed = []
+    for chunk, outcome in zip(chunks, outcomes):
+        if isinstance(outcome, Exception):
+            logging.error(f"Error extracting information from uploaded resumes: {str(outcome)}")
+            parsed.extend([outcome] * len(chunk))
+        else:
+            parsed.extend(outcome)
+    return parsed
 
 @app.post("/analyze-resume", response_model=JobMatch)
 async def analyze_resume(request: AnalyzeResumeRequest):
+    async with endpoint_limiters["analyze-resume"].slot():
+        return await _analyze_resume(request)
+
+async def _analyze_resume(request: AnalyzeResumeRequest) -> JobMatch:
+    resume_data = request.resume_data
+    if resume_data is None:
+        if not request.candidate_id:
+            raise HTTPException(status_code=400, detail="Either resume_data or candidate_id is required")
+        resume_data = (await _load_candidates([request.candidate_id]))[0]
     try:
-        match_result = ranker.rank_resume(request.resume_data, request.job_requirement)
+        match_result = await batch_ranker.rank_async(resume_data, request.job_requirement)
         return match_result
     except Exception as e:
         import traceback
@@ -5127,19 +5584,354 @@ async def analyze_resume(request: AnalyzeResumeRequest):
         logging.error(f"Error in analyze_resume: {error_details}")
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n\nTraceback:\n{error_details}")
 
+def _schedule_semantic_refit():
+    """Refit the semantic index in the background once the pool has outgrown its vocabulary."""
+    global semantic_refit
+    if semantic_index.needs_refit and (semantic_refit is None or semantic_refit.done()):
+        semantic_refit = asyncio.ensure_future(_refit_semantic_index())
+
+async def _refit_semantic_index():
+    try:
+        await io_pool.run(semantic_index.fit_from_store, candidate_store)
+        # Catch up with candidates uploaded while fitting
+        await io_pool.run(semantic_index.sync_with_store, candidate_store)
+        await io_pool.run(semantic_index.save)
+    except Exception as e:
+        logging.error(f"Error refitting semantic index: {str(e)}")
+
+def _schedule_ann_training():
+    """(Re)train the ANN index's lists in the background once the pool is large enough or has doubled."""
+    global ann_training
+    if ann_index.needs_training and (ann_training is None or ann_training.done()):
+        ann_training = asyncio.ensure_future(_train_ann_index())
+
+async def _train_ann_index():
+    try:
+        await io_pool.run(ann_index.train)
+        await io_pool.run(ann_index.save)
+    except Exception as e:
+        logging.error(f"Error training ANN index: {str(e)}")
+
+async def _load_candidates(candidate_ids: List[str]) -> List[ResumeData]:
+    """Resumes of stored candidates, in the given order."""
+    if not candidate_store:
+        raise HTTPException(status_code=400, detail="The candidate store is disabled, send the resumes instead")
+    stored = await io_pool.run(candidate_store.get_many, candidate_ids)
+    missing = [candidate_id for candidate_id, candidate in zip(candidate_ids, stored) if candidate is None]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Unknown candidate ids: {missing}")
+    return [candidate.resume_data for candidate in stored]
+
+async def _resolve_resumes(request: BatchAnalyzeRequest) -> List[ResumeData]:
+    """The batch of a ranking request: inline resumes followed by the stored candidates it refers to."""
+    if not request.candidate_ids:
+        return request.resumes
+    return request.resumes + await _load_candidates(request.candidate_ids)
+
 @app.post("/batch-analyze", response_model=List[JobMatch])
-async def batch_analyze_resumes(request: BatchAnalyzeRequest):
+async def batch_analyze_resumes(request: BatchAnalyzeRequest, response: Response):
+    async with endpoint_limiters["batch-analyze"].slot():
+        return await _batch_analyze_resumes(request, response)
+
+async def _batch_analyze_resumes(request: BatchAnalyzeRequest, response: Response) -> List[JobMatch]:
+    resumes = await _resolve_resumes(request)
     try:
-        results = []
-        for resume in request.resumes:
-            match_result = ranker.rank_resume(resume, request.job_requirement)
-            results.append(match_result)
+        # Rank resumes in parallel worker processes
+        results = await batch_ranker.rank_indexed_async(resumes, request.job_requirement)
+        
+        # Keep the score components (in request order) so the batch can be re-weighted with /rerank
+        session = rank_sessions.create_from_matches(request.job_requirement, results, resumes=resumes)
+        response.headers["X-Ranking-Session"] = session.id
         
-        # Sort results by match score in descending order
-        results.sort(key=lambda x: x.match_score, reverse=True)
-        return results
+        # Sort by match score in descending order
+        return sorted(results, key=lambda x: x.match_score, reverse=True)
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
         logging.error(f"Error in batch_analyze_resumes: {error_details}")
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n\nTraceback:\n{error_details}")
+
+@app.post("/batch-analyze/stream")
+async def batch_analyze_resumes_stream(request: BatchAnalyzeRequest):
+    resumes = await _resolve_resumes(request)
+    # Take the slot before streaming starts so a saturated server can still answer 429
+    slot = AsyncExitStack()
+    await slot.enter_async_context(endpoint_limiters["batch-analyze"].slot())
+    # Headers go out before the results, so the session id is chosen up front (usable once the summary arrives)
+    session_id = rank_sessions.new_session_id()
+    return StreamingResponse(
+        _stream_batch_analysis(resumes, request.job_requirement, slot, session_id),
+        media_type="application/x-ndjson",
+        headers={"X-Ranking-Session": session_id},
+        # Release the slot even if the client disconnects before (or while) the body streams
+        background=BackgroundTask(slot.aclose)
+    )
+
+async def _stream_batch_analysis(resumes: List[ResumeData], job_requirement: JobRequirement,
+                                 slot: AsyncExitStack, session_id: str):
+    """Emit one NDJSON line per JobMatch as it is ranked, then the final ranked order."""
+    async with slot:
+        results: List[Optional[JobMatch]] = [None] * len(resumes)
+        try:
+            async for index, match_result in batch_ranker.iter_ranked_async(resumes, job_requirement):
+                results[index] = match_result
+                with timed("serialize.job_match"):
+                    payload = match_result.json()
+                yield f'{{"type": "result", "index": {index}, "result": {payload}}}\n'
+
+            # Final summary: batch indices sorted by match score in descending order
+            rank_sessions.create_from_matches(job_requirement, results, session_id, resumes)
+            ranking = sorted(range(len(results)), key=lambda index: results[index].match_score, reverse=True)
+            yield json.dumps({
+                "type": "summary", "ranking": ranking, "count": len(ranking), "session_id": session_id
+            }) + "\n"
+        except Exception as e:
+            import traceback
+            error_details = traceback.format_exc()
+            logging.error(f"Error in batch_analyze_resumes_stream: {error_details}")
+            yield json.dumps({"type": "error", "detail": f"Error: {str(e)}"}) + "\n"
+
+@app.post("/batch-analyze/top-k", response_model=TopKResult)
+async def batch_analyze_top_k(request: TopKAnalyzeRequest, response: Response):
+    if request.k < 1:
+        raise HTTPException(status_code=400, detail="k must be at least 1")
+    async with endpoint_limiters["batch-analyze"].slot():
+        return await _batch_analyze_top_k(request, response)
+
+async def _batch_analyze_top_k(request: TopKAnalyzeRequest, response: Response) -> TopKResult:
+    resumes = await _resolve_resumes(request)
+    try:
+        scored = await batch_ranker.score_batch_async(resumes, request.job_requirement)
+        session = rank_sessions.create(
+            request.job_requirement,
+            [components if components.get("valid", 1.0) else None for _, _, components in scored],
+            resumes=resumes
+        )
+        response.headers["X-Ranking-Session"] = session.id
+        
+        # Score all resumes, but only build full details (forecast, career paths, cultural fit) for the best k
+        return await batch_ranker.rank_top_k_async(resumes, request.job_requirement, request.k, scored=scored)
+    except Exception as e:
+        import traceback
+        error_details = traceback.format_exc()
+        logging.error(f"Error in batch_analyze_top_k: {error_details}")
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n\nTraceback:\n{error_details}")
+
+@app.post("/batch-analyze/expand", response_model=List[CandidateScore])
+async def batch_analyze_expand(request: ExpandDetailsRequest):
+    resumes = await _resolve_resumes(request)
+    invalid = [index for index in request.indices if not 0 <= index < len(resumes)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid resume indices: {invalid}")
+    async with endpoint_limiters["analyze-resume"].slot():
+        try:
+            return await batch_ranker.expand_async(resumes, request.job_requirement, request.indices)
+        except Exception as e:
+            import traceback
+            error_details = traceback.format_exc()
+            logging.error(f"Error in batch_analyze_expand: {error_details}")
+            raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n\nTraceback:\n{error_details}")
+
+@app.post("/rank-pool", response_model=PoolRankResult)
+async def rank_pool(request: RankPoolRequest, response: Response):
+    if not candidate_store:
+        raise HTTPException(status_code=404, detail="The candidate store is disabled")
+    if request.min_required_skills < 0:
+        raise HTTPException(status_code=400, detail="min_required_skills cannot be negative")
+    async with endpoint_limiters["batch-analyze"].slot():
+        return await _rank_pool(request, response)
+
+async def _rank_pool(request: RankPoolRequest, response: Response) -> PoolRankResult:
+    try:
+        # Retrieve candidates covering enough required skills from the index, then rank only those
+        candidate_ids = skill_index.retrieve_for_job(request.job_requirement, request.min_required_skills)
+        if request.min_semantic_similarity is not None:
+            # Plus candidates whose resume text is close to the job without listing the exact skills
+            retrieved = set(candidate_ids)
+            similar = await io_pool.run(
+                semantic_index.search, request.job_requirement, len(semantic_index), request.min_semantic_similarity
+            )
+            candidate_ids += [candidate_id for candidate_id, _ in similar if candidate_id not in retrieved]
+        return await _rank_stored(candidate_ids, request.job_requirement, response, request.limit)
+    except Exception as e:
+        import traceback
+        error_details = traceback.format_exc()
+        logging.error(f"Error in rank_pool: {error_details}")
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n\nTraceback:\n{error_details}")
+
+async def _rank_stored(candidate_ids: List[str], job_requirement: JobRequirement, response: Response,
+                       limit: Optional[int] = None, extra_components: Optional[Dict[str, float]] = None) -> PoolRankResult:
+    """Rank retrieved stored candidates precisely with rank_resume, best first."""
+    stored = [candidate for candidate in await io_pool.run(candidate_store.get_many, candidate_ids) if candidate]
+    resumes = [candidate.resume_data for candidate in stored]
+    results = await batch_ranker.rank_indexed_async(resumes, job_requirement) if resumes else []
+    
+    session = rank_sessions.create_from_matches(job_requirement, results, resumes=resumes)
+    response.headers["X-Ranking-Session"] = session.id
+    
+    # Semantic similarity of every ranked candidate, in one sparse product
+    similarities = await io_pool.run(
+        semantic_index.similarities, job_requirement, [candidate.candidate_id for candidate in stored]
+    )
+    ranked = sorted(
+        (
+            CandidateScore(
+                index=index,
+                match_score=match.match_score,
+                components={
+                    **match.match_details.get("components", {}),
+                    "semantic": float(similarities[index]),
+                    **({"ann": extra_components[stored[index].candidate_id]} if extra_components else {})
+                },
+                details=match
+            )
+            for index, match in enumerate(results)
+        ),
+        key=lambda candidate: candidate.match_score,
+        reverse=True
+    )
+    return PoolRankResult(
+        pool_size=await io_pool.run(candidate_store.count),
+        retrieved=len(stored),
+        candidate_ids=[candidate.candidate_id for candidate in stored],
+        ranked=ranked[:limit] if limit is not None else ranked
+    )
+
+@app.post("/search", response_model=PoolRankResult)
+async def search_candidates(request: SearchRequest, response: Response):
+    """Nearest stored candidates to a job from the ANN index, re-scored precisely by the ranker."""
+    if not candidate_store:
+        raise HTTPException(status_code=404, detail="The candidate store is disabled")
+    if request.limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+    async with endpoint_limiters["batch-analyze"].slot():
+        try:
+            neighbours = await io_pool.run(ann_index.search, request.job_requirement, request.limit, request.nprobe)
+            return await _rank_stored(
+                [candidate_id for candidate_id, _ in neighbours], request.job_requirement, response,
+                extra_components=dict(neighbours)
+            )
+        except Exception as e:
+            import traceback
+            error_details = traceback.format_exc()
+            logging.error(f"Error in search_candidates: {error_details}")
+            raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n\nTraceback:\n{error_details}")
+
+def _current_snapshot() -> Optional[PoolSnapshot]:
+    """The pool snapshot on disk, reopened after a rebuild."""
+    global pool_snapshot
+    try:
+        pool_snapshot = load_snapshot(POOL_SNAPSHOT_DIR, pool_snapshot)
+    except Exception as e:
+        logging.error(f"Error opening pool snapshot {POOL_SNAPSHOT_DIR}: {str(e)}")
+        pool_snapshot = None
+    return pool_snapshot
+
+@app.post("/score-pool", response_model=PoolScoreResult)
+async def score_pool(request: ScorePoolRequest):
+    """Score every candidate of the pool snapshot in the worker processes and return the k best."""
+    if request.k < 1:
+        raise HTTPException(status_code=400, detail="k must be at least 1")
+    snapshot = _current_snapshot()
+    if snapshot is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No pool snapshot, build one with `python -m services.pool_snapshot build`"
+        )
+    async with endpoint_limiters["batch-analyze"].slot():
+        try:
+            # The snapshot is only rebuilt on demand: leave out candidates deleted from the store since
+            deleted = set()
+            if candidate_store:
+                live = set(await io_pool.run(candidate_store.ids))
+                deleted = {row for row, candidate_id in enumerate(snapshot.candidate_ids) if candidate_id not in live}
+            top = await batch_ranker.score_snapshot_async(snapshot, request.job_requirement, request.k, deleted)
+            return PoolScoreResult(
+                total=len(snapshot),
+                deleted=len(deleted),
+                k=request.k,
+                snapshot_created_at=snapshot.created_at,
+                top_candidates=[
+                    PoolCandidateScore(candidate_id=snapshot.candidate_ids[row], match_score=score, components=components)
+                    for row, score, components in top
+                ]
+            )
+        except Exception as e:
+            import traceback
+            error_details = traceback.format_exc()
+            logging.error(f"Error in score_pool: {error_details}")
+            raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n\nTraceback:\n{error_details}")
+
+@app.post("/semantic-search", response_model=List[SemanticMatch])
+async def semantic_search(request: SemanticSearchRequest):
+    """Stored candidates whose resume text is most similar to the job (TF-IDF cosine similarity)."""
+    if not candidate_store:
+        raise HTTPException(status_code=404, detail="The candidate store is disabled")
+    if request.limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+    matches = await io_pool.run(semantic_index.search, request.job_requirement, request.limit, request.min_similarity)
+    return [SemanticMatch(candidate_id=candidate_id, similarity=similarity) for candidate_id, similarity in matches]
+
+@app.post("/rerank", response_model=RerankResult)
+async def rerank(request: RerankRequest, x_ranking_session: str = Header(...)):
+    """Re-order a ranked batch under new weights, from the score components cached for its session."""
+    session = rank_sessions.get(x_ranking_session)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired ranking session, analyze the resumes again")
+    ranking, scores = session.rerank(request.weights.dict())
+    return RerankResult(session_id=session.id, ranking=ranking, scores=scores)
+
+@app.post("/rerank/job-requirement", response_model=JobRerankResult)
+async def rerank_job_requirement(request: JobUpdateRequest, x_ranking_session: str = Header(...)):
+    """Re-score a ranked batch for an edited job requirement, recomputing only the components the edit affects."""
+    session = rank_sessions.get(x_ranking_session)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired ranking session, analyze the resumes again")
+    if session.resumes is None:
+        raise HTTPException(status_code=409, detail="This ranking session cannot be re-scored, analyze the resumes again")
+    try:
+        changed = await io_pool.run(session.changed_components, request.job_requirement, session_ranker)
+        rows = None
+        if changed & CULTURAL_COMPONENTS:
+            # Cultural fit needs the NLP pipeline, which only the worker processes load
+            async with endpoint_limiters["batch-analyze"].slot():
+                scored = await batch_ranker.score_batch_async(session.resumes, request.job_requirement)
+            rows = [components if components.get("valid", 1.0) else None for _, _, components in scored]
+        updated, ranking, scores = await io_pool.run(
+            session.update_job, request.job_requirement, session_ranker, rows
+        )
+        return JobRerankResult(
+            session_id=session.id,
+            ranking=ranking,
+            scores=scores,
+            updated_components=[name for name in SCORE_COMPONENTS if name in updated]
+        )
+    except Exception as e:
+        import traceback
+        error_details = traceback.format_exc()
+        logging.error(f"Error in rerank_job_requirement: {error_details}")
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n\nTraceback:\n{error_details}")
+
+@app.get("/candidates", response_model=List[CandidateSummary])
+async def list_candidates(limit: int = 100, offset: int = 0):
+    """Stored candidates, oldest first."""
+    if not candidate_store:
+        raise HTTPException(status_code=404, detail="The candidate store is disabled")
+    return await io_pool.run(candidate_store.list, min(max(limit, 1), 1000), max(offset, 0))
+
+@app.get("/candidates/{candidate_id}", response_model=StoredCandidate)
+async def get_candidate(candidate_id: str):
+    candidate = await io_pool.run(candidate_store.get, candidate_id) if candidate_store else None
+    if candidate is None:
+        raise HTTPException(status_code=404, detail=f"Unknown candidate id: {candidate_id}")
+    return candidate
+
+@app.delete("/candidates/{candidate_id}")
+async def delete_candidate(candidate_id: str):
+    deleted = await io_pool.run(candidate_store.delete, candidate_id) if candidate_store else False
+    if not deleted:
+        raise HTTPException(status_code=404, detail=f"Unknown candidate id: {candidate_id}")
+    skill_index.remove(candidate_id)
+    await io_pool.run(semantic_index.remove, candidate_id)
+    await io_pool.run(ann_index.remove, candidate_id)
+    return {"deleted": candidate_id}
@@ -13,6 +13,15 @@ class JobRequirement(BaseModel):
     required_certifications: Optional[List[str]] = None  # New field for required certifications
     company_values: Optional[List[str]] = None  # New field for company values/culture
 
+class ScoreWeights(BaseModel):
+    # Weight of each score component in the overall match score
+    skill: float = 0.35
+    experience: float = 0.15     # Years of experience
+    relevance: float = 0.10      # Relevance of that experience
+    education: float = 0.15
+    certification: float = 0.10
+    cultural: float = 0.15
+
 class SkillFitment(BaseModel):
     skill_name: str
     proficiency_level: float  # 0-1 score based on experience and usage
@@ -88,4 +97,46 @@ class JobMatch(BaseModel):
     employment_gaps: Optional[List[Dict[str, Any]]] = None  # Information about gaps in employment 
     
     # New Career Trajectory Forecasting field
-    career_forecast: Optional[CareerForecast] = None  # ML-based career trajectory prediction 
\ No newline at end of file
+    career_forecast: Optional[CareerForecast] = None  # ML-based career trajectory prediction 
+
+class CandidateScore(BaseModel):
+    index: int                # Position of the resume in the request
+    match_score: float
+    components: Dict[str, float]  # Cheap score components (skill, experience, cultural fit, ...)
+    details: Optional[JobMatch] = None  # Full analysis, only computed for the top K or on demand
+
+class TopKResult(BaseModel):
+    total: int                # Number of resumes scored
+    k: int
+    top_candidates: List[CandidateScore]  # Best first, with details
+    scores: List[float]       # match_score of every resume, in request order
+
+class PoolRankResult(BaseModel):
+    pool_size: int            # Candidates in the store
+    retrieved: int            # Candidates retrieved by the skill index and ranked
+    candidate_ids: List[str]  # Retrieved candidates; CandidateScore.index and ranking sessions refer to this order
+    ranked: List[CandidateScore]  # Best first, with details
+
+class PoolCandidateScore(BaseModel):
+    candidate_id: str
+    match_score: float
+    components: Dict[str, float]  # Cheap score components (skill, experience, cultural fit, ...)
+
+class PoolScoreResult(BaseModel):
+    total: int                # Candidates in the snapshot
+    deleted: int = 0          # Of those, deleted from the candidate store since it was built (never returned)
+    k: int
+    snapshot_created_at: float  # Uploads after this time are not scored until the snapshot is rebuilt
+    top_candidates: List[PoolCandidateScore]  # Best first
+
+class SemanticMatch(BaseModel):
+    candidate_id: str
+    similarity: float         # TF-IDF cosine similarity between the job and the resume text
+
+class RerankResult(BaseModel):
+    session_id: str
+    ranking: List[int]        # Resume indices (request order), best first
+    scores: List[float]       # New match_score of every resume, in request order
+
+class JobRerankResult(RerankResult):
+    updated_components: List[str]   # Score components the job edit changed (the others were reused)
@@ -1,12 +1,47 @@
 from pydantic import BaseModel
 from models.response_model import ResumeData
-from models.job_model import JobRequirement
-from typing import List
+from models.job_model import JobRequirement, ScoreWeights
+from typing import List, Optional
 
 class AnalyzeResumeRequest(BaseModel):
-    resume_data: ResumeData
+    resume_data: Optional[ResumeData] = None
+    candidate_id: Optional[str] = None  # Stored candidate to analyze instead of resume_data
     job_requirement: JobRequirement
 
 class BatchAnalyzeRequest(BaseModel):
-    resumes: List[ResumeData]
-    job_requirement: JobRequirement 
\ No newline at end of file
+    # Batch order is the inline resumes followed by the stored candidates
+    resumes: List[ResumeData] = []
+    candidate_ids: List[str] = []
+    job_requirement: JobRequirement 
+
+class TopKAnalyzeRequest(BatchAnalyzeRequest):
+    k: int = 10
+
+class ExpandDetailsRequest(BatchAnalyzeRequest):
+    indices: List[int]  # Resumes to compute the full analysis for
+
+class RankPoolRequest(BaseModel):
+    job_requirement: JobRequirement
+    min_required_skills: int = 1  # Only candidates with at least this many required skills are ranked
+    min_semantic_similarity: Optional[float] = None  # Also rank candidates whose text is at least this similar
+    limit: Optional[int] = None   # Number of ranked candidates returned (all by default)
+
+class ScorePoolRequest(BaseModel):
+    job_requirement: JobRequirement
+    k: int = 10
+
+class SemanticSearchRequest(BaseModel):
+    job_requirement: JobRequirement
+    limit: int = 20
+    min_similarity: float = 0.0
+
+class SearchRequest(BaseModel):
+    job_requirement: JobRequirement
+    limit: int = 20                # Nearest candidates retrieved and re-scored
+    nprobe: Optional[int] = None   # Inverted lists scanned (server default when not set)
+
+class RerankRequest(BaseModel):
+    weights: ScoreWeights
+
+class JobUpdateRequest(BaseModel):
+    job_requirement: JobRequirement   # Edited job of the ranking session
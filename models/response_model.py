@@ -28,6 +28,12 @@ class Experience(BaseModel):
     description: List[str] = []
     skills_used: List[str]
 
+class TextExtraction(BaseModel):
+    truncated: bool = False
+    limit: Optional[str] = None  # Budget that cut the text short: pages, chars or time
+    page_count: Optional[int] = None
+    pages_extracted: Optional[int] = None
+
 class ResumeData(BaseModel):
     name: str
     email: str
@@ -42,4 +48,14 @@ class ResumeData(BaseModel):
     languages: Optional[List[str]] = None
     github: Optional[str] = None
     linkedin: Optional[str] = None
-    portfolio: Optional[str] = None
\ No newline at end of file
+    portfolio: Optional[str] = None
+    candidate_id: Optional[str] = None  # Set once the resume is in the candidate store
+    extraction: Optional[TextExtraction] = None  # Set for uploaded PDFs
+
+class UploadResult(BaseModel):
+    filename: str
+    success: bool
+    data: Optional[ResumeData] = None
+    error: Optional[str] = None
+    truncated: bool = False  # Only part of the file's text was parsed (see data.extraction)
+    limit: Optional[str] = None
@@ -0,0 +1,237 @@
+import asyncio
+import heapq
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from models.response_model import ResumeData
+from models.job_model import JobRequirement, JobMatch, CandidateScore, TopKResult
+from parser.resume_ranker import ResumeRanker
+from parser.nlp_registry import get_nlp
+from parser.vector_scoring import BatchScorer
+from services.executor import TrackedExecutor, env_int
+from services.metrics import REGISTRY, timed
+from services.pool_snapshot import PoolSnapshot, load_snapshot
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Ranker instance owned by each worker process (created by _init_worker)
+_worker_ranker = None
+
+# Pool snapshot mapped by each worker process, reopened when it is rebuilt
+_worker_snapshot: Optional[PoolSnapshot] = None
+
+# Resumes sent to a worker per task: larger chunks batch more spaCy work per nlp.pipe call,
+# smaller chunks stream results back sooner
+RANK_CHUNK_SIZE = env_int("RANK_CHUNK_SIZE", 8)
+
+
+def _init_worker():
+    """Load a ResumeRanker (and its spaCy model) once per worker process."""
+    global _worker_ranker
+    _worker_ranker = ResumeRanker()
+    # Load the shared pipeline now rather than on the worker's first task, and publish its load stats
+    get_nlp()
+    REGISTRY.flush()
+    logger.info(f"Batch ranking worker {os.getpid()} ready")
+
+
+def _rank_chunk_in_worker(indices: List[int], resumes: List[ResumeData],
+                          job_requirement: JobRequirement) -> List[Tuple[int, JobMatch]]:
+    """Rank a chunk of resumes inside a worker process, keeping their positions in the batch."""
+    return list(zip(indices, _worker_ranker.rank_resumes(resumes, job_requirement)))
+
+
+def _score_chunk_in_worker(indices: List[int], resumes: List[ResumeData],
+                           job_requirement: JobRequirement) -> List[Tuple[int, float, Dict[str, float]]]:
+    """Compute only the cheap match_score components of a chunk inside a worker process."""
+    components = _worker_ranker.score_components(resumes, job_requirement)
+    return [
+        (index, float(components["match_score"][i]),
+         {name: float(values[i]) for name, values in components.items() if name != "match_score"})
+        for i, index in enumerate(indices)
+    ]
+
+
+def _score_snapshot_in_worker(directory: str, created_at: float, start: int, stop: int,
+                              job_requirement: JobRequirement, k: int,
+                              exclude: Sequence[int] = ()) -> List[Tuple[int, float, Dict[str, float]]]:
+    """Score rows [start, stop) of the memory-mapped pool snapshot and keep the chunk's k best outside exclude."""
+    global _worker_snapshot
+    _worker_snapshot = load_snapshot(directory, _worker_snapshot)
+    if _worker_snapshot is None or _worker_snapshot.created_at != created_at:
+        raise RuntimeError("The pool snapshot was rebuilt while scoring, retry the request")
+
+    scorer = BatchScorer(_worker_ranker)
+    _worker_snapshot.check_compatible(scorer)
+    with timed("score.snapshot_chunk"):
+        components = scorer.score(_worker_snapshot.batch(start, stop), _worker_ranker.job_profile(job_requirement))
+    scores = components["match_score"]
+    skip = {row - start for row in exclude}
+    top = heapq.nlargest(k, (i for i in range(stop - start) if i not in skip), key=scores.__getitem__)
+    return [
+        (start + i, float(scores[i]),
+         {name: float(values[i]) for name, values in components.items() if name != "match_score"})
+        for i in top
+    ]
+
+
+def default_worker_count() -> int:
+    """Number of ranking workers, configurable through the RANKER_WORKERS env variable."""
+    configured = os.getenv("RANKER_WORKERS")
+    if configured:
+        try:
+            return max(1, int(configured))
+        except ValueError:
+            logger.warning(f"Invalid RANKER_WORKERS value '{configured}', using CPU count")
+    return max(1, os.cpu_count() or 1)
+
+
+class BatchRanker:
+    """Ranks batches of resumes across a pool of worker processes."""
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: int = RANK_CHUNK_SIZE):
+        self.max_workers = max_workers or default_worker_count()
+        self.chunk_size = chunk_size
+        # The pool starts lazily so importing main.py stays cheap
+        self.pool = TrackedExecutor(
+            "cpu",
+            lambda: ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+        )
+
+    def _chunks(self, resumes: List[ResumeData]) -> List[Tuple[List[int], List[ResumeData]]]:
+        """Split a batch into chunks, small enough to keep every worker busy."""
+        if not resumes:
+            return []
+        size = max(1, min(self.chunk_size, math.ceil(len(resumes) / self.max_workers)))
+        return [
+            (list(range(start, min(start + size, len(resumes)))), resumes[start:start + size])
+            for start in range(0, len(resumes), size)
+        ]
+
+    def iter_ranked(self, resumes: List[ResumeData], job_requirement: JobRequirement) -> Iterator[Tuple[int, JobMatch]]:
+        """Yield (batch index, JobMatch) pairs as soon as each worker finishes a chunk."""
+        futures = [
+            self.pool.submit(_rank_chunk_in_worker, indices, chunk, job_requirement)
+            for indices, chunk in self._chunks(resumes)
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+
+    def rank_batch(self, resumes: List[ResumeData], job_requirement: JobRequirement) -> List[JobMatch]:
+        """Rank all resumes and return them sorted by match score (best first)."""
+        results = [match for _, match in self.iter_ranked(resumes, job_requirement)]
+        results.sort(key=lambda x: x.match_score, reverse=True)
+        return results
+
+    async def rank_async(self, resume_data: ResumeData, job_requirement: JobRequirement) -> JobMatch:
+        """Rank a single resume on the worker pool."""
+        [(_, match)] = await self.pool.run(_rank_chunk_in_worker, [0], [resume_data], job_requirement)
+        return match
+
+    async def iter_ranked_async(self, resumes: List[ResumeData], job_requirement: JobRequirement) -> AsyncIterator[Tuple[int, JobMatch]]:
+        """Async version of iter_ranked for streaming endpoints."""
+        futures = [
+            asyncio.ensure_future(self.pool.run(_rank_chunk_in_worker, indices, chunk, job_requirement))
+            for indices, chunk in self._chunks(resumes)
+        ]
+        try:
+            for next_done in asyncio.as_completed(futures):
+                for ranked in await next_done:
+                    yield ranked
+        finally:
+            # Drop work that has not started yet if the consumer goes away early
+            for future in futures:
+                future.cancel()
+
+    async def rank_indexed_async(self, resumes: List[ResumeData], job_requirement: JobRequirement) -> List[JobMatch]:
+        """Rank a batch without blocking the event loop; results are in batch order."""
+        chunk_results = await asyncio.gather(*[
+            self.pool.run(_rank_chunk_in_worker, indices, chunk, job_requirement)
+            for indices, chunk in self._chunks(resumes)
+        ])
+        return [match for chunk in chunk_results for _, match in chunk]
+
+    async def rank_batch_async(self, resumes: List[ResumeData], job_requirement: JobRequirement) -> List[JobMatch]:
+        """Rank a batch without blocking the event loop while workers are busy."""
+        results = await self.rank_indexed_async(resumes, job_requirement)
+        results.sort(key=lambda x: x.match_score, reverse=True)
+        return results
+
+    async def _rank_indices_async(self, resumes: List[ResumeData], job_requirement: JobRequirement,
+                                  indices: List[int]) -> Dict[int, JobMatch]:
+        """Full JobMatch for the selected resumes only, keyed by batch index."""
+        selected = [resumes[index] for index in indices]
+        chunk_results = await asyncio.gather(*[
+            self.pool.run(_rank_chunk_in_worker, [indices[i] for i in chunk_indices], chunk, job_requirement)
+            for chunk_indices, chunk in self._chunks(selected)
+        ])
+        return {index: match for chunk in chunk_results for index, match in chunk}
+
+    async def score_batch_async(self, resumes: List[ResumeData],
+                                job_requirement: JobRequirement) -> List[Tuple[int, float, Dict[str, float]]]:
+        """(index, match_score, components) for every resume, in batch order, without JobMatch details."""
+        chunk_results = await asyncio.gather(*[
+            self.pool.run(_score_chunk_in_worker, indices, chunk, job_requirement)
+            for indices, chunk in self._chunks(resumes)
+        ])
+        return [scored for chunk in chunk_results for scored in chunk]
+
+    async def rank_top_k_async(self, resumes: List[ResumeData], job_requirement: JobRequirement, k: int,
+                               scored: Optional[List[Tuple[int, float, Dict[str, float]]]] = None) -> TopKResult:
+        """Score every resume cheaply (unless already scored), then compute full details for the K best only."""
+        if scored is None:
+            scored = await self.score_batch_async(resumes, job_requirement)
+        top = heapq.nlargest(max(0, k), scored, key=lambda x: x[1])
+        details = await self._rank_indices_async(resumes, job_requirement, [index for index, _, _ in top])
+        return TopKResult(
+            total=len(resumes),
+            k=k,
+            top_candidates=[
+                CandidateScore(index=index, match_score=score, components=components, details=details.get(index))
+                for index, score, components in top
+            ],
+            scores=[score for _, score, _ in scored]
+        )
+
+    async def expand_async(self, resumes: List[ResumeData], job_requirement: JobRequirement,
+                           indices: List[int]) -> List[CandidateScore]:
+        """Full details for any resumes of a batch, e.g. candidates outside the top K."""
+        indices = list(dict.fromkeys(indices))
+        scored, details = await asyncio.gather(
+            self.score_batch_async([resumes[index] for index in indices], job_requirement),
+            self._rank_indices_async(resumes, job_requirement, indices)
+        )
+        return [
+            CandidateScore(index=index, match_score=score, components=components, details=details[index])
+            for index, (_, score, components) in zip(indices, scored)
+        ]
+
+    async def score_snapshot_async(self, snapshot: PoolSnapshot, job_requirement: JobRequirement, k: int,
+                                   exclude: Optional[Set[int]] = None) -> List[Tuple[int, float, Dict[str, float]]]:
+        """(snapshot row, match_score, components) of the k best candidates of a pool snapshot.
+
+        Workers map the snapshot files themselves, so only row ranges and the
+        per-range top k cross the process boundary. Rows in exclude (e.g.
+        candidates deleted since the snapshot was built) are scored but never
+        returned.
+        """
+        n = len(snapshot)
+        if n == 0 or k <= 0:
+            return []
+        # Several ranges per worker so a slow range does not hold up the others
+        size = max(1, math.ceil(n / (self.max_workers * 4)))
+        chunk_results = await asyncio.gather(*[
+            self.pool.run(_score_snapshot_in_worker, snapshot.directory, snapshot.created_at,
+                          start, min(start + size, n), job_requirement, k,
+                          [row for row in exclude or () if start <= row < start + size])
+            for start in range(0, n, size)
+        ])
+        return heapq.nlargest(k, (scored for chunk in chunk_results for scored in chunk), key=lambda x: x[1])
+
+    def shutdown(self):
+        """Stop the worker pool."""
+        self.pool.shutdown()
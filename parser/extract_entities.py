@@ -1,25 +1,91 @@
-import spacy
 import re
 from datetime import datetime
 from models.response_model import ResumeData, Education, Experience, SkillWithSeniority, SeniorityLevel
-from typing import List, Dict, Any, Tuple
+from parser.nlp_document import ResumeDocument, NER_COMPONENTS
+from parser.nlp_registry import get_nlp, DEFAULT_BATCH_SIZE, DEFAULT_N_PROCESS
+from parser.keyword_matcher import KeywordMatcher, load_taxonomy
+from services.metrics import record_error, record_fallback, timed
+from typing import List, Dict, Any, Tuple, Optional
 import logging
 from collections import defaultdict
+import os
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump whenever extraction logic changes so cached parse results are invalidated
+PARSER_VERSION = "3"
+
+# Technical skills to look for: canonical name -> aliases
+SKILL_TAXONOMY = {
+    "python": [], "java": [], "javascript": ["js", "ecmascript"], "html": ["html5"], "css": ["css3"],
+    "sql": [], "react": ["react.js", "reactjs"], "angular": ["angularjs", "angular.js"],
+    "vue": ["vue.js", "vuejs"], "node.js": ["nodejs", "node js"], "django": [], "flask": [],
+    "spring": ["spring boot"], "docker": [], "kubernetes": ["k8s"],
+    "aws": ["amazon web services"], "azure": ["microsoft azure"], "gcp": ["google cloud platform", "google cloud"],
+    "machine learning": ["ml"], "data science": [], "ai": ["artificial intelligence"],
+    "devops": [], "ci/cd": ["cicd", "ci cd", "continuous integration"], "git": [], "agile": [], "scrum": [],
+    "rest api": ["rest apis", "restful api", "restful apis"], "graphql": []
+}
+
+# Larger taxonomies can be supplied as JSON ({"skill": ["alias", ...]}) via SKILL_TAXONOMY_PATH
+if os.getenv("SKILL_TAXONOMY_PATH"):
+    try:
+        SKILL_TAXONOMY.update(load_taxonomy(os.environ["SKILL_TAXONOMY_PATH"]))
+    except Exception as e:
+        logger.error(f"Could not load skill taxonomy from {os.environ['SKILL_TAXONOMY_PATH']}: {e}")
+
+SKILL_MATCHER = KeywordMatcher(SKILL_TAXONOMY)
+
+# Context phrases used to estimate skill seniority
+SKILL_INDEPENDENT_LEADERSHIP_TERMS = ["architect", "mentored", "trained", "supervised"]
+LEADERSHIP_VERBS = ["led", "leading", "designed"]
+IMPLEMENTATION_VERBS = ["implemented", "developed", "built", "created", "optimized", "improved"]
+ADVANCED_TERMS = ["advanced", "expert", "proficient", "specialized", "optimized", "complex", "architecture"]
+
+CONTEXT_MATCHER = KeywordMatcher(SKILL_INDEPENDENT_LEADERSHIP_TERMS + ADVANCED_TERMS)
+
+def _build_phrase_matcher(verbs: List[str]) -> KeywordMatcher:
+    """Matcher for "<verb> <skill>" phrases over every skill alias, keyed by "<verb> <canonical skill>"."""
+    phrases = {}
+    for skill, aliases in SKILL_TAXONOMY.items():
+        for verb in verbs:
+            phrases[f"{verb} {skill}"] = [f"{verb} {alias}" for alias in aliases]
+    return KeywordMatcher(phrases)
+
+LEADERSHIP_MATCHER = _build_phrase_matcher(LEADERSHIP_VERBS)
+IMPLEMENTATION_MATCHER = _build_phrase_matcher(IMPLEMENTATION_VERBS)
+
+def _default_experience(reason: str, skills_used: Optional[List[str]] = None) -> Experience:
+    """Placeholder experience entry used when none could be extracted (counted in resume_fallbacks_total)."""
+    record_fallback("default_position", reason)
+    return Experience(
+        title="Default Position",
+        company="Default Company",
+        start_date=datetime.now().date(),
+        end_date=datetime.now().date(),
+        description=["Default description"],
+        skills_used=skills_used or ["Default Skill"]
+    )
+
 class ResumeParser:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
+    @property
+    def nlp(self):
+        # Shared, lazily loaded pipeline (see parser/nlp_registry.py)
+        return get_nlp()
         
-    def _extract_name(self, text: str) -> str:
+    def _header_document(self, text: str) -> ResumeDocument:
+        """Run NER once over the first 1000 chars, where the name is expected."""
+        return ResumeDocument.from_text(self.nlp, text[:1000], NER_COMPONENTS)
+        
+    def _extract_name(self, text: str, document: Optional[ResumeDocument] = None) -> str:
         """Extract name from resume text."""
-        doc = self.nlp(text[:1000])  # Look at first 1000 chars for name
-        for ent in doc.ents:
-            if ent.label_ == "PERSON":
-                return ent.text
+        if document is None:
+            document = self._header_document(text)
+        name = document.first_entity("PERSON")
+        if name:
+            return name
         # Fallback: take first line if no name entity found
         return text.split('\n')[0].strip()
     
@@ -37,24 +103,22 @@ class ResumeParser:
     
     def _extract_skills(self, text: str) -> List[str]:
         """Extract skills from resume text."""
-        # Common technical skills to look for
-        common_skills = [
-            "python", "java", "javascript", "html", "css", "sql", "react", "angular", 
-            "vue", "node.js", "django", "flask", "spring", "docker", "kubernetes", 
-            "aws", "azure", "gcp", "machine learning", "data science", "ai", 
-            "devops", "ci/cd", "git", "agile", "scrum", "rest api", "graphql"
-        ]
-        
-        skills = []
-        text_lower = text.lower()
-        
-        for skill in common_skills:
-            if skill in text_lower:
-                skills.append(skill)
-        
-        return skills
+        # One pass over the text for the whole skill taxonomy
+        return SKILL_MATCHER.find_all(text)
+    
+    def _seniority_signals(self, text: str) -> Dict[str, Any]:
+        """Scan the text once for every seniority-related phrase, for all skills at once."""
+        context = CONTEXT_MATCHER.count(text)
+        return {
+            "skill_counts": SKILL_MATCHER.count(text),
+            "leadership": LEADERSHIP_MATCHER.count(text),
+            "implementation": IMPLEMENTATION_MATCHER.count(text),
+            "general_leadership": sum(1 for term in SKILL_INDEPENDENT_LEADERSHIP_TERMS if context[term]),
+            "advanced": sum(1 for term in ADVANCED_TERMS if context[term])
+        }
     
-    def _analyze_skill_seniority(self, skill: str, text: str, experience: List[Experience]) -> SeniorityLevel:
+    def _analyze_skill_seniority(self, skill: str, text: str, experience: List[Experience],
+                                 signals: Optional[Dict[str, Any]] = None) -> SeniorityLevel:
         """
         Analyze the seniority level of a skill based on context, frequency, and depth of detail.
         
@@ -63,12 +127,15 @@ class ResumeParser:
         2. Context of skill usage (leading, implementing, using)
         3. Years of experience using the skill
         4. Complexity of projects described
+        
+        `signals` are the phrase counts from _seniority_signals; pass them when
+        analyzing several skills of the same text so it is scanned only once.
         """
-        skill_lower = skill.lower()
-        text_lower = text.lower()
+        if signals is None:
+            signals = self._seniority_signals(text)
         
         # Count skill mentions
-        skill_count = text_lower.count(skill_lower)
+        skill_count = signals["skill_counts"][skill]
         
         # Check for years of experience with the skill
         years_with_skill = 0
@@ -82,31 +149,15 @@ class ResumeParser:
                     # Default: add 1 year if dates unavailable
                     years_with_skill += 1
         
-        # Check for leadership indicators
-        leadership_terms = [
-            f"led {skill_lower}", f"leading {skill_lower}", 
-            f"architect", f"designed {skill_lower}", 
-            f"mentored", f"trained", f"supervised"
-        ]
-        
-        leadership_score = sum(1 for term in leadership_terms if term in text_lower)
+        # Check for leadership indicators ("led <skill>", ... plus skill-independent terms)
+        leadership_score = sum(1 for verb in LEADERSHIP_VERBS if signals["leadership"][f"{verb} {skill}"])
+        leadership_score += signals["general_leadership"]
         
         # Check for implementation indicators
-        implementation_terms = [
-            f"implemented {skill_lower}", f"developed {skill_lower}",
-            f"built {skill_lower}", f"created {skill_lower}",
-            f"optimized {skill_lower}", f"improved {skill_lower}"
-        ]
-        
-        implementation_score = sum(1 for term in implementation_terms if term in text_lower)
+        implementation_score = sum(1 for verb in IMPLEMENTATION_VERBS if signals["implementation"][f"{verb} {skill}"])
         
         # Check for advanced usage indicators
-        advanced_terms = [
-            "advanced", "expert", "proficient", "specialized", 
-            "optimized", "complex", "architecture"
-        ]
-        
-        advanced_score = sum(1 for term in advanced_terms if term in text_lower)
+        advanced_score = signals["advanced"]
         
         # Combine factors to determine seniority
         total_score = skill_count * 0.1 + leadership_score * 2 + implementation_score + advanced_score * 1.5
@@ -133,9 +184,10 @@ class ResumeParser:
         """Extract skills with seniority levels."""
         skills = self._extract_skills(text)
         skills_with_seniority = []
+        signals = self._seniority_signals(text)
         
         for skill in skills:
-            seniority = self._analyze_skill_seniority(skill, text, experience)
+            seniority = self._analyze_skill_seniority(skill, text, experience, signals)
             skills_with_seniority.append(SkillWithSeniority(
                 name=skill,
                 seniority=seniority
@@ -187,15 +239,7 @@ class ResumeParser:
             experience_section = re.search(r'(?i)experience(.*?)(?=\n\n|\Z)', text, re.DOTALL)
             if not experience_section:
                 # If no experience section found, add a default experience
-                default_exp = Experience(
-                    title="Default Position",
-                    company="Default Company",
-                    start_date=datetime.now().date(),
-                    end_date=datetime.now().date(),
-                    description=["Default description"],
-                    skills_used=["Default Skill"]
-                )
-                experience.append(default_exp)
+                experience.append(_default_experience("no_experience_section"))
                 return experience
                 
             experience_text = experience_section.group(1)
@@ -266,6 +310,8 @@ class ResumeParser:
                         skills_used = ["Default Skill"]
                     
                     # Create experience object
+                    if not position:
+                        record_fallback("default_position", "missing_title")
                     exp = Experience(
                         title=position or "Default Position",
                         company=company or "Default Company",
@@ -278,36 +324,22 @@ class ResumeParser:
                     experience.append(exp)
                 except Exception as e:
                     logger.error(f"Error extracting experience: {e}")
+                    record_error("parse.experience_entry")
                     # Add a default experience if extraction fails
-                    default_exp = Experience(
-                        title="Default Position",
-                        company="Default Company",
-                        start_date=datetime.now().date(),
-                        end_date=datetime.now().date(),
-                        description=["Default description"],
-                        skills_used=["Default Skill"]
-                    )
-                    experience.append(default_exp)
+                    experience.append(_default_experience("experience_entry_error"))
                     continue
         except Exception as e:
             logger.error(f"Error in experience extraction: {e}")
+            record_error("parse.experience")
             # Return a default experience if there's an error
-            default_exp = Experience(
-                title="Default Position",
-                company="Default Company",
-                start_date=datetime.now().date(),
-                end_date=datetime.now().date(),
-                description=["Default description"],
-                skills_used=["Default Skill"]
-            )
-            experience.append(default_exp)
+            experience.append(_default_experience("experience_error"))
             
         return experience
     
     def parse_resume(self, text: str) -> ResumeData:
         """Parse resume text into structured data."""
         try:
-            name = self._extract_name(text)
+            name = self._extract_name(text, self._header_document(text))
             email = self._extract_email(text)
             phone = self._extract_phone(text)
             
@@ -323,16 +355,7 @@ class ResumeParser:
             # Ensure we have at least one experience entry
             if not experience:
                 logger.warning("No experience found in resume, adding a default entry")
-                experience = [
-                    Experience(
-                        title="Default Position",
-                        company="Default Company",
-                        start_date=datetime.now().date(),
-                        end_date=datetime.now().date(),
-                        description=["Default description"],
-                        skills_used=skills[:5] if skills else ["Default Skill"]
-                    )
-                ]
+                experience = [_default_experience("empty_experience", skills[:5])]
             
             return ResumeData(
                 name=name,
@@ -345,6 +368,7 @@ class ResumeParser:
             )
         except Exception as e:
             logger.error(f"Error parsing resume: {e}")
+            record_error("parse.resume")
             # Return a basic ResumeData object with default values if parsing fails
             return ResumeData(
                 name="Unknown",
@@ -353,64 +377,67 @@ class ResumeParser:
                 skills=[],
                 skills_with_seniority=[],
                 education=[],
-                experience=[
-                    Experience(
-                        title="Default Position",
-                        company="Default Company",
-                        start_date=datetime.now().date(),
-                        end_date=datetime.now().date(),
-                        description=["Default description"],
-                        skills_used=["Default Skill"]
-                    )
-                ]
+                experience=[_default_experience("parse_error")]
             )
 
-# Create a global parser instance
+# Create a global parser instance (cheap: the spaCy model loads on first use)
 parser = ResumeParser()
 
-def extract_entities(text: str) -> ResumeData:
-    """Extract structured data from resume text."""
+def extract_entities(text: str, document: Optional[ResumeDocument] = None) -> ResumeData:
+    """Extract structured data from resume text.
+    
+    `document` is the NER pass over the resume header; it is computed here unless
+    the caller already produced it in a batch (see extract_entities_batch).
+    """
     try:
         # Log the input text for debugging
         logging.debug(f"Input text for entity extraction: {text[:500]}...")
         
         # Extract name
-        name = parser._extract_name(text)
+        if document is None:
+            with timed("parse.header_ner"):
+                document = parser._header_document(text)
+        with timed("parse.name"):
+            name = parser._extract_name(text, document)
         logging.debug(f"Extracted name: {name}")
         
-        # Extract email
-        email = parser._extract_email(text)
+        # Extract email and phone
+        with timed("parse.contact"):
+            email = parser._extract_email(text)
+            phone = parser._extract_phone(text)
         logging.debug(f"Extracted email: {email}")
-        
-        # Extract phone
-        phone = parser._extract_phone(text)
         logging.debug(f"Extracted phone: {phone}")
         
         # Extract experience first
-        experience = parser._extract_experience(text)
+        with timed("parse.experience"):
+            experience = parser._extract_experience(text)
         logging.debug(f"Extracted experience: {experience}")
         
         # Extract skills and analyze seniority levels
-        skills = parser._extract_skills(text)
+        with timed("parse.skills"):
+            skills = parser._extract_skills(text)
         logging.debug(f"Extracted skills: {skills}")
         
-        skills_with_seniority = parser._extract_skills_with_seniority(text, experience)
+        with timed("parse.seniority"):
+            skills_with_seniority = parser._extract_skills_with_seniority(text, experience)
         logging.debug(f"Skills with seniority: {skills_with_seniority}")
         
         # Extract education
-        education = parser._extract_education(text)
+        with timed("parse.education"):
+            education = parser._extract_education(text)
         logging.debug(f"Extracted education: {education}")
         
         # Create ResumeData object
-        resume_data = ResumeData(
-            name=name,
-            email=email,
-            phone=phone,
-            skills=skills,
-            skills_with_seniority=skills_with_seniority,
-            education=education,
-            experience=experience
-        )
+        with timed("parse.build_resume"):
+            resume_data = ResumeData(
+                name=name,
+                email=email,
+                phone=phone,
+                skills=skills,
+                skills_with_seniority=skills_with_seniority,
+                education=education,
+                experience=experience
+            )
         
         # Log the final ResumeData object for debugging
         logging.debug(f"Final ResumeData object: {resume_data}")
@@ -418,6 +445,7 @@ def extract_entities(text: str) -> ResumeData:
         return resume_data
     except Exception as e:
         logging.error(f"Error in entity extraction: {e}")
+        record_error("parse.entities")
         # Return a basic ResumeData object with default values if extraction fails
         return ResumeData(
             name="Unknown",
@@ -426,14 +454,23 @@ def extract_entities(text: str) -> ResumeData:
             skills=[],
             skills_with_seniority=[],
             education=[],
-            experience=[
-                Experience(
-                    title="Default Position",
-                    company="Default Company",
-                    start_date=datetime.now().date(),
-                    end_date=datetime.now().date(),
-                    description=["Default description"],
-                    skills_used=["Default Skill"]
-                )
-            ]
+            experience=[_default_experience("extraction_error")]
         )
+
+def extract_entities_batch(texts: List[str], batch_size: int = DEFAULT_BATCH_SIZE,
+                           n_process: int = DEFAULT_N_PROCESS) -> List[ResumeData]:
+    """Extract structured data from many resumes, running NER over all headers with nlp.pipe.
+    
+    Results are aligned with `texts`.
+    """
+    try:
+        with timed("parse.header_ner_batch"):
+            documents = ResumeDocument.pipe(
+                parser.nlp, [text[:1000] for text in texts], NER_COMPONENTS, batch_size, n_process
+            )
+    except Exception as e:
+        logging.error(f"Error in batched NER, falling back to per-resume extraction: {e}")
+        record_error("parse.header_ner_batch")
+        documents = [None] * len(texts)
+    
+    return [extract_entities(text, document) for text, document in zip(texts, documents)]
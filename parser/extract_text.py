@@ -1,108 +1,155 @@
-import PyPDF2
 from docx import Document
+from io import BytesIO
+from typing import BinaryIO, Optional, Union
 import os
 import logging
 
+# PDF extractor interface: backends registered in parser/pdf_backends.py, chosen by PDF_BACKEND
+from parser.pdf_backends import PDF_BACKENDS, PdfBackend, PdfDocument, available_pdf_backends, get_pdf_backend, register_pdf_backend
+from parser.pdf_extraction import PdfExtraction, PdfLimits, extract_pdf
+from services.metrics import record_error, timed
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Extracting from a PDF
-def extract_text_from_pdf(file_path):
-    """Extract text from a PDF file."""
+# In-memory file contents accepted by the *_bytes extractors
+FileContents = Union[bytes, bytearray, memoryview, BinaryIO]
+
+
+def _as_stream(data: FileContents) -> BinaryIO:
+    """Wrap raw file contents in a seekable stream without touching the filesystem."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return BytesIO(data)
+    data.seek(0)
+    return data
+
+
+def _contents_size(data: FileContents) -> int:
+    if isinstance(data, memoryview):
+        return data.nbytes
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    # Binary stream: measure by seeking to the end (_as_stream rewinds it)
+    return data.seek(0, os.SEEK_END)
+
+
+def _read_pdf(stream: BinaryIO, backend: Optional[str] = None) -> PdfExtraction:
+    """Extract text from an open PDF stream, within the PDF_MAX_PAGES / PDF_MAX_CHARS / PDF_TIMEOUT_SECONDS budgets."""
+    try:
+        extraction = extract_pdf(stream.read(), backend=backend)
+
+        if extraction.truncated:
+            logger.warning(
+                f"PDF extraction stopped by the {extraction.limit} limit after "
+                f"{extraction.pages_extracted} of {extraction.page_count} pages"
+            )
+
+        if not extraction.text.strip():
+            raise ValueError("No text could be extracted from the PDF - it might be a scanned document")
+
+        logger.info(f"Successfully extracted {len(extraction.text)} characters from PDF ({extraction.backend})")
+        return extraction
+    except Exception as pdf_error:
+        raise Exception(f"Error reading PDF: {str(pdf_error)}")
+
+
+def _read_docx(stream: BinaryIO) -> str:
+    """Extract text from an open DOCX stream."""
+    doc = Document(stream)
+    text = ""
+
+    # Extract text from paragraphs
+    for paragraph in doc.paragraphs:
+        if paragraph.text.strip():
+            text += paragraph.text + "\n"
+
+    # Extract text from tables
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                if cell.text.strip():
+                    text += cell.text + "\n"
+
+    # Extract text from headers and footers
+    for section in doc.sections:
+        for header in section.header.paragraphs:
+            if header.text.strip():
+                text += header.text + "\n"
+        for footer in section.footer.paragraphs:
+            if footer.text.strip():
+                text += footer.text + "\n"
+
+    # Clean up the text
+    text = text.strip()
+
+    if not text:
+        raise ValueError("No text could be extracted from the DOCX file")
+
+    logger.info(f"Successfully extracted {len(text)} characters from DOCX")
+    return text
+
+
+# Extracting from in-memory PDF contents
+def extract_text_from_pdf_bytes(data: FileContents, backend: Optional[str] = None) -> str:
+    """Extract text from PDF contents held in memory (bytes, memoryview or a binary stream).
+
+    backend names a PDF backend (see available_pdf_backends), default PDF_BACKEND.
+    """
+    return extract_pdf_bytes(data, backend).text
+
+
+def extract_pdf_bytes(data: FileContents, backend: Optional[str] = None) -> PdfExtraction:
+    """Like extract_text_from_pdf_bytes, but also report how much of the document the text covers."""
     try:
-        # Check if file exists
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"PDF file not found: {file_path}")
-            
-        # Check file size
-        file_size = os.path.getsize(file_path)
+        file_size = _contents_size(data)
         if file_size == 0:
             raise ValueError("PDF file is empty")
-            
-        logger.info(f"Processing PDF file: {file_path} (size: {file_size} bytes)")
-        
-        with open(file_path, 'rb') as file:
-            try:
-                reader = PyPDF2.PdfReader(file)
-                
-                # Check if PDF is encrypted
-                if reader.is_encrypted:
-                    raise ValueError("PDF is password-protected and cannot be processed")
-                
-                # Check if PDF has pages
-                if len(reader.pages) == 0:
-                    raise ValueError("PDF has no pages")
-                
-                text = ""
-                for i, page in enumerate(reader.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-                        else:
-                            logger.warning(f"Page {i+1} extracted no text - might be an image or scanned page")
-                    except Exception as page_error:
-                        logger.warning(f"Error extracting text from page {i+1}: {str(page_error)}")
-                
-                if not text.strip():
-                    raise ValueError("No text could be extracted from the PDF - it might be a scanned document")
-                
-                logger.info(f"Successfully extracted {len(text)} characters from PDF")
-                return text
-            except Exception as pdf_error:
-                raise Exception(f"Error reading PDF: {str(pdf_error)}")
+
+        logger.info(f"Processing PDF contents (size: {file_size} bytes)")
+        with timed("extract_text.pdf"):
+            return _read_pdf(_as_stream(data), backend)
     except Exception as e:
         logger.error(f"Error extracting text from PDF: {str(e)}")
+        record_error("extract_text.pdf")
         raise Exception(f"Error extracting text from PDF: {str(e)}")
 
-# Extracting from a Word docx
-def extract_text_from_docx(file_path):
-    """Extract text from a DOCX file."""
+
+# Extracting from in-memory DOCX contents
+def extract_text_from_docx_bytes(data: FileContents) -> str:
+    """Extract text from DOCX contents held in memory (bytes, memoryview or a binary stream)."""
     try:
-        # Check if file exists
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"DOCX file not found: {file_path}")
-            
-        # Check file size
-        file_size = os.path.getsize(file_path)
+        file_size = _contents_size(data)
         if file_size == 0:
             raise ValueError("DOCX file is empty")
-            
-        logger.info(f"Processing DOCX file: {file_path} (size: {file_size} bytes)")
-        
-        doc = Document(file_path)
-        text = ""
-        
-        # Extract text from paragraphs
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text += paragraph.text + "\n"
-        
-        # Extract text from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip():
-                        text += cell.text + "\n"
-        
-        # Extract text from headers and footers
-        for section in doc.sections:
-            for header in section.header.paragraphs:
-                if header.text.strip():
-                    text += header.text + "\n"
-            for footer in section.footer.paragraphs:
-                if footer.text.strip():
-                    text += footer.text + "\n"
-        
-        # Clean up the text
-        text = text.strip()
-        
-        if not text:
-            raise ValueError("No text could be extracted from the DOCX file")
-            
-        logger.info(f"Successfully extracted {len(text)} characters from DOCX")
-        return text
+
+        logger.info(f"Processing DOCX contents (size: {file_size} bytes)")
+        with timed("extract_text.docx"):
+            return _read_docx(_as_stream(data))
     except Exception as e:
         logger.error(f"Error extracting text from DOCX: {str(e)}")
-        raise Exception(f"Error extracting text from DOCX: {str(e)}")
\ No newline at end of file
+        record_error("extract_text.docx")
+        raise Exception(f"Error extracting text from DOCX: {str(e)}")
+
+
+# Extracting from a PDF
+def extract_text_from_pdf(file_path):
+    """Extract text from a PDF file."""
+    # Check if file exists
+    if not os.path.exists(file_path):
+        logger.error(f"Error extracting text from PDF: PDF file not found: {file_path}")
+        raise Exception(f"Error extracting text from PDF: PDF file not found: {file_path}")
+
+    with open(file_path, 'rb') as file:
+        return extract_text_from_pdf_bytes(file.read())
+
+# Extracting from a Word docx
+def extract_text_from_docx(file_path):
+    """Extract text from a DOCX file."""
+    # Check if file exists
+    if not os.path.exists(file_path):
+        logger.error(f"Error extracting text from DOCX: DOCX file not found: {file_path}")
+        raise Exception(f"Error extracting text from DOCX: DOCX file not found: {file_path}")
+
+    with open(file_path, 'rb') as file:
+        return extract_text_from_docx_bytes(file.read())
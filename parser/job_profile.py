@@ -0,0 +1,203 @@
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from models.job_model import JobRequirement, ScoreWeights
+from parser.keyword_matcher import KeywordMatcher
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Weights of the score components in the overall match score
+DEFAULT_SCORE_WEIGHTS = ScoreWeights().dict()
+
+# Raw components of a match score: weighted parts, then bonuses and penalties applied in this order.
+# A bonus or penalty of 0 means it did not apply to the candidate.
+WEIGHTED_COMPONENTS = ("skill", "experience", "relevance", "education", "certification", "cultural")
+BONUS_COMPONENTS = ("experience_bonus", "certification_bonus", "cultural_bonus", "market_bonus",
+                    "progression_bonus", "diversity_bonus")
+PENALTY_COMPONENTS = ("gap_penalty", "switch_penalty")
+SCORE_COMPONENTS = WEIGHTED_COMPONENTS + BONUS_COMPONENTS + PENALTY_COMPONENTS
+
+EDUCATION_LEVELS = {
+    "High School": 1,
+    "Associate's Degree": 2,
+    "Bachelor's Degree": 3,
+    "Master's Degree": 4,
+    "Doctorate": 5
+}
+
+# Industry-specific role progressions (simplified)
+ROLE_PROGRESSIONS = {
+    "Software Development": {
+        "Entry-level": ["Software Engineer", "Senior Software Engineer", "Lead Engineer"],
+        "Mid-level": ["Engineering Manager", "Solutions Architect", "Technical Director"],
+        "Executive": ["CTO", "VP of Engineering", "Chief Architect"]
+    },
+    "Data Science": {
+        "Entry-level": ["Data Analyst", "Data Scientist", "Senior Data Scientist"],
+        "Mid-level": ["Lead Data Scientist", "ML Engineer", "Data Science Manager"],
+        "Executive": ["Chief Data Officer", "Director of Data Science", "AI Research Director"]
+    },
+    "Marketing": {
+        "Entry-level": ["Marketing Associate", "Marketing Specialist", "Senior Marketing Specialist"],
+        "Mid-level": ["Marketing Manager", "Brand Manager", "Marketing Director"],
+        "Executive": ["CMO", "VP of Marketing", "Chief Brand Officer"]
+    },
+    "Default": {
+        "Entry-level": ["Specialist", "Senior Specialist", "Team Lead"],
+        "Mid-level": ["Manager", "Senior Manager", "Director"],
+        "Executive": ["Senior Director", "VP", "C-Suite Executive"]
+    }
+}
+
+# Industry-specific required skills for different career levels
+INDUSTRY_SKILLS = {
+    "Software Development": {
+        "Entry-level": ["Programming", "Data Structures", "Algorithms", "Version Control", "Unit Testing"],
+        "Mid-level": ["System Design", "Architecture", "Team Leadership", "Code Reviews", "Performance Optimization"],
+        "Executive": ["Technical Strategy", "Team Building", "Business Acumen", "Stakeholder Management"]
+    },
+    "Data Science": {
+        "Entry-level": ["Statistics", "Python", "Data Visualization", "SQL", "Machine Learning Basics"],
+        "Mid-level": ["Advanced ML", "Feature Engineering", "Model Deployment", "Project Management", "Deep Learning"],
+        "Executive": ["AI Strategy", "Business Value Creation", "Cross-functional Leadership", "Research Direction"]
+    },
+    "Default": {
+        "Entry-level": ["Communication", "Technical Skills", "Problem Solving", "Time Management"],
+        "Mid-level": ["Leadership", "Project Management", "Strategic Thinking", "Mentoring"],
+        "Executive": ["Vision Setting", "Organizational Leadership", "Business Strategy", "Change Management"]
+    }
+}
+
+
+def combine_components(components: Dict[str, Any], weights: Dict[str, float]):
+    """Overall match score from raw score components.
+
+    Works on floats (one candidate) and on numpy arrays (a batch), so ranking,
+    batch scoring and re-weighting all compute the score the same way.
+    """
+    overall = (
+        components["skill"] * weights["skill"] +
+        (components["experience"] * weights["experience"] + components["relevance"] * weights["relevance"]) +
+        components["education"] * weights["education"] +
+        components["certification"] * weights["certification"] +
+        components["cultural"] * weights["cultural"]
+    )
+    for name in BONUS_COMPONENTS:
+        bonus = components[name]
+        overall = np.where(bonus > 0, np.minimum(1.0, overall + bonus), overall)
+    for name in PENALTY_COMPONENTS:
+        penalty = components[name]
+        overall = np.where(penalty > 0, np.maximum(0.0, overall - penalty), overall)
+    return overall
+
+
+def job_profile_key(job_requirement: JobRequirement) -> str:
+    """Stable hash of a job requirement, used to cache its JobProfile."""
+    return hashlib.sha256(job_requirement.json(sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class CulturalValue:
+    """A company value with its related keywords, resolved once per job."""
+
+    def __init__(self, value: str, related_keywords: List[str]):
+        self.value = value
+        self.value_lower = value.lower()
+        # If no predefined keywords, the value itself is the keyword
+        self.related_keywords = related_keywords or [self.value_lower]
+        self.related_lower = [keyword.lower() for keyword in self.related_keywords]
+
+        # Suggestion shown when the resume does not mention this value
+        self.improvement_suggestion: Optional[str] = None
+        if related_keywords:
+            self.improvement_suggestion = (
+                f"Highlight experience demonstrating '{value}' (keywords: {', '.join(related_keywords[:3])})"
+            )
+
+
+class JobProfile:
+    """Everything about a JobRequirement that does not depend on the resume.
+
+    Built once per job and reused for every resume ranked against it:
+    normalized skill and certification sets, resolved company values with a
+    compiled keyword matcher, score weights and the industry progression track.
+    """
+
+    def __init__(self, job_requirement: JobRequirement, company_values_db: Dict[str, Any],
+                 cultural_keywords: Dict[str, List[str]], weights: Optional[Dict[str, float]] = None):
+        self.requirement = job_requirement
+        self.key = job_profile_key(job_requirement)
+        self.weights = dict(weights or DEFAULT_SCORE_WEIGHTS)
+
+        # Skills
+        self.required_skills = frozenset(s.lower() for s in job_requirement.required_skills)
+        self.preferred_skills = frozenset(s.lower() for s in job_requirement.preferred_skills or [])
+        self.required_skill_count = len(job_requirement.required_skills)
+
+        # Experience and education
+        self.experience_years = job_requirement.experience_years
+        self.required_education_value = EDUCATION_LEVELS.get(job_requirement.education_level, 0)
+
+        # Certifications
+        self.required_certifications = list(job_requirement.required_certifications or [])
+        self.required_certifications_lower = [cert.lower() for cert in self.required_certifications]
+
+        # Company values: from the job itself, else the industry (or global) defaults
+        self.company_values = self._resolve_company_values(job_requirement, company_values_db)
+        self.cultural_values = [
+            CulturalValue(value, cultural_keywords.get(value.lower(), []))
+            for value in self.company_values
+        ]
+        surfaces = []
+        for cultural_value in self.cultural_values:
+            surfaces.append(cultural_value.value_lower)
+            surfaces.extend(cultural_value.related_lower)
+        self.cultural_matcher = KeywordMatcher(surfaces)
+
+        # Career progression track for the job's industry
+        self.industry = job_requirement.industry
+        self.progression = ROLE_PROGRESSIONS.get(self.industry, ROLE_PROGRESSIONS["Default"])
+        self.alternative_progressions: List[Tuple[str, Dict[str, List[str]]]] = [
+            (industry, progression) for industry, progression in ROLE_PROGRESSIONS.items()
+            if industry != self.industry
+        ]
+        self.industry_required_skills = INDUSTRY_SKILLS.get(self.industry, INDUSTRY_SKILLS["Default"])
+        self.industry_skills_flat = [
+            skill for skills_by_level in self.industry_required_skills.values() for skill in skills_by_level
+        ]
+        self.industry_skills_set = frozenset(self.industry_skills_flat)
+
+    def changed_components(self, previous: "JobProfile") -> Set[str]:
+        """Score components that differ between this job and a previous version of it.
+
+        Title, keywords and location only affect the match details, and the
+        relevance, market, progression, gap and switch components do not
+        depend on the job at all, so they never need recomputing.
+        """
+        changed: Set[str] = set()
+        if (self.required_skills != previous.required_skills
+                or self.required_skill_count != previous.required_skill_count):
+            changed.update(("skill", "diversity_bonus"))
+        if self.preferred_skills != previous.preferred_skills:
+            changed.add("skill")
+        if self.experience_years != previous.experience_years:
+            changed.add("experience")
+        if self.required_education_value != previous.required_education_value:
+            changed.add("education")
+        if self.required_certifications != previous.required_certifications:
+            changed.update(("certification", "certification_bonus"))
+        if self.company_values != previous.company_values:
+            changed.update(("cultural", "cultural_bonus"))
+        return changed
+
+    @staticmethod
+    def _resolve_company_values(job_requirement: JobRequirement, company_values_db: Dict[str, Any]) -> List[str]:
+        if job_requirement.company_values:
+            return list(job_requirement.company_values)
+        industry = job_requirement.industry
+        if industry in company_values_db:
+            return list(company_values_db.get(industry, {}).get("Default", []))
+        return list(company_values_db.get("Default", []))
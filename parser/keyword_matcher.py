@@ -0,0 +1,129 @@
+import json
+import logging
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Set, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Taxonomy: canonical keyword -> aliases (the canonical form always matches itself)
+Taxonomy = Union[Mapping[str, Iterable[str]], Iterable[str]]
+
+_TERMINAL = ""  # Trie key marking the end of a keyword
+
+
+def _trie_to_regex(node: dict) -> str:
+    """Turn a character trie into a regex whose alternations never share a prefix."""
+    optional = _TERMINAL in node
+    branches = []
+    for char in sorted(key for key in node if key != _TERMINAL):
+        branches.append(re.escape(char) + _trie_to_regex(node[char]))
+
+    if not branches:
+        return ""
+    if len(branches) == 1:
+        pattern = branches[0]
+        if optional:
+            # Greedy optional continuation so the longest keyword is tried first
+            return f"(?:{pattern})?"
+        return pattern
+    pattern = "(?:" + "|".join(branches) + ")"
+    return pattern + "?" if optional else pattern
+
+
+class KeywordMatcher:
+    """Finds every keyword of a taxonomy in one pass over a text.
+
+    All surface forms are compiled into a single trie-shaped regular expression
+    with word-boundary semantics ("java" does not match inside "javascript"),
+    so the cost of a scan grows with the text, not with the taxonomy size.
+    Keywords nested at the start of a longer hit ("rest" in "rest api") are
+    reported as well.
+    """
+
+    def __init__(self, taxonomy: Taxonomy):
+        if not isinstance(taxonomy, Mapping):
+            taxonomy = {keyword: () for keyword in taxonomy}
+
+        self.canonical_order: Dict[str, int] = {}
+        self._surface_forms: Dict[str, Set[str]] = {}
+        for canonical, aliases in taxonomy.items():
+            self.canonical_order.setdefault(canonical, len(self.canonical_order))
+            for surface in (canonical, *aliases):
+                surface = surface.lower().strip()
+                if surface:
+                    self._surface_forms.setdefault(surface, set()).add(canonical)
+
+        self._trie: dict = {}
+        for surface in self._surface_forms:
+            node = self._trie
+            for char in surface:
+                node = node.setdefault(char, {})
+            node[_TERMINAL] = surface
+
+        if self._surface_forms:
+            # Lookahead capture so overlapping hits starting at later positions are still found.
+            # A preceding "." is not a word start either ("js" must not match inside "node.js").
+            self._pattern = re.compile(r"(?<![\w.])(?=(" + _trie_to_regex(self._trie) + r")(?!\w))")
+        else:
+            self._pattern = None
+
+    def __contains__(self, surface: str) -> bool:
+        return surface.lower() in self._surface_forms
+
+    def __len__(self) -> int:
+        return len(self._surface_forms)
+
+    def _hits(self, text: str) -> Iterable[List[str]]:
+        """Yield, for each position where keywords start, every surface form matched there."""
+        if self._pattern is None:
+            return
+        text = text.lower()
+        for match in self._pattern.finditer(text):
+            start = match.start(1)
+            longest = match.group(1)
+            surfaces = [longest]
+            # Shorter keywords that are prefixes of the longest hit and end on a word boundary
+            node = self._trie
+            for offset, char in enumerate(longest[:-1], start=1):
+                node = node[char]
+                end = start + offset
+                if _TERMINAL in node and not (end < len(text) and (text[end].isalnum() or text[end] == "_")):
+                    surfaces.append(node[_TERMINAL])
+            yield surfaces
+
+    def count(self, text: str) -> Counter:
+        """Number of occurrences of each canonical keyword in text.
+
+        A canonical keyword counts once per occurrence, even when several of its
+        surface forms match there (an alias extending its canonical name):
+
+        >>> KeywordMatcher({"spring": ["spring boot"]}).count("Spring Boot microservices")
+        Counter({'spring': 1})
+        """
+        counts: Counter = Counter()
+        for surfaces in self._hits(text):
+            counts.update({canonical for surface in surfaces for canonical in self._surface_forms[surface]})
+        return counts
+
+    def matches(self, text: str) -> Set[str]:
+        """Canonical keywords present in text."""
+        found: Set[str] = set()
+        for surfaces in self._hits(text):
+            for surface in surfaces:
+                found.update(self._surface_forms[surface])
+        return found
+
+    def find_all(self, text: str) -> List[str]:
+        """Canonical keywords present in text, in taxonomy order."""
+        return sorted(self.matches(text), key=self.canonical_order.__getitem__)
+
+
+def load_taxonomy(path: str) -> Dict[str, List[str]]:
+    """Load a taxonomy JSON file: {"canonical": ["alias", ...], ...}."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"Taxonomy file {path} must contain a JSON object")
+    return {canonical: list(aliases or []) for canonical, aliases in data.items()}
@@ -0,0 +1,59 @@
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+# Pipeline components each consumer actually needs; everything else is disabled per call.
+# Stop-word and punctuation flags are lexical attributes, so the tokenizer alone provides them.
+NER_COMPONENTS = ("ner",)
+TOKENIZER_ONLY: Tuple[str, ...] = ()
+
+
+class DocToken(NamedTuple):
+    text: str
+    is_stop: bool
+    is_punct: bool
+
+
+class ResumeDocument:
+    """A single spaCy pass over a piece of resume text.
+
+    Holds plain tokens and entities rather than the spaCy Doc itself, so it is
+    cheap to keep around and can be shared between extraction and scoring
+    steps (or sent to a worker process).
+    """
+
+    def __init__(self, text: str, tokens: List[DocToken], entities: List[Tuple[str, str]]):
+        self.text = text
+        self.tokens = tokens
+        self.entities = entities
+
+    @classmethod
+    def from_doc(cls, text: str, doc) -> "ResumeDocument":
+        tokens = [DocToken(t.text, t.is_stop, t.is_punct) for t in doc]
+        entities = [(ent.text, ent.label_) for ent in doc.ents]
+        return cls(text, tokens, entities)
+
+    @classmethod
+    def from_text(cls, nlp, text: str, components: Sequence[str] = NER_COMPONENTS) -> "ResumeDocument":
+        """Run nlp over text with every pipeline component outside `components` disabled."""
+        disable = [name for name in nlp.pipe_names if name not in components]
+        return cls.from_doc(text, nlp(text, disable=disable))
+
+    @classmethod
+    def pipe(cls, nlp, texts: Sequence[str], components: Sequence[str] = NER_COMPONENTS,
+             batch_size: int = 64, n_process: int = 1) -> List["ResumeDocument"]:
+        """Batched from_text over many texts with nlp.pipe; results keep the order of texts."""
+        disable = [name for name in nlp.pipe_names if name not in components]
+        docs = nlp.pipe(texts, batch_size=batch_size, n_process=n_process, disable=disable)
+        return [cls.from_doc(text, doc) for text, doc in zip(texts, docs)]
+
+    def first_entity(self, label: str) -> Optional[str]:
+        for text, ent_label in self.entities:
+            if ent_label == label:
+                return text
+        return None
+
+    def content_tokens(self) -> List[DocToken]:
+        """Tokens that are neither stop words nor punctuation."""
+        return [token for token in self.tokens if not token.is_stop and not token.is_punct]
+
+    def content_text(self) -> str:
+        return " ".join(token.text for token in self.content_tokens())
@@ -0,0 +1,80 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+import spacy
+
+from services.metrics import MODEL_LOAD_SECONDS, MODEL_RSS_DELTA_BYTES, REGISTRY
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+
+# nlp.pipe settings for batched code paths. n_process > 1 forks spaCy workers, so only
+# raise it for offline bulk jobs, not inside the server's (daemonic) ranking workers.
+DEFAULT_BATCH_SIZE = int(os.getenv("NLP_BATCH_SIZE", "64"))
+DEFAULT_N_PROCESS = int(os.getenv("NLP_N_PROCESS", "1"))
+
+# Parsing only needs NER and ranking only needs the tokenizer, so by default both share
+# one copy of the model without the tagger/parser/lemmatizer. In the en_core_web_sm
+# family the ner component has its own internal tok2vec, so the shared one can go too.
+NER_ONLY_EXCLUDE = ("tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer")
+
+_models: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+_lock = threading.Lock()
+
+
+def _rss_bytes() -> int:
+    """Current resident set size of this process (0 if it cannot be determined)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except Exception:
+            return 0
+
+
+def get_nlp(name: str = DEFAULT_MODEL, exclude: Sequence[str] = NER_ONLY_EXCLUDE):
+    """Return the process-wide pipeline for (name, exclude), loading it on first use."""
+    key = (name, tuple(sorted(exclude)))
+    nlp = _models.get(key)
+    if nlp is not None:
+        return nlp
+
+    with _lock:
+        if key not in _models:
+            rss_before = _rss_bytes()
+            start = time.perf_counter()
+            nlp = spacy.load(name, exclude=list(exclude))
+            load_seconds = time.perf_counter() - start
+
+            _models[key] = nlp
+            # Published as metrics so the serving process sees the workers' models (see model_stats)
+            labels = {"model": name, "excluded": ",".join(key[1]), "pid": str(os.getpid())}
+            MODEL_LOAD_SECONDS.set(load_seconds, **labels)
+            MODEL_RSS_DELTA_BYTES.set(max(0, _rss_bytes() - rss_before), **labels)
+            logger.info(f"Loaded spaCy model {name} (components: {nlp.pipe_names}) in {load_seconds:.2f}s")
+    return _models[key]
+
+
+def model_stats() -> List[Dict[str, Any]]:
+    """Load time and approximate memory footprint of every pipeline loaded by this process or its workers."""
+    samples = REGISTRY.collect()
+    load_seconds = samples.get(MODEL_LOAD_SECONDS.name, {})
+    rss_deltas = samples.get(MODEL_RSS_DELTA_BYTES.name, {})
+    return [
+        {
+            "model": model,
+            "excluded": excluded.split(",") if excluded else [],
+            "load_seconds": round(seconds, 4),
+            "rss_delta_bytes": int(rss_deltas.get((model, excluded, pid), 0)),
+            "pid": int(pid)
+        }
+        for (model, excluded, pid), seconds in sorted(load_seconds.items(), key=lambda item: int(item[0][2]))
+    ]
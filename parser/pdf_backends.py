@@ -0,0 +1,171 @@
+import importlib.util
+import logging
+import os
+import re
+from io import BytesIO
+from typing import Callable, Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Control characters some libraries leave in page text (form feeds between pages, NULs)
+_CONTROL_CHARS = re.compile(r"[\x00\x0b\x0c]")
+
+
+def normalize_page_text(text: str) -> str:
+    """Give every backend's page text the same shape: '\\n' line breaks, no control characters or trailing blanks."""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return _CONTROL_CHARS.sub("", text).rstrip()
+
+
+class PdfDocument:
+    """An open PDF whose pages are extracted one at a time."""
+
+    page_count = 0
+
+    def page_text(self, index: int) -> str:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PyPDF2Document(PdfDocument):
+    def __init__(self, data: bytes):
+        import PyPDF2
+
+        self._reader = PyPDF2.PdfReader(BytesIO(data))
+        if self._reader.is_encrypted:
+            raise ValueError("PDF is password-protected and cannot be processed")
+        self.page_count = len(self._reader.pages)
+
+    def page_text(self, index: int) -> str:
+        return self._reader.pages[index].extract_text() or ""
+
+
+class PyPdfDocument(PdfDocument):
+    def __init__(self, data: bytes):
+        import pypdf
+
+        self._reader = pypdf.PdfReader(BytesIO(data))
+        if self._reader.is_encrypted:
+            raise ValueError("PDF is password-protected and cannot be processed")
+        self.page_count = len(self._reader.pages)
+
+    def page_text(self, index: int) -> str:
+        return self._reader.pages[index].extract_text() or ""
+
+
+class PyMuPDFDocument(PdfDocument):
+    def __init__(self, data: bytes):
+        import pymupdf
+
+        self._document = pymupdf.open(stream=data, filetype="pdf")
+        if self._document.needs_pass:
+            self._document.close()
+            raise ValueError("PDF is password-protected and cannot be processed")
+        self.page_count = self._document.page_count
+
+    def page_text(self, index: int) -> str:
+        return self._document.load_page(index).get_text("text")
+
+    def close(self):
+        self._document.close()
+
+
+class PdfiumDocument(PdfDocument):
+    def __init__(self, data: bytes):
+        import pypdfium2
+
+        try:
+            self._document = pypdfium2.PdfDocument(data)
+        except pypdfium2.PdfiumError as e:
+            if "password" in str(e).lower():
+                raise ValueError("PDF is password-protected and cannot be processed")
+            raise
+        self.page_count = len(self._document)
+
+    def page_text(self, index: int) -> str:
+        page = self._document[index]
+        textpage = page.get_textpage()
+        try:
+            return textpage.get_text_range()
+        finally:
+            textpage.close()
+            page.close()
+
+    def close(self):
+        self._document.close()
+
+
+class PdfBackend:
+    """A PDF text extraction library, usable when its module is installed."""
+
+    def __init__(self, name: str, module: str, opener: Callable[[bytes], PdfDocument]):
+        self.name = name
+        self.module = module
+        self.opener = opener
+
+    def available(self) -> bool:
+        return importlib.util.find_spec(self.module) is not None
+
+    def open(self, data: bytes) -> PdfDocument:
+        return self.opener(data)
+
+
+# Registered backends, fastest first: PDF_BACKEND=auto picks the first installed one.
+# Order measured with `python -m benchmarks.run --benchmarks extract_pdf_backends`.
+PDF_BACKENDS: Dict[str, PdfBackend] = {}
+
+
+def register_pdf_backend(backend: PdfBackend, before: Optional[str] = None):
+    """Add a backend, at the end of the auto-selection order or just ahead of another backend."""
+    backends = [existing for existing in PDF_BACKENDS.values() if existing.name != backend.name]
+    position = next((i for i, existing in enumerate(backends) if existing.name == before), len(backends))
+    backends.insert(position, backend)
+    PDF_BACKENDS.clear()
+    PDF_BACKENDS.update((existing.name, existing) for existing in backends)
+
+
+# On the synthetic corpus pdfium is fastest for 1-2 page resumes and level with PyMuPDF on long ones;
+# PyMuPDF's per-document overhead puts it behind PyPDF2 on short files only
+register_pdf_backend(PdfBackend("pdfium", "pypdfium2", PdfiumDocument))
+# PyMuPDF >= 1.24.3 (importable as pymupdf; older releases only as fitz)
+register_pdf_backend(PdfBackend("pymupdf", "pymupdf", PyMuPDFDocument))
+register_pdf_backend(PdfBackend("pypdf2", "PyPDF2", PyPDF2Document))
+# pypdf (PyPDF2's successor) extracts text several times slower than PyPDF2 3.0
+register_pdf_backend(PdfBackend("pypdf", "pypdf", PyPdfDocument))
+
+
+def available_pdf_backends() -> List[str]:
+    """Names of the installed backends, in auto-selection order."""
+    return [name for name, backend in PDF_BACKENDS.items() if backend.available()]
+
+
+def get_pdf_backend(name: Optional[str] = None) -> PdfBackend:
+    """The backend called name, else the one configured by PDF_BACKEND (default auto: the fastest installed)."""
+    name = (name or os.getenv("PDF_BACKEND", "auto")).lower()
+    if name != "auto":
+        backend = PDF_BACKENDS.get(name)
+        if backend is not None and backend.available():
+            return backend
+        if backend is None:
+            logger.warning(f"Unknown PDF_BACKEND '{name}', picking the fastest installed backend")
+        else:
+            logger.warning(f"PDF backend '{name}' needs the {backend.module} module, picking the fastest installed backend")
+    for backend in PDF_BACKENDS.values():
+        if backend.available():
+            return backend
+    raise RuntimeError("No PDF backend is installed")
+
+
+_default_backend: Optional[PdfBackend] = None
+
+
+def default_pdf_backend() -> PdfBackend:
+    """The configured backend, resolved once per process."""
+    global _default_backend
+    if _default_backend is None:
+        _default_backend = get_pdf_backend()
+        logger.info(f"Extracting PDF text with the {_default_backend.name} backend")
+    return _default_backend
@@ -0,0 +1,203 @@
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import List, Optional, Tuple
+
+from parser.pdf_backends import PDF_BACKENDS, PdfBackend, PdfDocument, default_pdf_backend, get_pdf_backend, normalize_page_text
+from services.executor import TrackedExecutor, env_int
+from services.metrics import counter
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Budget that stopped an extraction early
+LIMIT_PAGES = "pages"
+LIMIT_CHARS = "chars"
+LIMIT_TIME = "time"
+
+# Worker processes extracting page ranges of large PDFs (PyPDF2 and pypdf are pure Python, threads would share the GIL)
+PDF_PAGE_WORKERS = env_int("PDF_PAGE_WORKERS", min(4, os.cpu_count() or 1))
+# Smaller documents are extracted inline: shipping them to a worker costs more than it saves
+PDF_PARALLEL_MIN_PAGES = env_int("PDF_PARALLEL_MIN_PAGES", 8)
+
+# Workers only notice the deadline between pages: wait this much longer for the pages they got to
+_DEADLINE_GRACE_SECONDS = 1.0
+
+page_pool = TrackedExecutor("pdf", lambda: ProcessPoolExecutor(max_workers=PDF_PAGE_WORKERS))
+
+PDF_TRUNCATIONS = counter("resume_pdf_truncated_total",
+                          "PDF extractions stopped early by a page, character or time budget", ["limit"])
+
+# (page index, text, error) for each page a worker got to
+PageResult = Tuple[int, str, Optional[str]]
+
+
+def _env_budget(name: str, default: float) -> Optional[float]:
+    # 0 (or a negative value) turns the budget off
+    value = os.getenv(name)
+    try:
+        budget = float(value) if value else default
+    except ValueError:
+        logger.warning(f"Invalid value '{value}' for {name}, using {default}")
+        budget = default
+    return budget if budget > 0 else None
+
+
+class PdfLimits:
+    """Page, character and wall-clock budgets of one PDF extraction (None means unlimited)."""
+
+    def __init__(self, max_pages: Optional[int] = None, max_chars: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls) -> "PdfLimits":
+        """Budgets from PDF_MAX_PAGES (default 30), PDF_MAX_CHARS (default 200000) and PDF_TIMEOUT_SECONDS (default 10)."""
+        max_pages = _env_budget("PDF_MAX_PAGES", 30)
+        max_chars = _env_budget("PDF_MAX_CHARS", 200_000)
+        return cls(
+            int(max_pages) if max_pages else None,
+            int(max_chars) if max_chars else None,
+            _env_budget("PDF_TIMEOUT_SECONDS", 10)
+        )
+
+
+DEFAULT_LIMITS = PdfLimits.from_env()
+
+
+class PdfExtraction:
+    """Text of a PDF and how much of the document it covers."""
+
+    def __init__(self, text: str, page_count: int, pages_extracted: int, limit: Optional[str] = None,
+                 empty_pages: Optional[List[int]] = None, failed_pages: Optional[List[int]] = None,
+                 backend: str = ""):
+        self.text = text
+        self.page_count = page_count
+        self.pages_extracted = pages_extracted
+        self.limit = limit  # LIMIT_PAGES, LIMIT_CHARS or LIMIT_TIME when a budget cut the text short
+        self.empty_pages = empty_pages or []
+        self.failed_pages = failed_pages or []
+        self.backend = backend
+
+    @property
+    def truncated(self) -> bool:
+        return self.limit is not None
+
+
+def _extract_pages(document: PdfDocument, start: int, stop: int, deadline: Optional[float],
+                   max_chars: Optional[int]) -> List[PageResult]:
+    """Extract pages start..stop-1 in order, stopping at the deadline or once max_chars are collected."""
+    results: List[PageResult] = []
+    chars = 0
+    for index in range(start, stop):
+        if (deadline is not None and time.time() > deadline) or (max_chars and chars >= max_chars):
+            break
+        try:
+            text = normalize_page_text(document.page_text(index))
+            results.append((index, text, None))
+            chars += len(text)
+        except Exception as page_error:
+            results.append((index, "", str(page_error)))
+    return results
+
+
+def _extract_page_range(backend: str, data: bytes, start: int, stop: int, deadline: Optional[float],
+                        max_chars: Optional[int]) -> List[PageResult]:
+    """Worker task: open the document separately and extract one page range."""
+    document = PDF_BACKENDS[backend].open(data)
+    try:
+        return _extract_pages(document, start, stop, deadline, max_chars)
+    finally:
+        document.close()
+
+
+def extract_pdf(data: bytes, limits: Optional[PdfLimits] = None, backend: Optional[str] = None) -> PdfExtraction:
+    """Extract the text of a PDF within page, character and time budgets.
+
+    backend names one of PDF_BACKENDS (default: PDF_BACKEND). Large documents
+    are split into contiguous page ranges extracted by the worker processes
+    and joined back in page order.
+    """
+    limits = limits or DEFAULT_LIMITS
+    pdf_backend: PdfBackend = get_pdf_backend(backend) if backend else default_pdf_backend()
+    data = bytes(data)
+    document = pdf_backend.open(data)
+    try:
+        return _extract_document(pdf_backend, document, data, limits)
+    finally:
+        document.close()
+
+
+def _extract_document(backend: PdfBackend, document: PdfDocument, data: bytes, limits: PdfLimits) -> PdfExtraction:
+    page_count = document.page_count
+    if page_count == 0:
+        raise ValueError("PDF has no pages")
+
+    target = min(page_count, limits.max_pages) if limits.max_pages else page_count
+    limit = LIMIT_PAGES if target < page_count else None
+    deadline = time.time() + limits.timeout if limits.timeout else None
+
+    if PDF_PAGE_WORKERS > 1 and target >= PDF_PARALLEL_MIN_PAGES:
+        step = math.ceil(target / PDF_PAGE_WORKERS)
+        ranges = [(start, min(target, start + step)) for start in range(0, target, step)]
+        futures = [page_pool.submit(_extract_page_range, backend.name, data, start, stop, deadline, limits.max_chars)
+                   for start, stop in ranges]
+    else:
+        ranges = [(0, target)]
+        futures = None
+
+    parts: List[str] = []
+    chars = 0
+    pages_extracted = 0
+    empty_pages: List[int] = []
+    failed_pages: List[int] = []
+    try:
+        for n, (start, stop) in enumerate(ranges):
+            if futures is None:
+                results = _extract_pages(document, start, stop, deadline, limits.max_chars)
+            else:
+                try:
+                    timeout = (
+                        max(0.0, deadline - time.time()) + _DEADLINE_GRACE_SECONDS if deadline is not None else None
+                    )
+                    results = futures[n].result(timeout=timeout)
+                except FutureTimeoutError:
+                    limit = LIMIT_TIME
+                    break
+
+            for index, text, error in results:
+                pages_extracted += 1
+                if error is not None:
+                    failed_pages.append(index)
+                    logger.warning(f"Error extracting text from page {index+1}: {error}")
+                elif not text:
+                    empty_pages.append(index)
+                    logger.warning(f"Page {index+1} extracted no text - might be an image or scanned page")
+                else:
+                    parts.append(text)
+                    parts.append("\n")
+                    chars += len(text) + 1
+                if limits.max_chars and chars >= limits.max_chars:
+                    limit = LIMIT_CHARS
+                    break
+            if limit in (LIMIT_CHARS, LIMIT_TIME):
+                break
+            if len(results) < stop - start:
+                # The range stopped at the deadline (its own character count never exceeds ours)
+                limit = LIMIT_TIME
+                break
+    finally:
+        if futures is not None:
+            for future in futures:
+                future.cancel()
+
+    text = "".join(parts)
+    if limit == LIMIT_CHARS:
+        text = text[:limits.max_chars]
+    if limit is not None:
+        PDF_TRUNCATIONS.inc(limit=limit)
+    return PdfExtraction(text, page_count, pages_extracted, limit, empty_pages, failed_pages, backend.name)
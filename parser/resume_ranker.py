@@ -1,12 +1,15 @@
-import spacy
 from typing import List, Dict, Any, Optional, Union
 from models.response_model import ResumeData, Experience, Education
 from models.job_model import JobRequirement, JobMatch, SkillFitment, CareerPathSuggestion, CareerForecast, TrajectoryPrediction, SkillGapForecast
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 from datetime import datetime, date
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from parser.nlp_document import ResumeDocument, TOKENIZER_ONLY
+from parser.nlp_registry import get_nlp, DEFAULT_BATCH_SIZE, DEFAULT_N_PROCESS
+from parser.keyword_matcher import KeywordMatcher
+from parser.job_profile import JobProfile, job_profile_key, combine_components, EDUCATION_LEVELS
+from parser.vector_scoring import BatchScorer
+from services.metrics import record_cache, record_error, timed
 import re
 import logging
 
@@ -14,11 +17,39 @@ import logging
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+# Job title keywords (with the inflections the old substring scan also caught) and their weights
+TITLE_KEYWORDS = {
+    "engineer": ["engineers", "engineering"], "developer": ["developers"],
+    "analyst": ["analysts"], "manager": ["managers"],
+    "lead": ["leads", "leader", "leadership"], "architect": ["architects", "architecture"],
+    "specialist": ["specialists"]
+}
+TITLE_KEYWORD_WEIGHTS = {
+    "engineer": 0.3, "developer": 0.3, "analyst": 0.2, "manager": 0.2,
+    "lead": 0.2, "architect": 0.3, "specialist": 0.2
+}
+
+# Technical terms looked for in experience descriptions
+TECHNICAL_TERMS = {
+    "python": [], "java": [], "javascript": [], "sql": ["mysql", "postgresql", "nosql"],
+    "aws": [], "cloud": [], "database": ["databases"], "api": ["apis"], "web": [],
+    "mobile": [], "software": [], "system": ["systems"], "network": ["networks", "networking"],
+    "security": []
+}
+
+TITLE_MATCHER = KeywordMatcher(TITLE_KEYWORDS)
+TECHNICAL_MATCHER = KeywordMatcher(TECHNICAL_TERMS)
+
 
 class ResumeRanker:
     def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
-        self.vectorizer = TfidfVectorizer()
+        # Tokenized resume texts, reused when the same resume is ranked against several jobs
+        self._documents = OrderedDict()
+        self._max_documents = 1024
+        
+        # Compiled job profiles, keyed by job requirement hash
+        self._profiles = OrderedDict()
+        self._max_profiles = 128
         
         # Initialize role categories and their typical requirements
         self.role_categories = {
@@ -317,14 +348,62 @@ class ResumeRanker:
                          "philanthropy", "outreach", "volunteering"]
         }
         
+    @property
+    def nlp(self):
+        # Shared, lazily loaded pipeline (see parser/nlp_registry.py)
+        return get_nlp()
+    
+    def _resume_document(self, text: str) -> ResumeDocument:
+        """Tokenize text once (stop-word/punctuation flags need no pipeline components) and memoize it."""
+        document = self._documents.get(text)
+        record_cache("ranker_documents", document is not None)
+        if document is not None:
+            self._documents.move_to_end(text)
+            return document
+        
+        document = ResumeDocument.from_text(self.nlp, text, TOKENIZER_ONLY)
+        self._documents[text] = document
+        if len(self._documents) > self._max_documents:
+            self._documents.popitem(last=False)
+        return document
+    
+    def _warm_documents(self, texts: List[str], batch_size: int = DEFAULT_BATCH_SIZE, n_process: int = DEFAULT_N_PROCESS):
+        """Tokenize all not-yet-seen texts in one nlp.pipe call so later lookups hit the memo."""
+        missing = list(dict.fromkeys(text for text in texts if text not in self._documents))
+        if not missing:
+            return
+        for document in ResumeDocument.pipe(self.nlp, missing, TOKENIZER_ONLY, batch_size, n_process):
+            self._documents[document.text] = document
+        while len(self._documents) > max(self._max_documents, len(texts)):
+            self._documents.popitem(last=False)
+    
     def _preprocess_text(self, text: str) -> str:
-        doc = self.nlp(text.lower())
-        return " ".join([token.text for token in doc if not token.is_stop and not token.is_punct])
+        return self._resume_document(text.lower()).content_text()
+    
+    def job_profile(self, job_requirement: JobRequirement) -> JobProfile:
+        """Return the compiled profile of a job, building it on first use."""
+        key = job_profile_key(job_requirement)
+        profile = self._profiles.get(key)
+        record_cache("job_profiles", profile is not None)
+        if profile is not None:
+            self._profiles.move_to_end(key)
+            return profile
+        
+        profile = JobProfile(job_requirement, self.company_values_db, self.cultural_keywords)
+        self._profiles[key] = profile
+        if len(self._profiles) > self._max_profiles:
+            self._profiles.popitem(last=False)
+        return profile
     
-    def _calculate_skill_match(self, resume_skills: List[str], job_skills: List[str], preferred_skills: List[str] = None) -> Dict[str, float]:
+    def _calculate_skill_match(self, resume_skills: List[str], job_skills: List[str], preferred_skills: List[str] = None,
+                               profile: Optional[JobProfile] = None) -> Dict[str, float]:
         resume_skills_set = set(s.lower() for s in resume_skills)
-        job_skills_set = set(s.lower() for s in job_skills)
-        preferred_skills_set = set(s.lower() for s in preferred_skills) if preferred_skills else set()
+        if profile is not None:
+            job_skills_set = profile.required_skills
+            preferred_skills_set = profile.preferred_skills
+        else:
+            job_skills_set = set(s.lower() for s in job_skills)
+            preferred_skills_set = set(s.lower() for s in preferred_skills) if preferred_skills else set()
         
         # Calculate required skills match with more granular scoring
         if not job_skills_set:
@@ -424,17 +503,10 @@ class ResumeRanker:
                 desc_relevance = 0.0
                 
                 # Check for relevant keywords in title
-                relevant_keywords = ['engineer', 'developer', 'analyst', 'manager', 'lead', 'architect', 'specialist']
-                for keyword in relevant_keywords:
-                    if keyword in title:
-                        title_relevance += 0.2
+                title_relevance += 0.2 * len(TITLE_MATCHER.matches(title))
                 
                 # Check for technical terms in description
-                technical_terms = ['python', 'java', 'javascript', 'sql', 'aws', 'cloud', 'database', 
-                                 'api', 'web', 'mobile', 'software', 'system', 'network', 'security']
-                for term in technical_terms:
-                    if term in description:
-                        desc_relevance += 0.1
+                desc_relevance += 0.1 * len(TECHNICAL_MATCHER.matches(description))
                 
                 # Combine scores for this experience
                 exp_relevance = min(1.0, (title_relevance + desc_relevance) / 2)
@@ -464,6 +536,35 @@ class ResumeRanker:
                 "relevant_years": 0.0
             }
     
+    def _reported_duration(self, exp: Union[Dict, Experience]) -> float:
+        """Duration stated on the experience entry itself, defaulting to 1 year."""
+        # Get duration directly from experience object if available
+        if hasattr(exp, 'duration'):
+            return float(exp.duration)
+        if isinstance(exp, dict) and 'duration' in exp:
+            return float(exp['duration'])
+        # Default to 1 year if duration not specified
+        return 1.0
+    
+    def _experience_relevance(self, exp: Union[Dict, Experience]) -> float:
+        """Keyword-based relevance (0.0 to 1.0) of a single experience entry."""
+        # Get title and description safely
+        title = getattr(exp, 'title', '') if hasattr(exp, 'title') else exp.get('title', '')
+        description = getattr(exp, 'description', '') if hasattr(exp, 'description') else exp.get('description', '')
+
+        # Convert to string safely
+        title = str(title) if title else ''
+        description = str(description) if description else ''
+
+        # Calculate title score
+        title_score = sum(TITLE_KEYWORD_WEIGHTS[keyword] for keyword in TITLE_MATCHER.matches(title))
+
+        # Calculate description score
+        desc_score = 0.1 * len(TECHNICAL_MATCHER.matches(description))
+
+        # Combine scores
+        return min(1.0, (title_score + desc_score) / 2)
+
     def _calculate_experience_match_alt(self, resume_experience: List[Union[Dict, Experience]], required_years: float) -> Dict[str, float]:
         """Alternative method to calculate experience match score based on required years."""
         try:
@@ -479,14 +580,7 @@ class ResumeRanker:
             # Calculate total years using a simpler approach
             total_years = 0
             for exp in resume_experience:
-                # Get duration directly from experience object if available
-                if hasattr(exp, 'duration'):
-                    total_years += float(exp.duration)
-                elif isinstance(exp, dict) and 'duration' in exp:
-                    total_years += float(exp['duration'])
-                else:
-                    # Default to 1 year if duration not specified
-                    total_years += 1.0
+                total_years += self._reported_duration(exp)
 
             # Calculate experience match score
             if required_years <= 0:
@@ -496,62 +590,7 @@ class ResumeRanker:
                 experience_match = min(1.0, total_years / required_years)
 
             # Calculate relevance using a simpler keyword-based approach
-            relevance_scores = []
-            for exp in resume_experience:
-                # Get title and description safely
-                title = getattr(exp, 'title', '') if hasattr(exp, 'title') else exp.get('title', '')
-                description = getattr(exp, 'description', '') if hasattr(exp, 'description') else exp.get('description', '')
-
-                # Convert to string safely
-                title = str(title) if title else ''
-                description = str(description) if description else ''
-
-                # Simple keyword matching
-                title_score = 0
-                desc_score = 0
-
-                # Title keywords with weights
-                title_keywords = {
-                    'engineer': 0.3,
-                    'developer': 0.3,
-                    'analyst': 0.2,
-                    'manager': 0.2,
-                    'lead': 0.2,
-                    'architect': 0.3,
-                    'specialist': 0.2
-                }
-
-                # Description keywords with weights
-                desc_keywords = {
-                    'python': 0.1,
-                    'java': 0.1,
-                    'javascript': 0.1,
-                    'sql': 0.1,
-                    'aws': 0.1,
-                    'cloud': 0.1,
-                    'database': 0.1,
-                    'api': 0.1,
-                    'web': 0.1,
-                    'mobile': 0.1,
-                    'software': 0.1,
-                    'system': 0.1,
-                    'network': 0.1,
-                    'security': 0.1
-                }
-
-                # Calculate title score
-                for keyword, weight in title_keywords.items():
-                    if keyword in title.lower():
-                        title_score += weight
-
-                # Calculate description score
-                for keyword, weight in desc_keywords.items():
-                    if keyword in description.lower():
-                        desc_score += weight
-
-                # Combine scores
-                exp_relevance = min(1.0, (title_score + desc_score) / 2)
-                relevance_scores.append(exp_relevance)
+            relevance_scores = [self._experience_relevance(exp) for exp in resume_experience]
 
             # Calculate average relevance
             relevance_match = sum(relevance_scores) / len(relevance_scores) if relevance_scores else 0.0
@@ -577,13 +616,7 @@ class ResumeRanker:
     def _calculate_education_match(self, resume_education: List[Dict], required_level: str) -> Dict[str, Any]:
         """Calculate education match score based on required level."""
         try:
-            education_levels = {
-                "High School": 1,
-                "Associate's Degree": 2,
-                "Bachelor's Degree": 3,
-                "Master's Degree": 4,
-                "Doctorate": 5
-            }
+            education_levels = EDUCATION_LEVELS
             
             required_level_value = education_levels.get(required_level, 0)
             
@@ -766,7 +799,8 @@ class ResumeRanker:
             logger.error(f"Error calculating experience duration: {e}")
             return 1.0  # Default to 1 year if calculation fails
 
-    def _calculate_certification_match(self, resume_certifications: List[str], required_certifications: List[str]) -> Dict[str, Any]:
+    def _calculate_certification_match(self, resume_certifications: List[str], required_certifications: List[str],
+                                       profile: Optional[JobProfile] = None) -> Dict[str, Any]:
         """
         Calculate certification relevance score by matching resume certifications to job requirements.
         Prioritizes industry-recognized certifications.
@@ -811,7 +845,10 @@ class ResumeRanker:
         
         # Standardize certification names for better matching
         resume_certs_lower = [cert.lower() for cert in resume_certifications]
-        required_certs_lower = [cert.lower() for cert in required_certifications]
+        if profile is not None:
+            required_certs_lower = profile.required_certifications_lower
+        else:
+            required_certs_lower = [cert.lower() for cert in required_certifications]
         
         # Find exact matches
         matching_certs = []
@@ -853,21 +890,33 @@ class ResumeRanker:
             "has_industry_recognized": has_recognized
         }
 
-    def _calculate_cultural_fit(self, resume_data: ResumeData, job_requirement: JobRequirement) -> Dict[str, Any]:
+    def _cultural_text(self, resume_data: ResumeData) -> str:
+        """Lowercased resume text scanned for cultural fit keywords."""
+        # Extract text from different parts of the resume
+        resume_text = ""
+        
+        # Add experience descriptions
+        for exp in resume_data.experience:
+            if hasattr(exp, 'description') and exp.description:
+                if isinstance(exp.description, list):
+                    resume_text += " ".join(exp.description) + " "
+                else:
+                    resume_text += exp.description + " "
+        
+        # Add skills (as these often contain soft skills)
+        if resume_data.skills:
+            resume_text += " ".join(resume_data.skills) + " "
+        
+        return resume_text.lower()
+    
+    def _calculate_cultural_fit(self, resume_data: ResumeData, job_requirement: JobRequirement,
+                                profile: Optional[JobProfile] = None) -> Dict[str, Any]:
         """
         Calculate a cultural fit score based on how well the resume's tone and keywords align with company values
         """
-        # Get company values - either from job requirements or use defaults based on industry
-        company_values = []
-        if job_requirement.company_values and len(job_requirement.company_values) > 0:
-            company_values = job_requirement.company_values
-        else:
-            # Use industry defaults if available
-            industry = job_requirement.industry
-            if industry in self.company_values_db:
-                company_values = self.company_values_db.get(industry, {}).get("Default", [])
-            else:
-                company_values = self.company_values_db.get("Default", [])
+        # Company values (from the job or industry defaults) are resolved once per job profile
+        profile = profile or self.job_profile(job_requirement)
+        company_values = profile.company_values
         
         if not company_values:
             return {
@@ -880,23 +929,9 @@ class ResumeRanker:
                 "company_values": []
             }
         
-        # Extract text from different parts of the resume
-        resume_text = ""
-        
-        # Add experience descriptions
-        for exp in resume_data.experience:
-            if hasattr(exp, 'description') and exp.description:
-                if isinstance(exp.description, list):
-                    resume_text += " ".join(exp.description) + " "
-                else:
-                    resume_text += exp.description + " "
-        
-        # Add skills (as these often contain soft skills)
-        if resume_data.skills:
-            resume_text += " ".join(resume_data.skills) + " "
-            
-        # Preprocess the text
-        resume_text = self._preprocess_text(resume_text.lower())
+        # Preprocess the text and find every value and keyword in one scan
+        resume_text = self._preprocess_text(self._cultural_text(resume_data))
+        hits = profile.cultural_matcher.matches(resume_text)
         
         # Track matched values and keywords
         matched_values = []
@@ -904,21 +939,17 @@ class ResumeRanker:
         
         # For each company value, check if related keywords appear in the resume
         value_scores = []
-        for value in company_values:
-            value_lower = value.lower()
+        for cultural_value in profile.cultural_values:
+            value = cultural_value.value
             # Direct value match (the value itself appears)
-            direct_match = value_lower in resume_text
+            direct_match = cultural_value.value_lower in hits
             
             # Check for related keywords
-            related_keywords = self.cultural_keywords.get(value_lower, [])
-            if not related_keywords:
-                # If no predefined keywords, use the value itself as a keyword
-                related_keywords = [value_lower]
-            
-            keyword_matches = []
-            for keyword in related_keywords:
-                if keyword.lower() in resume_text:
-                    keyword_matches.append(keyword)
+            related_keywords = cultural_value.related_keywords
+            keyword_matches = [
+                keyword for keyword, keyword_lower in zip(related_keywords, cultural_value.related_lower)
+                if keyword_lower in hits
+            ]
             
             # Calculate score for this value (0.0 to 1.0)
             # Direct match gives 0.8, each keyword adds up to 0.2 more
@@ -944,12 +975,9 @@ class ResumeRanker:
         
         # Generate improvement suggestions for values with no matches
         improvement_suggestions = []
-        for value in company_values:
-            if value not in matched_values:
-                keywords = self.cultural_keywords.get(value.lower(), [])[:3]  # Get top 3 keywords
-                if keywords:
-                    suggestion = f"Highlight experience demonstrating '{value}' (keywords: {', '.join(keywords)})"
-                    improvement_suggestions.append(suggestion)
+        for cultural_value in profile.cultural_values:
+            if cultural_value.value not in matched_values and cultural_value.improvement_suggestion:
+                improvement_suggestions.append(cultural_value.improvement_suggestion)
         
         # Remove duplicates
         matched_values = list(set(matched_values))
@@ -1148,7 +1176,8 @@ class ResumeRanker:
         
         return level_ranking.get(current_level, 0) > level_ranking.get(previous_level, 0)
 
-    def _forecast_career_trajectory(self, resume_data: ResumeData, job_requirement: JobRequirement) -> CareerForecast:
+    def _forecast_career_trajectory(self, resume_data: ResumeData, job_requirement: JobRequirement,
+                                    profile: Optional[JobProfile] = None) -> CareerForecast:
         """
         Forecast a candidate's career trajectory using sequence modeling techniques.
         This simulates a trained ML model for trajectory prediction.
@@ -1195,33 +1224,10 @@ class ResumeRanker:
         # Calculate total experience
         total_exp_years = sum(self._calculate_experience_duration(exp) for exp in resume_data.experience)
         
-        # Define industry-specific role progressions (simplified)
-        role_progressions = {
-            "Software Development": {
-                "Entry-level": ["Software Engineer", "Senior Software Engineer", "Lead Engineer"],
-                "Mid-level": ["Engineering Manager", "Solutions Architect", "Technical Director"],
-                "Executive": ["CTO", "VP of Engineering", "Chief Architect"]
-            },
-            "Data Science": {
-                "Entry-level": ["Data Analyst", "Data Scientist", "Senior Data Scientist"],
-                "Mid-level": ["Lead Data Scientist", "ML Engineer", "Data Science Manager"],
-                "Executive": ["Chief Data Officer", "Director of Data Science", "AI Research Director"]
-            },
-            "Marketing": {
-                "Entry-level": ["Marketing Associate", "Marketing Specialist", "Senior Marketing Specialist"],
-                "Mid-level": ["Marketing Manager", "Brand Manager", "Marketing Director"],
-                "Executive": ["CMO", "VP of Marketing", "Chief Brand Officer"]
-            },
-            "Default": {
-                "Entry-level": ["Specialist", "Senior Specialist", "Team Lead"],
-                "Mid-level": ["Manager", "Senior Manager", "Director"],
-                "Executive": ["Senior Director", "VP", "C-Suite Executive"]
-            }
-        }
-        
-        # Get progression based on industry or use default
-        industry = job_requirement.industry
-        progression = role_progressions.get(industry, role_progressions["Default"])
+        # Get progression based on industry or use default (resolved once per job profile)
+        profile = profile or self.job_profile(job_requirement)
+        industry = profile.industry
+        progression = profile.progression
         
         # Start with the appropriate track based on current level
         track = progression.get(current_level, progression["Entry-level"])
@@ -1249,27 +1255,8 @@ class ResumeRanker:
         confidence_base = 0.85  # Base confidence
         confidence_decay = 0.1  # Decrease per year to reflect increasing uncertainty
         
-        # Define industry-specific required skills for different roles
-        industry_skills = {
-            "Software Development": {
-                "Entry-level": ["Programming", "Data Structures", "Algorithms", "Version Control", "Unit Testing"],
-                "Mid-level": ["System Design", "Architecture", "Team Leadership", "Code Reviews", "Performance Optimization"],
-                "Executive": ["Technical Strategy", "Team Building", "Business Acumen", "Stakeholder Management"]
-            },
-            "Data Science": {
-                "Entry-level": ["Statistics", "Python", "Data Visualization", "SQL", "Machine Learning Basics"],
-                "Mid-level": ["Advanced ML", "Feature Engineering", "Model Deployment", "Project Management", "Deep Learning"],
-                "Executive": ["AI Strategy", "Business Value Creation", "Cross-functional Leadership", "Research Direction"]
-            },
-            "Default": {
-                "Entry-level": ["Communication", "Technical Skills", "Problem Solving", "Time Management"],
-                "Mid-level": ["Leadership", "Project Management", "Strategic Thinking", "Mentoring"],
-                "Executive": ["Vision Setting", "Organizational Leadership", "Business Strategy", "Change Management"]
-            }
-        }
-        
         # Get required skills based on industry
-        industry_required_skills = industry_skills.get(industry, industry_skills["Default"])
+        industry_required_skills = profile.industry_required_skills
         
         # Create forecasted trajectory for the next 3 years
         for year in range(3):
@@ -1290,12 +1277,11 @@ class ResumeRanker:
             # Define alternative roles
             alternative_roles = []
             # Look at other industries for alternatives
-            for alt_industry, alt_progression in role_progressions.items():
-                if alt_industry != industry:
-                    if adjusted_level in alt_progression:
-                        alt_role_index = min(role_index, len(alt_progression[adjusted_level]) - 1)
-                        alternative_role = alt_progression[adjusted_level][alt_role_index]
-                        alternative_roles.append(alternative_role)
+            for alt_industry, alt_progression in profile.alternative_progressions:
+                if adjusted_level in alt_progression:
+                    alt_role_index = min(role_index, len(alt_progression[adjusted_level]) - 1)
+                    alternative_role = alt_progression[adjusted_level][alt_role_index]
+                    alternative_roles.append(alternative_role)
             
             # Trim to just 2-3 alternatives
             alternative_roles = alternative_roles[:3]
@@ -1378,11 +1364,9 @@ class ResumeRanker:
         # Calculate industry alignment score
         industry_alignment = 0.7  # Default
         # Adjust based on matching skills with industry requirements
-        industry_skills_flat = []
-        for skills_by_level in industry_required_skills.values():
-            industry_skills_flat.extend(skills_by_level)
+        industry_skills_flat = profile.industry_skills_flat
         
-        matching_industry_skills = sum(1 for skill in current_skills if skill in industry_skills_flat)
+        matching_industry_skills = sum(1 for skill in current_skills if skill in profile.industry_skills_set)
         if industry_skills_flat:
             industry_alignment = min(0.95, 0.6 + (matching_industry_skills / len(industry_skills_flat)) * 0.35)
         
@@ -1398,40 +1382,52 @@ class ResumeRanker:
         
         return forecast
 
-    def rank_resume(self, resume_data: ResumeData, job_requirement: JobRequirement) -> JobMatch:
+    def rank_resume(self, resume_data: ResumeData, job_requirement: JobRequirement,
+                    profile: Optional[JobProfile] = None) -> JobMatch:
         """Rank a resume against job requirements."""
         
         try:
+            # Job-side work (normalized skills, company values, progression track) is done once per job
+            profile = profile or self.job_profile(job_requirement)
+            weights = profile.weights
+            
             # Calculate skill match
-            skill_match = self._calculate_skill_match(
-                resume_data.skills, 
-                job_requirement.required_skills,
-                job_requirement.preferred_skills
-            )
+            with timed("rank.skill_match"):
+                skill_match = self._calculate_skill_match(
+                    resume_data.skills, 
+                    job_requirement.required_skills,
+                    job_requirement.preferred_skills,
+                    profile=profile
+                )
             
             # Use the alternative experience match calculation
-            experience_match = self._calculate_experience_match_alt(
-                resume_data.experience,
-                job_requirement.experience_years
-            )
+            with timed("rank.experience_match"):
+                experience_match = self._calculate_experience_match_alt(
+                    resume_data.experience,
+                    job_requirement.experience_years
+                )
             
             # Calculate education match
-            education_match = self._calculate_education_match(
-                resume_data.education,
-                job_requirement.education_level
-            )
+            with timed("rank.education_match"):
+                education_match = self._calculate_education_match(
+                    resume_data.education,
+                    job_requirement.education_level
+                )
             
             # Calculate certification match score
-            certification_match = self._calculate_certification_match(
-                resume_data.certifications if resume_data.certifications else [],
-                job_requirement.required_certifications if job_requirement.required_certifications else []
-            )
+            with timed("rank.certification_match"):
+                certification_match = self._calculate_certification_match(
+                    resume_data.certifications if resume_data.certifications else [],
+                    profile.required_certifications,
+                    profile=profile
+                )
             
             # Calculate skill fitment
-            skill_fitment = self._calculate_skill_fitment(
-                resume_data.skills,
-                resume_data.experience
-            )
+            with timed("rank.skill_fitment"):
+                skill_fitment = self._calculate_skill_fitment(
+                    resume_data.skills,
+                    resume_data.experience
+                )
             
             # Identify strength areas
             strength_areas = self._identify_strength_areas(skill_fitment)
@@ -1440,19 +1436,24 @@ class ResumeRanker:
             total_exp_years = sum(self._calculate_experience_duration(exp) for exp in resume_data.experience)
             
             # Suggest career paths
-            career_suggestions = self._suggest_career_paths(skill_fitment, total_exp_years)
+            with timed("rank.career_paths"):
+                career_suggestions = self._suggest_career_paths(skill_fitment, total_exp_years)
             
             # Calculate market alignment
-            market_alignment = self._calculate_market_alignment(skill_fitment)
+            with timed("rank.market_alignment"):
+                market_alignment = self._calculate_market_alignment(skill_fitment)
             
             # Calculate cultural fit
-            cultural_fit = self._calculate_cultural_fit(resume_data, job_requirement)
+            with timed("rank.cultural_fit"):
+                cultural_fit = self._calculate_cultural_fit(resume_data, job_requirement, profile)
             
             # Analyze career progression
-            career_progression = self._analyze_career_progression(resume_data.experience)
+            with timed("rank.career_progression"):
+                career_progression = self._analyze_career_progression(resume_data.experience)
             
             # Generate career trajectory forecast
-            career_forecast = self._forecast_career_trajectory(resume_data, job_requirement)
+            with timed("rank.career_forecast"):
+                career_forecast = self._forecast_career_trajectory(resume_data, job_requirement, profile)
             
             # Calculate overall match score (weighted average)
             # Skill match: 35%, Experience match: 25%, Education match: 15%, Certification match: 10%, Cultural fit: 15%
@@ -1461,67 +1462,60 @@ class ResumeRanker:
             else:
                 education_score = 0.5  # Partial credit even if education doesn't match exactly
                 
-            # Calculate weighted components with more granular scoring
-            skill_component = skill_match["overall_match"] * 0.35
-            
-            # Experience component now considers both years and relevance
-            experience_component = (
-                experience_match["experience_match"] * 0.15 +  # Base experience match
-                experience_match["relevance_match"] * 0.10     # Relevance of experience
-            )
-            
-            education_component = education_score * 0.15
-            certification_component = certification_match["certification_match_score"] * 0.10
-            cultural_component = cultural_fit["cultural_fit_score"] * 0.15
-            
-            # Calculate overall match with more granular scoring
-            overall_match = (
-                skill_component +
-                experience_component +
-                education_component +
-                certification_component +
-                cultural_component
-            )
+            # Raw score components; the weighted sum plus bonuses and penalties gives the overall match.
+            # They are returned in match_details so the ranking can be re-weighted without re-scoring.
+            components = {
+                "skill": skill_match["overall_match"],
+                # Experience considers both years and relevance
+                "experience": experience_match["experience_match"],
+                "relevance": experience_match["relevance_match"],
+                "education": education_score,
+                "certification": certification_match["certification_match_score"],
+                "cultural": cultural_fit["cultural_fit_score"],
+                "experience_bonus": 0.0,
+                "certification_bonus": 0.0,
+                "cultural_bonus": 0.0,
+                "market_bonus": 0.0,
+                "progression_bonus": 0.0,
+                "diversity_bonus": 0.0,
+                "gap_penalty": 0.0,
+                "switch_penalty": 0.0
+            }
             
             # Add bonus for having relevant experience
             if experience_match["relevant_years"] > 0:
-                experience_bonus = min(0.1, experience_match["relevant_years"] * 0.02)
-                overall_match = min(1.0, overall_match + experience_bonus)
+                components["experience_bonus"] = min(0.1, experience_match["relevant_years"] * 0.02)
             
             # Add bonus for having required certifications
             if certification_match["matching_certifications"]:
-                cert_bonus = min(0.05, len(certification_match["matching_certifications"]) * 0.01)
-                overall_match = min(1.0, overall_match + cert_bonus)
+                components["certification_bonus"] = min(0.05, len(certification_match["matching_certifications"]) * 0.01)
             
             # Add bonus for having high cultural fit
             if cultural_fit["cultural_fit_score"] > 0.7:
-                cultural_bonus = min(0.05, (cultural_fit["cultural_fit_score"] - 0.7) * 0.1)
-                overall_match = min(1.0, overall_match + cultural_bonus)
+                components["cultural_bonus"] = min(0.05, (cultural_fit["cultural_fit_score"] - 0.7) * 0.1)
             
             # Add bonus for having high market alignment
             if market_alignment > 0.7:
-                market_bonus = min(0.05, (market_alignment - 0.7) * 0.1)
-                overall_match = min(1.0, overall_match + market_bonus)
+                components["market_bonus"] = min(0.05, (market_alignment - 0.7) * 0.1)
             
             # Add bonus for having strong career progression
             if career_progression.get("has_upward_mobility", False):
-                progression_bonus = 0.05
-                overall_match = min(1.0, overall_match + progression_bonus)
+                components["progression_bonus"] = 0.05
             
             # Add bonus for having diverse skill set
-            if len(resume_data.skills) > len(job_requirement.required_skills):
-                diversity_bonus = min(0.05, (len(resume_data.skills) - len(job_requirement.required_skills)) * 0.01)
-                overall_match = min(1.0, overall_match + diversity_bonus)
+            if len(resume_data.skills) > profile.required_skill_count:
+                components["diversity_bonus"] = min(0.05, (len(resume_data.skills) - profile.required_skill_count) * 0.01)
             
             # Add penalty for employment gaps
             if career_progression.get("employment_gaps"):
-                gap_penalty = min(0.1, len(career_progression["employment_gaps"]) * 0.02)
-                overall_match = max(0.0, overall_match - gap_penalty)
+                components["gap_penalty"] = min(0.1, len(career_progression["employment_gaps"]) * 0.02)
             
             # Add penalty for frequent job switching
             if career_progression.get("job_switch_frequency", {}).get("frequency_tag") == "Frequent Switcher":
-                switch_penalty = 0.05
-                overall_match = max(0.0, overall_match - switch_penalty)
+                components["switch_penalty"] = 0.05
+            
+            # Calculate overall match (weighted average plus bonuses, minus penalties)
+            overall_match = float(combine_components(components, weights))
             
             # Calculate overall fitment score (different from overall match)
             # This considers skill proficiency, career progression, and cultural fit
@@ -1563,44 +1557,47 @@ class ResumeRanker:
             best_matched_roles = sorted(career_suggestions, key=lambda x: x.fitment_score, reverse=True)[:3]
             
             # Return the job match result
-            return JobMatch(
-                job_title=job_requirement.title,
-                match_score=overall_match,
-                matching_skills=skill_match["matching_required"] + skill_match["matching_preferred"],
-                missing_skills=skill_match["missing_required"] + skill_match["missing_preferred"],
-                experience_match=experience_match["experience_match"],
-                education_match=education_match["education_match"],
-                suggested_roles=[s.role_title for s in career_suggestions],
-                match_details={
-                    "skill_match": skill_match,
-                    "experience_match": experience_match,
-                    "education_match": education_match,
-                    "certification_match": certification_match,
-                    "cultural_fit": cultural_fit
-                },
-                overall_fitment_score=overall_fitment,
-                skill_fitment=skill_fitment,
-                career_path_suggestions=career_suggestions,
-                market_alignment_score=market_alignment,
-                strength_areas=strength_areas,
-                growth_opportunities=growth_opportunities[:5],  # Limit to top 5
-                best_matched_roles=best_matched_roles,
-                certification_match_score=certification_match["certification_match_score"],
-                matching_certifications=certification_match["matching_certifications"],
-                missing_certifications=certification_match["missing_certifications"],
-                cultural_fit_score=cultural_fit["cultural_fit_score"],
-                cultural_fit_details=cultural_fit["cultural_fit_details"],
-                company_values=cultural_fit["company_values"],
-                # Add career progression analysis results
-                career_progression=career_progression,
-                promotion_trajectory=career_progression["promotion_trajectory"],
-                job_switch_frequency=career_progression["job_switch_frequency"],
-                employment_gaps=career_progression["employment_gaps"],
-                # Add career forecast
-                career_forecast=career_forecast
-            )
+            with timed("rank.build_match"):
+                return JobMatch(
+                    job_title=job_requirement.title,
+                    match_score=overall_match,
+                    matching_skills=skill_match["matching_required"] + skill_match["matching_preferred"],
+                    missing_skills=skill_match["missing_required"] + skill_match["missing_preferred"],
+                    experience_match=experience_match["experience_match"],
+                    education_match=education_match["education_match"],
+                    suggested_roles=[s.role_title for s in career_suggestions],
+                    match_details={
+                        "skill_match": skill_match,
+                        "experience_match": experience_match,
+                        "education_match": education_match,
+                        "certification_match": certification_match,
+                        "cultural_fit": cultural_fit,
+                        "components": components
+                    },
+                    overall_fitment_score=overall_fitment,
+                    skill_fitment=skill_fitment,
+                    career_path_suggestions=career_suggestions,
+                    market_alignment_score=market_alignment,
+                    strength_areas=strength_areas,
+                    growth_opportunities=growth_opportunities[:5],  # Limit to top 5
+                    best_matched_roles=best_matched_roles,
+                    certification_match_score=certification_match["certification_match_score"],
+                    matching_certifications=certification_match["matching_certifications"],
+                    missing_certifications=certification_match["missing_certifications"],
+                    cultural_fit_score=cultural_fit["cultural_fit_score"],
+                    cultural_fit_details=cultural_fit["cultural_fit_details"],
+                    company_values=cultural_fit["company_values"],
+                    # Add career progression analysis results
+                    career_progression=career_progression,
+                    promotion_trajectory=career_progression["promotion_trajectory"],
+                    job_switch_frequency=career_progression["job_switch_frequency"],
+                    employment_gaps=career_progression["employment_gaps"],
+                    # Add career forecast
+                    career_forecast=career_forecast
+                )
         except Exception as e:
             logger.error(f"Error in ranking resume: {e}")
+            record_error("rank.resume")
             # Return a default job match with error details
             return JobMatch(
                 job_title=job_requirement.title,
@@ -1618,4 +1615,46 @@ class ResumeRanker:
                 strength_areas=[],
                 growth_opportunities=[],
                 best_matched_roles=[]
-            ) 
\ No newline at end of file
+            )
+    
+    def rank_resumes(self, resumes: List[ResumeData], job_requirement: JobRequirement,
+                     batch_size: int = DEFAULT_BATCH_SIZE, n_process: int = DEFAULT_N_PROCESS) -> List[JobMatch]:
+        """Rank several resumes, tokenizing all of them with one nlp.pipe call.
+        
+        Results are aligned with `resumes` (not sorted). The job profile is compiled
+        once up front and shared by every resume in the batch.
+        """
+        profile = None
+        try:
+            profile = self.job_profile(job_requirement)
+            with timed("rank.tokenize_batch"):
+                self._warm_documents(
+                    [self._cultural_text(resume) for resume in resumes],
+                    batch_size=batch_size,
+                    n_process=n_process
+                )
+        except Exception as e:
+            logger.error(f"Error in batched preprocessing, falling back to per-resume tokenization: {e}")
+            record_error("rank.tokenize_batch")
+        
+        matches = []
+        for resume in resumes:
+            with timed("rank.resume"):
+                matches.append(self.rank_resume(resume, job_requirement, profile))
+        return matches
+    
+    def score_components(self, resumes: List[ResumeData], job_requirement: JobRequirement) -> Dict[str, np.ndarray]:
+        """match_score and its cheap components for a batch, computed with the vectorized BatchScorer.
+        
+        Gives the same scores as rank_resume without building the JobMatch details
+        (career forecast, career paths, cultural fit explanations).
+        """
+        scorer = BatchScorer(self)
+        with timed("score.encode"):
+            batch = scorer.encode(resumes)
+        with timed("score.components"):
+            return scorer.score(batch, self.job_profile(job_requirement))
+    
+    def score_resumes(self, resumes: List[ResumeData], job_requirement: JobRequirement) -> np.ndarray:
+        """Overall match scores for a batch (see score_components)."""
+        return self.score_components(resumes, job_requirement)["match_score"]
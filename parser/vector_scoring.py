@@ -0,0 +1,342 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from models.response_model import ResumeData
+from parser.job_profile import JobProfile, combine_components, EDUCATION_LEVELS, SCORE_COMPONENTS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class Vocabulary:
+    """Term -> column mapping shared by candidate matrices; grows as new terms are seen."""
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self.index: Dict[str, int] = {}
+        for term in terms:
+            self.add(term)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def add(self, term: str) -> int:
+        column = self.index.get(term)
+        if column is None:
+            column = self.index[term] = len(self.index)
+        return column
+
+    def mask(self, terms: Iterable[str], size: int) -> np.ndarray:
+        """Indicator vector over the first `size` columns for the given terms."""
+        vector = np.zeros(size)
+        for term in terms:
+            column = self.index.get(term)
+            if column is not None and column < size:
+                vector[column] = 1.0
+        return vector
+
+
+def _binary_matrix(rows: List[List[int]], n_columns: int) -> sparse.csr_matrix:
+    """CSR matrix with a 1.0 at every (row, column) listed in rows."""
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(columns) for columns in rows])
+    indices = np.fromiter((column for columns in rows for column in columns), dtype=np.int64, count=int(indptr[-1]))
+    data = np.ones(len(indices))
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(rows), n_columns))
+    # Repeated columns (e.g. a skill listed twice) are summed into counts
+    matrix.sum_duplicates()
+    return matrix
+
+
+class CandidateBatch:
+    """Job-independent features of a batch of resumes.
+
+    Encoded once, then scored against any number of jobs. Skills are rows of a
+    sparse candidate x skill matrix over a shared vocabulary; everything that
+    needs per-entry parsing (experience relevance, career progression) is
+    reduced to one number per candidate at encoding time.
+    """
+
+    def __init__(self, n: int):
+        self.vocabulary: Optional[Vocabulary] = None        # Columns of the skills matrix
+        self.skills: Optional[sparse.csr_matrix] = None     # candidate x skill (lowercased, unique)
+        self.market: Optional[sparse.csr_matrix] = None     # candidate x market trend skill (counts)
+        self.skill_counts = np.zeros(n)                     # len(resume.skills), duplicates included
+        self.experience_counts = np.zeros(n)
+        self.total_years = np.zeros(n)
+        self.relevance_match = np.zeros(n)
+        self.education_level = np.zeros(n)
+        self.has_education = np.zeros(n, dtype=bool)
+        self.upward_mobility = np.zeros(n, dtype=bool)
+        self.gap_counts = np.zeros(n)
+        self.frequent_switcher = np.zeros(n, dtype=bool)
+        self.cultural_texts: Sequence[str] = [""] * n
+        self.certifications: Sequence[List[str]] = [[] for _ in range(n)]
+        # Candidates whose encoding failed get the scalar path's fallback score
+        self.valid = np.ones(n, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+
+class BatchScorer:
+    """Scores whole batches of resumes with sparse matrix operations.
+
+    Produces the same match_score as ResumeRanker.rank_resume (up to float
+    summation order for candidates listing several market trend skills), but
+    without building a JobMatch per candidate.
+    """
+
+    def __init__(self, ranker, vocabulary: Optional[Vocabulary] = None):
+        self.ranker = ranker
+        self.vocabulary = vocabulary or Vocabulary()
+
+        # Market relevance of trend skills; high-demand entries take precedence like in the scalar path
+        trends = dict(ranker.market_trends["emerging_skills"])
+        trends.update(ranker.market_trends["high_demand_skills"])
+        self.market_vocabulary = Vocabulary(trends)
+        relevance = np.array([trends[skill] for skill in self.market_vocabulary.index])
+        self.market_high = np.where(relevance >= 0.85, relevance, 0.0)
+        self.market_emerging = np.where((relevance >= 0.75) & (relevance < 0.85), relevance, 0.0)
+        self.market_high_mask = (relevance >= 0.85).astype(float)
+        self.market_emerging_mask = ((relevance >= 0.75) & (relevance < 0.85)).astype(float)
+
+    def encode(self, resumes: List[ResumeData], cultural: bool = True) -> CandidateBatch:
+        """Extract the job-independent features of a batch of resumes.
+
+        With cultural=False the cultural-fit texts (the only features needing
+        the spaCy pipeline) are left empty; such a batch cannot score cultural fit.
+        """
+        batch = CandidateBatch(len(resumes))
+        batch.vocabulary = self.vocabulary
+        skill_rows: List[List[int]] = []
+        market_rows: List[List[int]] = []
+
+        # Tokenize all cultural texts in one nlp.pipe call
+        if cultural:
+            try:
+                self.ranker._warm_documents([self.ranker._cultural_text(resume) for resume in resumes])
+            except Exception as e:
+                logger.error(f"Error in batched preprocessing, falling back to per-resume tokenization: {e}")
+
+        for i, resume in enumerate(resumes):
+            skill_row: List[int] = []
+            market_row: List[int] = []
+            try:
+                skill_row = [self.vocabulary.add(skill) for skill in set(s.lower() for s in resume.skills)]
+                market_row = [
+                    self.market_vocabulary.index[skill] for skill in resume.skills
+                    if skill in self.market_vocabulary.index
+                ]
+                batch.skill_counts[i] = len(resume.skills)
+                batch.certifications[i] = list(resume.certifications or [])
+                self._encode_experience(batch, i, resume)
+
+                if resume.education:
+                    batch.has_education[i] = True
+                    batch.education_level[i] = max(EDUCATION_LEVELS.get(edu.degree, 0) for edu in resume.education)
+
+                progression = self.ranker._analyze_career_progression(resume.experience)
+                batch.upward_mobility[i] = progression.get("has_upward_mobility", False)
+                batch.gap_counts[i] = len(progression.get("employment_gaps") or [])
+                batch.frequent_switcher[i] = (
+                    progression.get("job_switch_frequency", {}).get("frequency_tag") == "Frequent Switcher"
+                )
+                if cultural:
+                    batch.cultural_texts[i] = self.ranker._preprocess_text(self.ranker._cultural_text(resume))
+            except Exception as e:
+                logger.error(f"Error encoding resume {i} for batch scoring: {e}")
+                batch.valid[i] = False
+            skill_rows.append(skill_row)
+            market_rows.append(market_row)
+
+        batch.skills = _binary_matrix(skill_rows, len(self.vocabulary))
+        batch.market = _binary_matrix(market_rows, len(self.market_vocabulary))
+        return batch
+
+    def _encode_experience(self, batch: CandidateBatch, i: int, resume: ResumeData):
+        # Mirrors _calculate_experience_match_alt, which scores a failed calculation as no experience
+        if not resume.experience:
+            return
+        try:
+            relevance_scores = [self.ranker._experience_relevance(exp) for exp in resume.experience]
+            total_years = 0
+            for exp in resume.experience:
+                total_years += self.ranker._reported_duration(exp)
+            batch.experience_counts[i] = len(resume.experience)
+            batch.total_years[i] = total_years
+            batch.relevance_match[i] = sum(relevance_scores) / len(relevance_scores)
+        except Exception as e:
+            logger.error(f"Error in alternative experience match calculation: {e}")
+
+    def _skill_match(self, batch: CandidateBatch, profile: JobProfile) -> Dict[str, np.ndarray]:
+        vocabulary = batch.vocabulary or self.vocabulary
+        n_columns = batch.skills.shape[1]
+        n_required = len(profile.required_skills)
+        n_preferred = len(profile.preferred_skills)
+        matched_required = batch.skills @ vocabulary.mask(profile.required_skills, n_columns)
+        matched_preferred = batch.skills @ vocabulary.mask(profile.preferred_skills, n_columns)
+
+        def coverage(matched: np.ndarray, total: int, max_bonus: float) -> np.ndarray:
+            if not total:
+                return np.zeros(len(matched))
+            base = matched / total
+            # Bonus for having more than half of the listed skills
+            bonus = np.minimum(max_bonus, (matched - total * 0.5) * 0.1)
+            return np.where(matched > total * 0.5, np.minimum(1.0, base + bonus), base)
+
+        required_match = coverage(matched_required, n_required, 0.2)
+        preferred_match = coverage(matched_preferred, n_preferred, 0.15)
+        overall_match = (required_match * 0.8) + (preferred_match * 0.2)
+
+        # Bonus for having a diverse skill set
+        total_skills = np.diff(batch.skills.indptr).astype(float)
+        listed = n_required + n_preferred
+        diversity_bonus = np.minimum(0.1, (total_skills - listed) * 0.02)
+        overall_match = np.where(total_skills > listed, np.minimum(1.0, overall_match + diversity_bonus), overall_match)
+
+        return {"required_match": required_match, "preferred_match": preferred_match, "overall_match": overall_match}
+
+    def _cultural_fit(self, batch: CandidateBatch, profile: JobProfile) -> np.ndarray:
+        n = len(batch)
+        if not profile.cultural_values:
+            return np.zeros(n)
+
+        matcher = profile.cultural_matcher
+        columns = matcher.canonical_order
+        hits = _binary_matrix(
+            [[columns[keyword] for keyword in matcher.matches(text)] for text in batch.cultural_texts],
+            len(columns)
+        )
+
+        # One column per company value: the value itself, and how many of its related keywords occur
+        direct_rows, related_rows, related_cols = [], [], []
+        for j, cultural_value in enumerate(profile.cultural_values):
+            direct_rows.append(columns[cultural_value.value_lower])
+            for keyword_lower in cultural_value.related_lower:
+                related_rows.append(columns[keyword_lower])
+                related_cols.append(j)
+        n_values = len(profile.cultural_values)
+        direct_map = sparse.csr_matrix(
+            (np.ones(n_values), (direct_rows, np.arange(n_values))), shape=(len(columns), n_values)
+        )
+        related_map = sparse.csr_matrix(
+            (np.ones(len(related_rows)), (related_rows, related_cols)), shape=(len(columns), n_values)
+        )
+        direct = (hits @ direct_map).toarray() > 0
+        related_counts = (hits @ related_map).toarray()
+
+        # Direct match gives 0.8, related keywords add up to 0.2 more
+        total = np.zeros(n)
+        for j, cultural_value in enumerate(profile.cultural_values):
+            keyword_score = np.minimum(0.2, (related_counts[:, j] / len(cultural_value.related_keywords)) * 0.2)
+            value_score = np.where(direct[:, j], 0.8, 0.0) + np.where(related_counts[:, j] > 0, keyword_score, 0.0)
+            total = total + value_score
+        return total / n_values
+
+    def _market_alignment(self, batch: CandidateBatch) -> np.ndarray:
+        high_count = batch.market @ self.market_high_mask
+        emerging_count = batch.market @ self.market_emerging_mask
+        high_score = (batch.market @ self.market_high) * 0.7
+        emerging_score = (batch.market @ self.market_emerging) * 0.3
+        count = high_count + emerging_count
+        return np.where(count > 0, (high_score + emerging_score) / np.maximum(count, 1.0), 0.0)
+
+    def _experience(self, batch: CandidateBatch, profile: JobProfile) -> np.ndarray:
+        # Years reported on each entry, as in _calculate_experience_match_alt
+        has_experience = batch.experience_counts > 0
+        if profile.experience_years <= 0:
+            return np.where(has_experience, 1.0, 0.0)
+        return np.where(has_experience, np.minimum(1.0, batch.total_years / profile.experience_years), 0.0)
+
+    def _education(self, batch: CandidateBatch, profile: JobProfile) -> np.ndarray:
+        education_match = batch.has_education & (batch.education_level >= profile.required_education_value)
+        return np.where(education_match, 1.0, 0.5)
+
+    def _certifications(self, batch: CandidateBatch, profile: JobProfile) -> Dict[str, np.ndarray]:
+        # Certifications depend on substring matches between free-form names, so they are matched per candidate
+        n = len(batch)
+        certification_score = np.zeros(n)
+        certification_matches = np.zeros(n)
+        for i, certifications in enumerate(batch.certifications):
+            certification = self.ranker._calculate_certification_match(
+                certifications, profile.required_certifications, profile=profile
+            )
+            certification_score[i] = certification["certification_match_score"]
+            certification_matches[i] = len(certification["matching_certifications"])
+        return {
+            "certification": certification_score,
+            "certification_bonus": np.where(certification_matches > 0, np.minimum(0.05, certification_matches * 0.01), 0.0)
+        }
+
+    def _cultural(self, batch: CandidateBatch, profile: JobProfile) -> Dict[str, np.ndarray]:
+        cultural_fit = self._cultural_fit(batch, profile)
+        return {
+            "cultural": cultural_fit,
+            "cultural_bonus": np.where(cultural_fit > 0.7, np.minimum(0.05, (cultural_fit - 0.7) * 0.1), 0.0)
+        }
+
+    def _diversity_bonus(self, batch: CandidateBatch, profile: JobProfile) -> np.ndarray:
+        required_count = profile.required_skill_count
+        return np.where(batch.skill_counts > required_count,
+                        np.minimum(0.05, (batch.skill_counts - required_count) * 0.01), 0.0)
+
+    def score(self, batch: CandidateBatch, profile: JobProfile) -> Dict[str, np.ndarray]:
+        """Score components and overall match_score of every candidate in the batch."""
+        skill_match = self._skill_match(batch, profile)
+        relevance_match = batch.relevance_match
+        relevant_years = batch.total_years * relevance_match
+        market_alignment = self._market_alignment(batch)
+
+        # Raw components (see parser/job_profile.py), combined exactly like in rank_resume
+        components = {
+            "skill": skill_match["overall_match"],
+            "experience": self._experience(batch, profile),
+            "relevance": relevance_match,
+            "education": self._education(batch, profile),
+            **self._certifications(batch, profile),
+            **self._cultural(batch, profile),
+            # Bonuses
+            "experience_bonus": np.where(relevant_years > 0, np.minimum(0.1, relevant_years * 0.02), 0.0),
+            "market_bonus": np.where(market_alignment > 0.7, np.minimum(0.05, (market_alignment - 0.7) * 0.1), 0.0),
+            "progression_bonus": np.where(batch.upward_mobility, 0.05, 0.0),
+            "diversity_bonus": self._diversity_bonus(batch, profile),
+            # Penalties
+            "gap_penalty": np.where(batch.gap_counts > 0, np.minimum(0.1, batch.gap_counts * 0.02), 0.0),
+            "switch_penalty": np.where(batch.frequent_switcher, 0.05, 0.0)
+        }
+        components = {name: components[name] for name in SCORE_COMPONENTS}
+        overall = combine_components(components, profile.weights)
+
+        # Same fallback score as rank_resume when a candidate could not be processed
+        overall = np.where(batch.valid, overall, 0.5)
+
+        return {
+            "match_score": overall,
+            **components,
+            "required_match": skill_match["required_match"],
+            "preferred_match": skill_match["preferred_match"],
+            "market_alignment": market_alignment,
+            "valid": batch.valid
+        }
+
+    def update(self, batch: CandidateBatch, profile: JobProfile, components: Dict[str, np.ndarray],
+               names: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Recompute only the named score components for a changed job, reusing the others."""
+        names = set(names)
+        updated = dict(components)
+        if "skill" in names:
+            updated["skill"] = self._skill_match(batch, profile)["overall_match"]
+        if "diversity_bonus" in names:
+            updated["diversity_bonus"] = self._diversity_bonus(batch, profile)
+        if "experience" in names:
+            updated["experience"] = self._experience(batch, profile)
+        if "education" in names:
+            updated["education"] = self._education(batch, profile)
+        if names & {"certification", "certification_bonus"}:
+            updated.update(self._certifications(batch, profile))
+        if names & {"cultural", "cultural_bonus"}:
+            updated.update(self._cultural(batch, profile))
+        return updated
@@ -0,0 +1,327 @@
+import json
+import logging
+import os
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from models.job_model import JobRequirement
+from models.response_model import ResumeData
+from services.semantic_index import job_text, resume_text
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Dimension of the dense candidate vectors
+VECTOR_DIM = 256
+
+# Bump when the embedding changes, so persisted vectors are rebuilt
+INDEX_FORMAT = "1"
+
+# Candidates fetched from the store per query while building the index
+_BUILD_BATCH = 500
+
+# Feature hashing projects bag-of-words counts onto VECTOR_DIM signed buckets. It needs no fitting,
+# so vectors stay comparable across inserts, restarts and retraining.
+_hasher = HashingVectorizer(
+    n_features=VECTOR_DIM, ngram_range=(1, 2), stop_words="english", alternate_sign=True, norm="l2"
+)
+
+
+def embed_texts(texts: List[str]) -> np.ndarray:
+    """Unit-length float32 vectors of the given texts."""
+    if not texts:
+        return np.zeros((0, VECTOR_DIM), dtype=np.float32)
+    return _hasher.transform(texts).toarray().astype(np.float32)
+
+
+def _kmeans(vectors: np.ndarray, n_clusters: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Spherical k-means centroids (unit length) of unit vectors."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        for cluster in range(n_clusters):
+            members = vectors[assignments == cluster]
+            if len(members):
+                centroids[cluster] = members.sum(axis=0)
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        centroids = centroids / np.where(norms > 0, norms, 1.0)
+    return centroids.astype(np.float32)
+
+
+class AnnIndex:
+    """Inverted-file (IVF) approximate nearest-neighbour index of candidate vectors.
+
+    Vectors live in a memory-mapped float32 file that grows as candidates are
+    inserted; metadata (candidate ids, centroids, list assignments) is saved
+    next to it. Until the index holds train_size vectors every search is
+    exact. After training, vectors are bucketed under their nearest k-means
+    centroid and a search only scans the nprobe closest lists. Deleted
+    candidates are tombstoned; a retrain (once the pool has grown by
+    retrain_growth) rebuilds the lists without them.
+    """
+
+    def __init__(self, directory: Optional[str] = None, nprobe: int = 16, train_size: int = 1024,
+                 retrain_growth: float = 1.0):
+        self.directory = directory
+        self.nprobe = nprobe
+        self.train_size = train_size
+        self.retrain_growth = retrain_growth
+        self._lock = threading.Lock()
+
+        self._vectors = np.zeros((0, VECTOR_DIM), dtype=np.float32)  # memmap once persisted
+        self._count = 0
+        self.candidate_ids: List[Optional[str]] = []  # Vector row -> candidate id (None when deleted)
+        self._alive = bytearray()                     # Vector row -> 1 while its candidate is indexed
+        self._rows: Dict[str, int] = {}
+        self.centroids: Optional[np.ndarray] = None
+        self._assignments = array("i")                # Vector row -> list (-1 before training)
+        self._lists: List[array] = []
+        self.trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self._rows
+
+    @property
+    def needs_training(self) -> bool:
+        if self.centroids is None:
+            return len(self._rows) >= self.train_size
+        return len(self._rows) > self.trained_size * (1 + self.retrain_growth)
+
+    def _vectors_path(self) -> str:
+        return os.path.join(self.directory, "vectors.f32")
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    def _reserve(self, rows: int):
+        """Make room for `rows` vectors, doubling the (memory-mapped) capacity when needed."""
+        capacity = len(self._vectors)
+        if rows <= capacity:
+            return
+        capacity = max(rows, capacity * 2, 1024)
+        if self.directory is None:
+            grown = np.zeros((capacity, VECTOR_DIM), dtype=np.float32)
+            grown[:self._count] = self._vectors[:self._count]
+            self._vectors = grown
+            return
+        if isinstance(self._vectors, np.memmap):
+            self._vectors.flush()
+        with open(self._vectors_path(), "ab") as f:
+            f.truncate(capacity * VECTOR_DIM * 4)
+        self._vectors = np.memmap(self._vectors_path(), dtype=np.float32, mode="r+", shape=(capacity, VECTOR_DIM))
+
+    def add_many(self, candidates: List[Tuple[str, ResumeData]]):
+        """Insert (or replace) candidates."""
+        vectors = embed_texts([resume_text(resume_data) for _, resume_data in candidates])
+        with self._lock:
+            self._reserve(self._count + len(candidates))
+            for (candidate_id, _), vector in zip(candidates, vectors):
+                self._remove(candidate_id)
+                row = self._count
+                self._vectors[row] = vector
+                self._count += 1
+                self.candidate_ids.append(candidate_id)
+                self._alive.append(1)
+                self._rows[candidate_id] = row
+                if self.centroids is None:
+                    self._assignments.append(-1)
+                else:
+                    cluster = int(np.argmax(self.centroids @ vector))
+                    self._assignments.append(cluster)
+                    self._lists[cluster].append(row)
+
+    def add(self, candidate_id: str, resume_data: ResumeData):
+        self.add_many([(candidate_id, resume_data)])
+
+    def remove(self, candidate_id: str) -> bool:
+        with self._lock:
+            return self._remove(candidate_id)
+
+    def _remove(self, candidate_id: str) -> bool:
+        row = self._rows.pop(candidate_id, None)
+        if row is None:
+            return False
+        self.candidate_ids[row] = None
+        self._alive[row] = 0
+        return True
+
+    def train(self, n_lists: Optional[int] = None, sample_size: int = 20000):
+        """Cluster the live vectors and rebuild the inverted lists (and drop tombstones)."""
+        with self._lock:
+            live_rows = np.array(sorted(self._rows.values()), dtype=np.int64)
+            if len(live_rows) == 0:
+                return
+            vectors = np.asarray(self._vectors[live_rows])
+            candidate_ids = [self.candidate_ids[row] for row in live_rows]
+
+        n_lists = n_lists or max(1, int(np.sqrt(len(vectors))))
+        rng = np.random.default_rng(0)
+        sample = vectors[rng.choice(len(vectors), min(sample_size, len(vectors)), replace=False)]
+        centroids = _kmeans(sample, min(n_lists, len(sample)))
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+
+        with self._lock:
+            # Skip candidates deleted or replaced while training; those inserted meanwhile go after the rest
+            keep = [
+                i for i, (candidate_id, row) in enumerate(zip(candidate_ids, live_rows))
+                if self._rows.get(candidate_id) == row
+            ]
+            inserted = [
+                (candidate_id, np.array(self._vectors[row]))
+                for candidate_id, row in self._rows.items() if row > live_rows[-1]
+            ]
+
+            self._count = 0
+            self.candidate_ids = []
+            self._alive = bytearray()
+            self._rows = {}
+            self.centroids = centroids
+            self._assignments = array("i")
+            self._lists = [array("i") for _ in range(len(centroids))]
+            for i in keep:
+                self._append_trained(candidate_ids[i], vectors[i], int(assignments[i]))
+            for candidate_id, vector in inserted:
+                self._append_trained(candidate_id, vector, int(np.argmax(centroids @ vector)))
+            self.trained_size = len(self._rows)
+        logger.info(f"Trained ANN index: {len(centroids)} lists over {self.trained_size} candidates")
+
+    def _append_trained(self, candidate_id: str, vector: np.ndarray, cluster: int):
+        row = self._count
+        self._vectors[row] = vector
+        self._count += 1
+        self.candidate_ids.append(candidate_id)
+        self._alive.append(1)
+        self._rows[candidate_id] = row
+        self._assignments.append(cluster)
+        self._lists[cluster].append(row)
+
+    def search(self, job_requirement: JobRequirement, limit: int = 20,
+               nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Approximate nearest candidates to the job (cosine similarity), best first."""
+        query = embed_texts([job_text(job_requirement)])[0]
+        with self._lock:
+            if self.centroids is None:
+                rows = np.arange(self._count)
+            else:
+                # Scan only the lists whose centroids are closest to the query
+                probe = min(nprobe or self.nprobe, len(self.centroids))
+                closest = np.argpartition(-(self.centroids @ query), probe - 1)[:probe]
+                rows = np.concatenate([np.frombuffer(self._lists[cluster], dtype=np.int32) for cluster in closest])
+            rows = rows[np.frombuffer(self._alive, dtype=np.uint8)[rows].astype(bool)]
+            if len(rows) == 0:
+                return []
+            scores = np.asarray(self._vectors[rows]) @ query
+            if len(rows) > limit:
+                best = np.argpartition(-scores, limit - 1)[:limit]
+                rows, scores = rows[best], scores[best]
+            order = np.argsort(-scores, kind="stable")
+            return [(self.candidate_ids[rows[i]], float(scores[i])) for i in order]
+
+    def save(self):
+        """Flush the vectors and write the metadata (no-op for an in-memory index)."""
+        if self.directory is None:
+            return
+        with self._lock:
+            if isinstance(self._vectors, np.memmap):
+                self._vectors.flush()
+            meta = {
+                "format": INDEX_FORMAT,
+                "dim": VECTOR_DIM,
+                "count": self._count,
+                "candidate_ids": self.candidate_ids,
+                "assignments": self._assignments.tolist(),
+                "centroids": self.centroids.tolist() if self.centroids is not None else None,
+                "trained_size": self.trained_size
+            }
+        tmp_path = self._meta_path() + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path())
+
+    def _load(self) -> bool:
+        """Map the persisted vectors and metadata; False when missing, stale or unreadable."""
+        try:
+            with open(self._meta_path(), encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Discarding unreadable ANN index metadata: {e}")
+            return False
+        if meta.get("format") != INDEX_FORMAT or meta.get("dim") != VECTOR_DIM:
+            return False
+
+        if not os.path.exists(self._vectors_path()):
+            return False
+        capacity = os.path.getsize(self._vectors_path()) // (VECTOR_DIM * 4)
+        if capacity < meta["count"]:
+            logger.warning("ANN index vectors file is shorter than its metadata, rebuilding")
+            return False
+        self._vectors = np.memmap(self._vectors_path(), dtype=np.float32, mode="r+", shape=(capacity, VECTOR_DIM))
+        self._count = meta["count"]
+        self.candidate_ids = meta["candidate_ids"]
+        self._alive = bytearray(candidate_id is not None for candidate_id in self.candidate_ids)
+        self._rows = {
+            candidate_id: row for row, candidate_id in enumerate(self.candidate_ids) if candidate_id is not None
+        }
+        self._assignments = array("i", meta["assignments"])
+        if meta["centroids"] is not None:
+            self.centroids = np.array(meta["centroids"], dtype=np.float32)
+            self._lists = [array("i") for _ in range(len(self.centroids))]
+            for row, cluster in enumerate(self._assignments):
+                self._lists[cluster].append(row)
+        self.trained_size = meta["trained_size"]
+        return True
+
+    def sync_with_store(self, store):
+        """Insert candidates stored since the index was saved and drop deleted ones."""
+        stored_ids = store.ids()
+        stored = set(stored_ids)
+        for candidate_id in [candidate_id for candidate_id in self._rows if candidate_id not in stored]:
+            self.remove(candidate_id)
+        missing = [candidate_id for candidate_id in stored_ids if candidate_id not in self._rows]
+        for start in range(0, len(missing), _BUILD_BATCH):
+            candidates = store.get_many(missing[start:start + _BUILD_BATCH])
+            self.add_many([
+                (candidate.candidate_id, candidate.resume_data) for candidate in candidates if candidate is not None
+            ])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "candidates": len(self._rows),
+                "rows": self._count,
+                "lists": len(self.centroids) if self.centroids is not None else 0,
+                "trained_size": self.trained_size,
+                "nprobe": self.nprobe,
+                "directory": self.directory
+            }
+
+
+def create_ann_index(store) -> Optional[AnnIndex]:
+    """Open the persisted ANN index (ANN_INDEX_DIR) and catch it up with the candidate store."""
+    if store is None:
+        return None
+    directory = os.getenv("ANN_INDEX_DIR", "ann_index") or None
+    index = AnnIndex(
+        directory,
+        nprobe=int(os.getenv("ANN_NPROBE", "16")),
+        train_size=int(os.getenv("ANN_TRAIN_SIZE", "1024"))
+    )
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+        if not index._load() and os.path.exists(index._vectors_path()):
+            os.remove(index._vectors_path())
+    index.sync_with_store(store)
+    if index.needs_training:
+        index.train()
+    index.save()
+    return index
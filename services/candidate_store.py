@@ -0,0 +1,223 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from models.response_model import ResumeData
+from parser.extract_entities import PARSER_VERSION
+from services.parse_cache import content_hash
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of bound parameters per statement
+_SQLITE_BATCH = 500
+
+
+class CandidateSummary(BaseModel):
+    candidate_id: str
+    name: str
+    filename: Optional[str] = None
+    content_hash: str
+    parser_version: str
+    created_at: float
+
+
+class StoredCandidate(CandidateSummary):
+    resume_data: ResumeData
+
+    def summary(self) -> CandidateSummary:
+        return CandidateSummary(**self.dict(exclude={"resume_data"}))
+
+
+def _new_candidate(content_hash: str, resume_data: ResumeData, filename: Optional[str],
+                   parser_version: str, candidate_id: Optional[str] = None,
+                   created_at: Optional[float] = None) -> StoredCandidate:
+    candidate_id = candidate_id or uuid.uuid4().hex
+    resume_data = resume_data.copy(update={"candidate_id": candidate_id})
+    return StoredCandidate(
+        candidate_id=candidate_id,
+        name=resume_data.name,
+        filename=filename,
+        content_hash=content_hash,
+        parser_version=parser_version,
+        created_at=created_at or time.time(),
+        resume_data=resume_data
+    )
+
+
+class InMemoryCandidateStore:
+    """Candidates kept in process memory (lost on restart)."""
+
+    def __init__(self):
+        self._candidates: "OrderedDict[str, StoredCandidate]" = OrderedDict()
+        self._by_hash: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def add(self, content_hash: str, resume_data: ResumeData, filename: Optional[str] = None,
+            parser_version: str = PARSER_VERSION) -> StoredCandidate:
+        """Store a parsed resume; the same file content always maps to the same candidate id."""
+        with self._lock:
+            existing = self._candidates.get(self._by_hash.get(content_hash, ""))
+            candidate = _new_candidate(
+                content_hash, resume_data, filename, parser_version,
+                candidate_id=existing.candidate_id if existing else None,
+                created_at=existing.created_at if existing else None
+            )
+            self._candidates[candidate.candidate_id] = candidate
+            self._by_hash[content_hash] = candidate.candidate_id
+            return candidate
+
+    def get(self, candidate_id: str) -> Optional[StoredCandidate]:
+        return self._candidates.get(candidate_id)
+
+    def get_many(self, candidate_ids: List[str]) -> List[Optional[StoredCandidate]]:
+        return [self._candidates.get(candidate_id) for candidate_id in candidate_ids]
+
+    def list(self, limit: int = 100, offset: int = 0) -> List[CandidateSummary]:
+        candidates = list(self._candidates.values())[offset:offset + limit]
+        return [candidate.summary() for candidate in candidates]
+
+    def ids(self) -> List[str]:
+        return list(self._candidates)
+
+    def delete(self, candidate_id: str) -> bool:
+        with self._lock:
+            candidate = self._candidates.pop(candidate_id, None)
+            if candidate is None:
+                return False
+            self._by_hash.pop(candidate.content_hash, None)
+            return True
+
+    def count(self) -> int:
+        return len(self._candidates)
+
+    def stats(self) -> Dict[str, Any]:
+        stale = sum(1 for candidate in self._candidates.values() if candidate.parser_version != PARSER_VERSION)
+        return {"candidates": len(self._candidates), "stale_parser_version": stale}
+
+
+class SQLiteCandidateStore:
+    """Candidates persisted in a SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS candidates ("
+            "candidate_id TEXT PRIMARY KEY, content_hash TEXT NOT NULL UNIQUE, parser_version TEXT NOT NULL, "
+            "name TEXT NOT NULL, filename TEXT, created_at REAL NOT NULL, payload TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def add(self, content_hash: str, resume_data: ResumeData, filename: Optional[str] = None,
+            parser_version: str = PARSER_VERSION) -> StoredCandidate:
+        """Store a parsed resume; the same file content always maps to the same candidate id."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT candidate_id, created_at FROM candidates WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+            candidate = _new_candidate(
+                content_hash, resume_data, filename, parser_version,
+                candidate_id=row[0] if row else None,
+                created_at=row[1] if row else None
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO candidates "
+                "(candidate_id, content_hash, parser_version, name, filename, created_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (candidate.candidate_id, content_hash, parser_version, candidate.name, filename,
+                 candidate.created_at, candidate.resume_data.json())
+            )
+            self._conn.commit()
+            return candidate
+
+    @staticmethod
+    def _from_row(row) -> StoredCandidate:
+        candidate_id, content_hash, parser_version, name, filename, created_at, payload = row
+        return StoredCandidate(
+            candidate_id=candidate_id,
+            name=name,
+            filename=filename,
+            content_hash=content_hash,
+            parser_version=parser_version,
+            created_at=created_at,
+            resume_data=ResumeData.parse_raw(payload)
+        )
+
+    def get(self, candidate_id: str) -> Optional[StoredCandidate]:
+        return self.get_many([candidate_id])[0]
+
+    def get_many(self, candidate_ids: List[str]) -> List[Optional[StoredCandidate]]:
+        found: Dict[str, StoredCandidate] = {}
+        unique_ids = list(dict.fromkeys(candidate_ids))
+        with self._lock:
+            for start in range(0, len(unique_ids), _SQLITE_BATCH):
+                batch = unique_ids[start:start + _SQLITE_BATCH]
+                rows = self._conn.execute(
+                    "SELECT candidate_id, content_hash, parser_version, name, filename, created_at, payload "
+                    f"FROM candidates WHERE candidate_id IN ({', '.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+                for row in rows:
+                    found[row[0]] = self._from_row(row)
+        return [found.get(candidate_id) for candidate_id in candidate_ids]
+
+    def list(self, limit: int = 100, offset: int = 0) -> List[CandidateSummary]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT candidate_id, name, filename, content_hash, parser_version, created_at "
+                "FROM candidates ORDER BY created_at LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+        return [
+            CandidateSummary(candidate_id=row[0], name=row[1], filename=row[2], content_hash=row[3],
+                             parser_version=row[4], created_at=row[5])
+            for row in rows
+        ]
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT candidate_id FROM candidates ORDER BY created_at")]
+
+    def delete(self, candidate_id: str) -> bool:
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM candidates WHERE candidate_id = ?", (candidate_id,)).rowcount
+            self._conn.commit()
+        return bool(deleted)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total, stale = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(parser_version != ?), 0) FROM candidates", (PARSER_VERSION,)
+            ).fetchone()
+        return {"candidates": total, "stale_parser_version": stale, "path": self.path}
+
+
+def store_upload(store, contents: bytes, resume_data: ResumeData, filename: Optional[str] = None) -> StoredCandidate:
+    """Store the parse result of an uploaded file, keyed by the file's content hash."""
+    return store.add(content_hash(contents), resume_data, filename)
+
+
+def create_candidate_store():
+    """Build the candidate store configured by CANDIDATE_STORE_BACKEND (sqlite, memory or none)."""
+    backend_name = os.getenv("CANDIDATE_STORE_BACKEND", "sqlite").lower()
+
+    if backend_name == "none":
+        return None
+    if backend_name == "memory":
+        return InMemoryCandidateStore()
+    if backend_name != "sqlite":
+        logger.warning(f"Unknown CANDIDATE_STORE_BACKEND '{backend_name}', using SQLite")
+    return SQLiteCandidateStore(os.getenv("CANDIDATE_STORE_PATH", "candidates.sqlite3"))
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+
+from services.metrics import call_and_flush, counter
+from services.profiling import current_profile, profile_call
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def env_int(name: str, default: int) -> int:
+    """Read a positive integer setting from the environment."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning(f"Invalid value '{value}' for {name}, using {default}")
+        return default
+
+
+ENDPOINT_REJECTIONS = counter("endpoint_rejected_requests_total", "Requests answered 429 because an endpoint was at capacity",
+                              ["endpoint"])
+
+
+class ServerBusyError(Exception):
+    """Raised when an endpoint has no free slot and its wait queue is full."""
+
+    def __init__(self, endpoint: str, retry_after: int):
+        super().__init__(f"{endpoint} is at capacity, retry after {retry_after}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class TrackedExecutor:
+    """Lazily created executor that keeps queue-depth counters."""
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        self.name = name
+        self._factory = factory
+        self._executor = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    logger.info(f"Starting {self.name} executor")
+                    self._executor = self._factory()
+        return self._executor
+
+    def submit(self, fn: Callable, *args):
+        """Submit work and return a concurrent.futures.Future."""
+        with self._lock:
+            self.pending += 1
+            self.submitted += 1
+        # Work for a profiled request is sampled wherever it runs (see services/profiling.py)
+        profile = current_profile()
+        if profile is not None:
+            fn, args = profile_call, (profile.id, profile.directory, profile.interval, fn) + args
+        # Worker processes publish their stage timings and counters after every task (see services/metrics.py)
+        future = self.executor.submit(call_and_flush, fn, *args)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future):
+        with self._lock:
+            self.pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    async def run(self, fn: Callable, *args):
+        """Run work on the executor without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": self.pending,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+class EndpointLimiter:
+    """Caps concurrent and queued requests for one endpoint."""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.active = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.avg_seconds = 1.0  # Moving average of request duration
+
+    @classmethod
+    def from_env(cls, name: str, max_concurrency: int, max_queue: int) -> "EndpointLimiter":
+        """Build a limiter whose limits can be overridden with <NAME>_MAX_CONCURRENCY / <NAME>_MAX_QUEUE."""
+        prefix = name.upper().replace("-", "_")
+        return cls(
+            name,
+            env_int(f"{prefix}_MAX_CONCURRENCY", max_concurrency),
+            env_int(f"{prefix}_MAX_QUEUE", max_queue)
+        )
+
+    def _retry_after(self) -> int:
+        # Rough time until a slot frees up for a request joining the back of the queue
+        backlog = (self.waiting + 1) / self.max_concurrency
+        return max(1, math.ceil(self.avg_seconds * backlog))
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the endpoint's slots, rejecting the request if the queue is full."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.active >= self.max_concurrency and self.waiting >= self.max_queue:
+            self.rejected += 1
+            ENDPOINT_REJECTIONS.inc(endpoint=self.name)
+            raise ServerBusyError(self.name, self._retry_after())
+
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.avg_seconds = 0.8 * self.avg_seconds + 0.2 * elapsed
+            self.active -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "avg_seconds": round(self.avg_seconds, 4)
+        }
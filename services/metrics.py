@@ -0,0 +1,374 @@
+import glob
+import json
+import logging
+import math
+import os
+import shutil
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# METRICS_ENABLED=0 turns every timer and counter into a no-op
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1").lower() not in ("0", "false", "no")
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Worker processes write their samples to <METRICS_MULTIPROC_DIR>/<pid>.json, the owner process adds them up
+MULTIPROCESS_DIR_ENV = "METRICS_MULTIPROC_DIR"
+_OWNER_PID_ENV = "METRICS_OWNER_PID"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values = {}
+
+    def samples(self) -> Dict[Tuple[str, ...], Any]:
+        """Copy of the current value of every label set."""
+        with self._lock:
+            return {key: self._copy(value) for key, value in self._values.items()}
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+    @staticmethod
+    def merge(left, right):
+        return left + right
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. cache hits or substituted defaults."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Value sampled when the metrics are collected, e.g. queue depth."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (per-bucket counts, sum and count), e.g. stage latency."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        if METRICS_ENABLED:
+            self._observe(self._key(labels), value)
+
+    def _observe(self, key: Tuple[str, ...], value: float):
+        # [count per bucket (last one is +Inf, not cumulative)..., sum, count]
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def time(self, **labels) -> "_Timer":
+        """Context manager observing the time spent in its block."""
+        if not METRICS_ENABLED:
+            return _NULL_TIMER
+        return _Timer(self, self._key(labels))
+
+    @staticmethod
+    def _copy(value):
+        return list(value)
+
+    @staticmethod
+    def merge(left, right):
+        return [a + b for a, b in zip(left, right)]
+
+
+class _Timer:
+    __slots__ = ("histogram", "key", "start")
+
+    def __init__(self, histogram: Optional[Histogram], key: Tuple[str, ...]):
+        self.histogram = histogram
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.histogram is not None:
+            self.histogram._observe(self.key, time.perf_counter() - self.start)
+        return False
+
+
+_NULL_TIMER = _Timer(None, ())
+
+
+class Registry:
+    """Metrics of this process, plus those flushed to disk by worker processes."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered with another type or labels")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def clear(self):
+        """Drop every sample (a forked worker must not report its parent's samples as its own)."""
+        for metric in list(self._metrics.values()):
+            metric.clear()
+
+    def _local_samples(self) -> Dict[str, Dict[Tuple[str, ...], Any]]:
+        return {name: metric.samples() for name, metric in list(self._metrics.items())}
+
+    def flush(self):
+        """Write this worker process's samples where the owner process collects them (no-op in the owner)."""
+        directory = os.getenv(MULTIPROCESS_DIR_ENV)
+        if not directory or not METRICS_ENABLED or os.getenv(_OWNER_PID_ENV) == str(os.getpid()):
+            return
+        state = {
+            name: [[list(key), value] for key, value in samples.items()]
+            for name, samples in self._local_samples().items() if samples
+        }
+        path = os.path.join(directory, f"{os.getpid()}.json")
+        try:
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            logger.warning(f"Could not write worker metrics to {path}: {e}")
+
+    def collect(self) -> Dict[str, Dict[Tuple[str, ...], Any]]:
+        """Samples of this process merged with the latest ones flushed by every worker process."""
+        merged = self._local_samples()
+        directory = os.getenv(MULTIPROCESS_DIR_ENV)
+        if not directory:
+            return merged
+        for path in glob.glob(os.path.join(directory, "*.json")):
+            if os.path.basename(path) == f"{os.getpid()}.json":
+                continue
+            try:
+                with open(path, encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable worker metrics {path}: {e}")
+                continue
+            for name, samples in state.items():
+                metric = self._metrics.get(name)
+                if metric is None:
+                    continue
+                target = merged.setdefault(name, {})
+                for key, value in samples:
+                    key = tuple(key)
+                    target[key] = metric.merge(target[key], value) if key in target else value
+        return merged
+
+    def exposition(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        collected = self.collect()
+        lines: List[str] = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for key, value in sorted(collected.get(name, {}).items()):
+                if isinstance(metric, Histogram):
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets + (math.inf,), value):
+                        cumulative += count
+                        le = f'le="{_format_value(bound)}"'
+                        lines.append(f"{name}_bucket{_labels(metric.labelnames, key, le)} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(metric.labelnames, key)} {_format_value(value[-2])}")
+                    lines.append(f"{name}_count{_labels(metric.labelnames, key)} {value[-1]}")
+                else:
+                    lines.append(f"{name}{_labels(metric.labelnames, key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# Forked workers start with a copy of the parent's samples; they only report their own
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=REGISTRY.clear)
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+# Shared instruments
+STAGE_SECONDS = histogram(
+    "resume_stage_duration_seconds", "Time spent in a named extraction, parsing or ranking stage", ["stage"]
+)
+CACHE_REQUESTS = counter("resume_cache_requests_total", "Cache lookups by cache and result (hit or miss)",
+                         ["cache", "result"])
+ERRORS = counter("resume_errors_total", "Errors caught and recovered from, by stage", ["stage"])
+FALLBACKS = counter("resume_fallbacks_total", "Default values substituted for data that could not be extracted",
+                    ["fallback", "reason"])
+HTTP_REQUEST_SECONDS = histogram("http_request_duration_seconds", "HTTP request latency by endpoint",
+                                 ["method", "endpoint", "status"])
+# Set by parser/nlp_registry.get_nlp in whichever process loads a pipeline (the ranking workers)
+MODEL_LOAD_SECONDS = gauge("spacy_model_load_seconds", "Time taken to load a spaCy pipeline",
+                           ["model", "excluded", "pid"])
+MODEL_RSS_DELTA_BYTES = gauge("spacy_model_rss_delta_bytes", "Resident memory added by loading a spaCy pipeline",
+                              ["model", "excluded", "pid"])
+
+
+def timed(stage: str) -> _Timer:
+    """Context manager recording the duration of a stage in resume_stage_duration_seconds."""
+    return STAGE_SECONDS.time(stage=stage)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def record_error(stage: str):
+    ERRORS.inc(stage=stage)
+
+
+def record_fallback(fallback: str, reason: str):
+    FALLBACKS.inc(fallback=fallback, reason=reason)
+
+
+def call_and_flush(fn: Callable, *args):
+    """Run fn(*args), then publish this (worker) process's metrics."""
+    try:
+        return fn(*args)
+    finally:
+        REGISTRY.flush()
+
+
+# Directory created by enable_multiprocess, removed by cleanup_multiprocess
+_temporary_dir: Optional[str] = None
+
+
+def enable_multiprocess(directory: Optional[str] = None) -> str:
+    """Collect worker-process metrics through a directory (METRICS_MULTIPROC_DIR, else a fresh temp dir).
+
+    Call in the serving process before its worker processes start; samples left
+    by a previous run are removed.
+    """
+    global _temporary_dir
+    directory = directory or os.getenv(MULTIPROCESS_DIR_ENV)
+    if not directory:
+        directory = _temporary_dir = tempfile.mkdtemp(prefix="resume-metrics-")
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, "*.json*")):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    os.environ[MULTIPROCESS_DIR_ENV] = directory
+    os.environ[_OWNER_PID_ENV] = str(os.getpid())
+    return directory
+
+
+def cleanup_multiprocess():
+    """Remove the temporary directory created by enable_multiprocess (call once the worker processes are gone)."""
+    global _temporary_dir
+    if _temporary_dir is not None:
+        shutil.rmtree(_temporary_dir, ignore_errors=True)
+        _temporary_dir = None
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording every HTTP request in http_request_duration_seconds.
+
+    Requests are labelled by endpoint function name rather than path, so ids in
+    paths do not create a series per request. Streaming responses are timed
+    until their last chunk is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            endpoint = getattr(scope.get("endpoint"), "__name__", "unmatched")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start, method=scope["method"], endpoint=endpoint, status=str(status)
+            )
@@ -0,0 +1,190 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+from models.response_model import ResumeData
+from parser.extract_entities import PARSER_VERSION
+from services.metrics import record_cache
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def content_hash(contents: bytes) -> str:
+    """SHA-256 of an uploaded file's bytes."""
+    return hashlib.sha256(contents).hexdigest()
+
+
+class CachedParse(BaseModel):
+    text: str
+    resume_data: ResumeData
+
+
+class LRUCacheBackend:
+    """In-process cache evicting least recently used entries beyond max_bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+            return payload
+
+    def set(self, key: str, payload: str):
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key))
+            self._entries[key] = payload
+            self._size += len(payload)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "bytes": self._size, "evictions": self.evictions}
+
+
+class SQLiteCacheBackend:
+    """On-disk cache in a SQLite file, evicting least recently used rows beyond max_bytes."""
+
+    def __init__(self, path: str, max_bytes: int, version: str):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS parse_cache ("
+            "key TEXT PRIMARY KEY, version TEXT NOT NULL, payload TEXT NOT NULL, "
+            "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        # Entries written by another parser version can never be hit again
+        deleted = self._conn.execute("DELETE FROM parse_cache WHERE version != ?", (version,)).rowcount
+        self._conn.commit()
+        if deleted:
+            logger.info(f"Invalidated {deleted} parse cache entries from older parser versions")
+        self.version = version
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM parse_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE parse_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, payload: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (key, version, payload, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, self.version, payload, len(payload), time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM parse_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM parse_cache ORDER BY last_access").fetchall()
+        # Always keep the newest entry
+        for key, size in rows[:-1]:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM parse_cache WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM parse_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_cache").fetchone()
+        return {"entries": entries, "bytes": size, "evictions": self.evictions, "path": self.path}
+
+
+class ParseCache:
+    """Content-addressed cache of extracted text and parsed ResumeData.
+
+    Keys are the SHA-256 of the uploaded file plus the parser version, so a
+    parser upgrade never serves results produced by older extraction logic.
+    """
+
+    def __init__(self, backend, version: str = PARSER_VERSION):
+        self.backend = backend
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, contents: bytes) -> str:
+        return f"{self.version}:{content_hash(contents)}"
+
+    def get(self, contents: bytes) -> Optional[CachedParse]:
+        payload = self.backend.get(self.key_for(contents))
+        if payload is None:
+            self.misses += 1
+            record_cache("parse", False)
+            return None
+        try:
+            cached = CachedParse.parse_raw(payload)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable parse cache entry: {e}")
+            self.misses += 1
+            record_cache("parse", False)
+            return None
+        self.hits += 1
+        record_cache("parse", True)
+        return cached
+
+    def put(self, contents: bytes, text: str, resume_data: ResumeData):
+        self.backend.set(self.key_for(contents), CachedParse(text=text, resume_data=resume_data).json())
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "parser_version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "backend": type(self.backend).__name__,
+            **self.backend.stats()
+        }
+
+
+def create_parse_cache() -> Optional[ParseCache]:
+    """Build the parse cache configured by PARSE_CACHE_BACKEND (memory, sqlite or none)."""
+    backend_name = os.getenv("PARSE_CACHE_BACKEND", "memory").lower()
+    max_bytes = int(float(os.getenv("PARSE_CACHE_MAX_MB", "64")) * 1024 * 1024)
+
+    if backend_name == "none":
+        return None
+    if backend_name == "sqlite":
+        path = os.getenv("PARSE_CACHE_PATH", "parse_cache.sqlite3")
+        return ParseCache(SQLiteCacheBackend(path, max_bytes, PARSER_VERSION))
+    if backend_name != "memory":
+        logger.warning(f"Unknown PARSE_CACHE_BACKEND '{backend_name}', using in-memory cache")
+    return ParseCache(LRUCacheBackend(max_bytes))
@@ -0,0 +1,234 @@
+import argparse
+import json
+import logging
+import os
+import shutil
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from parser.extract_entities import PARSER_VERSION
+from parser.vector_scoring import BatchScorer, CandidateBatch, Vocabulary
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bump when the column layout changes
+SNAPSHOT_FORMAT = "1"
+
+# Per-candidate numeric columns of CandidateBatch
+DENSE_COLUMNS = (
+    "skill_counts", "experience_counts", "total_years", "relevance_match", "education_level",
+    "has_education", "upward_mobility", "gap_counts", "frequent_switcher", "valid"
+)
+
+# Candidates fetched from the store and encoded per step while building
+_BUILD_BATCH = 500
+
+
+class _RaggedColumn(Sequence):
+    """Variable-length values of rows [start, stop), decoded on access from offsets into a flat array."""
+
+    def __init__(self, offsets: np.ndarray, values: np.ndarray, decode: Callable[[np.ndarray], Any],
+                 start: int = 0, stop: Optional[int] = None):
+        self.offsets = offsets
+        self.values = values
+        self.decode = decode
+        self.start = start
+        self.stop = len(offsets) - 1 if stop is None else stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, i: int):
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        row = self.start + i
+        return self.decode(self.values[self.offsets[row]:self.offsets[row + 1]])
+
+
+def _ragged(rows: List[np.ndarray], dtype) -> Dict[str, np.ndarray]:
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(row) for row in rows])
+    values = np.concatenate(rows).astype(dtype) if rows else np.zeros(0, dtype=dtype)
+    return {"offsets": offsets, "values": values}
+
+
+class PoolSnapshot:
+    """Read-only, memory-mapped columnar copy of the encoded candidate pool.
+
+    Holds the job-independent CandidateBatch features of every stored
+    candidate as .npy columns: sparse skill and market rows (indptr, indices,
+    data), the numeric experience/education/progression columns, certification
+    ids and the preprocessed cultural-fit text as offsets into flat arrays.
+    Every process opening the snapshot maps the same files, so workers share
+    one copy of the pool through the page cache and score row ranges of it
+    directly, without building ResumeData objects.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        meta_path = os.path.join(directory, "meta.json")
+        self.meta_mtime = os.stat(meta_path).st_mtime_ns
+        with open(meta_path, encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Pool snapshot {directory} has format {self.meta.get('format')}, rebuild it")
+        self.created_at: float = self.meta["created_at"]
+        self.candidate_ids: List[str] = self.meta["candidate_ids"]
+        self.vocabulary = Vocabulary(self.meta["skill_terms"])
+        self.certification_terms: List[str] = self.meta["certification_terms"]
+        self.columns = {
+            name[:-len(".npy")]: np.load(os.path.join(directory, name), mmap_mode="r")
+            for name in os.listdir(directory) if name.endswith(".npy")
+        }
+
+    def __len__(self) -> int:
+        return len(self.candidate_ids)
+
+    def _csr(self, name: str, start: int, stop: int, n_columns: int) -> sparse.csr_matrix:
+        indptr = self.columns[f"{name}_indptr"]
+        begin, end = int(indptr[start]), int(indptr[stop])
+        return sparse.csr_matrix(
+            (self.columns[f"{name}_data"][begin:end], self.columns[f"{name}_indices"][begin:end],
+             np.asarray(indptr[start:stop + 1]) - begin),
+            shape=(stop - start, n_columns)
+        )
+
+    def batch(self, start: int = 0, stop: Optional[int] = None) -> CandidateBatch:
+        """CandidateBatch of rows [start, stop), backed by the mapped columns."""
+        stop = len(self) if stop is None else stop
+        batch = CandidateBatch(stop - start)
+        batch.vocabulary = self.vocabulary
+        batch.skills = self._csr("skills", start, stop, len(self.vocabulary))
+        batch.market = self._csr("market", start, stop, len(self.meta["market_terms"]))
+        for name in DENSE_COLUMNS:
+            setattr(batch, name, self.columns[name][start:stop])
+        batch.certifications = _RaggedColumn(
+            self.columns["certification_offsets"], self.columns["certification_ids"],
+            lambda ids: [self.certification_terms[i] for i in ids], start, stop
+        )
+        batch.cultural_texts = _RaggedColumn(
+            self.columns["cultural_text_offsets"], self.columns["cultural_text_bytes"],
+            lambda data: data.tobytes().decode("utf-8"), start, stop
+        )
+        return batch
+
+    def check_compatible(self, scorer: BatchScorer):
+        """Market trend columns must match the scorer's, or the snapshot is stale."""
+        if self.meta["market_terms"] != list(scorer.market_vocabulary.index):
+            raise ValueError(f"Pool snapshot {self.directory} was built with other market trends, rebuild it")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "directory": self.directory,
+            "candidates": len(self),
+            "created_at": self.created_at,
+            "parser_version": self.meta["parser_version"],
+            "bytes": sum(column.nbytes for column in self.columns.values())
+        }
+
+
+def load_snapshot(directory: str, current: Optional[PoolSnapshot] = None) -> Optional[PoolSnapshot]:
+    """The snapshot in directory (reusing `current` if it was not rebuilt since), or None when there is none."""
+    meta_path = os.path.join(directory, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    if current is not None and current.directory == directory and current.meta_mtime == os.stat(meta_path).st_mtime_ns:
+        return current
+    return PoolSnapshot(directory)
+
+
+def build_snapshot(store, directory: str, ranker=None) -> Dict[str, Any]:
+    """Encode every stored candidate and write a fresh snapshot, replacing (compacting) the old one."""
+    if ranker is None:
+        from parser.resume_ranker import ResumeRanker
+        ranker = ResumeRanker()
+    scorer = BatchScorer(ranker)
+
+    candidate_ids: List[str] = []
+    dense: Dict[str, List[np.ndarray]] = {name: [] for name in DENSE_COLUMNS}
+    matrices: Dict[str, List[sparse.csr_matrix]] = {"skills": [], "market": []}
+    certification_vocabulary = Vocabulary()
+    certification_rows: List[np.ndarray] = []
+    text_rows: List[np.ndarray] = []
+
+    ids = store.ids()
+    for start in range(0, len(ids), _BUILD_BATCH):
+        candidates = [candidate for candidate in store.get_many(ids[start:start + _BUILD_BATCH]) if candidate]
+        batch = scorer.encode([candidate.resume_data for candidate in candidates])
+        candidate_ids.extend(candidate.candidate_id for candidate in candidates)
+        for name in DENSE_COLUMNS:
+            dense[name].append(getattr(batch, name))
+        matrices["skills"].append(batch.skills)
+        matrices["market"].append(batch.market)
+        for certifications, text in zip(batch.certifications, batch.cultural_texts):
+            certification_rows.append(np.array([certification_vocabulary.add(c) for c in certifications], dtype=np.int32))
+            text_rows.append(np.frombuffer(text.encode("utf-8"), dtype=np.uint8))
+
+    columns: Dict[str, np.ndarray] = {}
+    empty = CandidateBatch(0)
+    for name in DENSE_COLUMNS:
+        columns[name] = np.concatenate(dense[name]) if dense[name] else getattr(empty, name)
+    for name, n_columns in (("skills", len(scorer.vocabulary)), ("market", len(scorer.market_vocabulary))):
+        # Earlier chunks were encoded while the vocabulary was smaller
+        parts = [sparse.csr_matrix((part.data, part.indices, part.indptr), shape=(part.shape[0], n_columns))
+                 for part in matrices[name]]
+        matrix = sparse.vstack(parts, format="csr") if parts else sparse.csr_matrix((0, n_columns))
+        columns[f"{name}_indptr"] = matrix.indptr.astype(np.int64)
+        columns[f"{name}_indices"] = matrix.indices.astype(np.int32)
+        columns[f"{name}_data"] = matrix.data.astype(np.float64)
+    certifications = _ragged(certification_rows, np.int32)
+    columns["certification_offsets"], columns["certification_ids"] = certifications["offsets"], certifications["values"]
+    texts = _ragged(text_rows, np.uint8)
+    columns["cultural_text_offsets"], columns["cultural_text_bytes"] = texts["offsets"], texts["values"]
+
+    meta = {
+        "format": SNAPSHOT_FORMAT,
+        "parser_version": PARSER_VERSION,
+        "created_at": time.time(),
+        "candidate_ids": candidate_ids,
+        "skill_terms": list(scorer.vocabulary.index),
+        "market_terms": list(scorer.market_vocabulary.index),
+        "certification_terms": list(certification_vocabulary.index)
+    }
+
+    # Write next to the live snapshot, then swap directories; processes still mapping the old files keep them
+    staging = f"{directory}.building"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for name, column in columns.items():
+        np.save(os.path.join(staging, f"{name}.npy"), column)
+    with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    retired = f"{directory}.old"
+    shutil.rmtree(retired, ignore_errors=True)
+    if os.path.exists(directory):
+        os.replace(directory, retired)
+    os.replace(staging, directory)
+    shutil.rmtree(retired, ignore_errors=True)
+
+    logger.info(f"Wrote pool snapshot of {len(candidate_ids)} candidates to {directory}")
+    return {"directory": directory, "candidates": len(candidate_ids), "created_at": meta["created_at"]}
+
+
+def main(argv: Optional[List[str]] = None):
+    from services.candidate_store import create_candidate_store
+
+    parser = argparse.ArgumentParser(description="Build (or compact) the memory-mapped candidate pool snapshot.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--out", default=os.getenv("POOL_SNAPSHOT_DIR", "pool_snapshot"),
+                        help="snapshot directory (default: POOL_SNAPSHOT_DIR or pool_snapshot)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    store = create_candidate_store()
+    if store is None:
+        parser.error("the candidate store is disabled (CANDIDATE_STORE_BACKEND=none)")
+    print(json.dumps(build_snapshot(store, args.out)))
+
+
+if __name__ == "__main__":
+    main()
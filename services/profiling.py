@@ -0,0 +1,310 @@
+import asyncio
+import contextvars
+import glob
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Requests opt in with this header (when PROFILE_ALLOW_HEADER is on) and get the profile id back in the other
+PROFILE_REQUEST_HEADER = b"x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+# Set by the serving process so worker processes label their samples by pid
+_OWNER_PID_ENV = "PROFILE_OWNER_PID"
+
+# Endpoints that can be profiled (PROFILE_PATHS overrides, comma-separated)
+DEFAULT_PROFILED_PATHS = ("/upload-resume", "/analyze-resume", "/batch-analyze")
+
+
+class ActiveProfile:
+    """Profile being recorded for the current request, visible to the executors through a context variable."""
+
+    def __init__(self, profile_id: str, directory: str, interval: float):
+        self.id = profile_id
+        self.directory = directory
+        self.interval = interval
+
+
+_active_profile: contextvars.ContextVar[Optional[ActiveProfile]] = contextvars.ContextVar("active_profile", default=None)
+
+
+def current_profile() -> Optional[ActiveProfile]:
+    return _active_profile.get()
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    # Keep paths short but unambiguous: the last two components
+    short = os.path.join(os.path.basename(os.path.dirname(filename)), os.path.basename(filename))
+    return f"{code.co_name} ({short}:{code.co_firstlineno})".replace(";", ":")
+
+
+def collapse_stack(frame, root: str = "", base=None) -> Optional[str]:
+    """A frame's call stack, root first, as one line of Brendan Gregg's collapsed-stack format.
+
+    Frames from base down (the caller's own frames) are left out; a stack
+    that does not go through base gives None.
+    """
+    labels = []
+    while frame is not None and frame is not base:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    if base is not None and frame is None:
+        return None
+    if root:
+        labels.append(root)
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """Samples the call stack of one thread at a fixed interval from a background thread.
+
+    With a base frame, only samples taken while the thread runs code called
+    from base are kept. Sampling needs the GIL, so while the target runs pure
+    Python the effective interval is at least sys.getswitchinterval() (5ms by
+    default).
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.002, root: str = "", base=None):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.root = root
+        self.base = base
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "StackSampler":
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            # Skip the sample catching the target in stop()
+            if frame is not None and not self._stop.is_set():
+                stack = collapse_stack(frame, self.root, self.base)
+                if stack is not None:
+                    self.counts[stack] += 1
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.counts
+
+
+def _write_collapsed(path: str, counts: Counter):
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        for stack, count in counts.items():
+            f.write(f"{stack} {count}\n")
+    os.replace(f"{path}.tmp", path)
+
+
+def profile_call(profile_id: str, directory: str, interval: float, fn: Callable, *args):
+    """Run fn(*args) under a stack sampler and store its samples with the request's profile.
+
+    Used by TrackedExecutor for work submitted on behalf of a profiled request,
+    in worker processes as well as in threads.
+    """
+    in_worker = os.getenv(_OWNER_PID_ENV) not in (None, str(os.getpid()))
+    root = f"worker-{os.getpid()}" if in_worker else threading.current_thread().name
+    # Stacks start at fn: the executor's frames (and in a forked worker, the parent's) are not part of the request
+    sampler = StackSampler(threading.get_ident(), interval, root, sys._getframe()).start()
+    try:
+        return fn(*args)
+    finally:
+        counts = sampler.stop()
+        profile_dir = os.path.join(directory, profile_id)
+        if counts and os.path.isdir(profile_dir):
+            try:
+                _write_collapsed(os.path.join(profile_dir, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.folded"), counts)
+            except OSError as e:
+                logger.warning(f"Could not store profile samples for {profile_id}: {e}")
+
+
+class ProfileStore:
+    """Collapsed-stack profiles of recent requests, one directory per profile id, oldest pruned first."""
+
+    def __init__(self, directory: str, max_profiles: int = 100, temporary: bool = False):
+        self.directory = directory
+        self.max_profiles = max_profiles
+        self.temporary = temporary  # Created for this process: removed by close()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> "ProfileStore":
+        directory = os.getenv("PROFILE_DIR")
+        temporary = not directory
+        if temporary:
+            directory = tempfile.mkdtemp(prefix="resume-profiles-")
+        os.environ[_OWNER_PID_ENV] = str(os.getpid())
+        try:
+            max_profiles = max(1, int(os.getenv("PROFILE_MAX", "100")))
+        except ValueError:
+            logger.warning(f"Invalid value '{os.getenv('PROFILE_MAX')}' for PROFILE_MAX, using 100")
+            max_profiles = 100
+        return cls(directory, max_profiles, temporary)
+
+    def close(self):
+        """Remove the profiles if they live in a temporary directory (PROFILE_DIR unset)."""
+        if self.temporary:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _path(self, profile_id: str) -> str:
+        # Profile ids are hex uuids; anything else cannot name a profile directory
+        if not profile_id.isalnum():
+            raise KeyError(profile_id)
+        return os.path.join(self.directory, profile_id)
+
+    def start(self, profile_id: str, method: str, path: str):
+        os.makedirs(self._path(profile_id))
+        self._write_meta(profile_id, {"profile_id": profile_id, "method": method, "path": path,
+                                      "started_at": time.time(), "finished": False})
+
+    def finish(self, profile_id: str, counts: Counter, duration: float, status: int):
+        if counts:
+            _write_collapsed(os.path.join(self._path(profile_id), "event-loop.folded"), counts)
+        meta = self.meta(profile_id) or {"profile_id": profile_id}
+        meta.update({"finished": True, "duration_ms": round(duration * 1000, 3), "status": status})
+        self._write_meta(profile_id, meta)
+        self._prune()
+
+    def _write_meta(self, profile_id: str, meta: Dict[str, Any]):
+        path = os.path.join(self._path(profile_id), "meta.json")
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(f"{path}.tmp", path)
+
+    def meta(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self._path(profile_id), "meta.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (KeyError, OSError, ValueError):
+            return None
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Metadata of the stored profiles, newest first."""
+        profiles = []
+        for entry in os.listdir(self.directory):
+            meta = self.meta(entry)
+            if meta is not None:
+                meta["samples"] = sum(self.collapsed(entry).values())
+                profiles.append(meta)
+        return sorted(profiles, key=lambda meta: meta.get("started_at", 0), reverse=True)
+
+    def collapsed(self, profile_id: str) -> Counter:
+        """Samples of a profile from every process and thread that worked on the request."""
+        counts: Counter = Counter()
+        try:
+            paths = glob.glob(os.path.join(self._path(profile_id), "*.folded"))
+        except KeyError:
+            return counts
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    stack, _, count = line.rstrip("\n").rpartition(" ")
+                    if stack:
+                        counts[stack] += int(count)
+        return counts
+
+    def collapsed_text(self, profile_id: str) -> Optional[str]:
+        """Collapsed-stack text (flamegraph.pl, speedscope, inferno), or None for an unknown profile."""
+        if self.meta(profile_id) is None:
+            return None
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.collapsed(profile_id).items()))
+
+    def _prune(self):
+        with self._lock:
+            entries = [(self.meta(entry) or {}, entry) for entry in os.listdir(self.directory)]
+            entries.sort(key=lambda item: item[0].get("started_at", 0))
+            for _, entry in entries[:max(0, len(entries) - self.max_profiles)]:
+                shutil.rmtree(os.path.join(self.directory, entry), ignore_errors=True)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling opted-in or randomly sampled requests to the profiled endpoints.
+
+    A request is profiled when it sends `X-Profile: 1` (unless PROFILE_ALLOW_HEADER=0)
+    or is picked with probability PROFILE_SAMPLE_RATE. The event loop thread is
+    sampled while the request's own task runs on it (other requests share the
+    loop and are left out), and so is every executor task it submits (text
+    extraction threads, parsing and ranking worker processes); the response
+    carries the profile id in X-Profile-Id.
+    """
+
+    def __init__(self, app, store: ProfileStore, sample_rate: Optional[float] = None,
+                 allow_header: Optional[bool] = None, paths: Optional[Sequence[str]] = None,
+                 interval: Optional[float] = None):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate if sample_rate is not None else float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+        self.allow_header = (
+            allow_header if allow_header is not None
+            else os.getenv("PROFILE_ALLOW_HEADER", "1").lower() not in ("0", "false", "no")
+        )
+        configured = os.getenv("PROFILE_PATHS")
+        self.paths = frozenset(
+            paths or ([path.strip() for path in configured.split(",") if path.strip()] if configured
+                      else DEFAULT_PROFILED_PATHS)
+        )
+        self.interval = interval or float(os.getenv("PROFILE_INTERVAL_MS", "2")) / 1000
+
+    def _wants_profile(self, scope) -> bool:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            return False
+        if self.allow_header:
+            for name, value in scope.get("headers", []):
+                if name == PROFILE_REQUEST_HEADER and value.lower() in (b"1", b"true", b"yes"):
+                    return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # The store does file I/O: keep it off the event loop
+        loop = asyncio.get_running_loop()
+        profile_id = uuid.uuid4().hex
+        await loop.run_in_executor(None, self.store.start, profile_id, scope["method"], scope["path"])
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": list(message.get("headers", [])) + [
+                    (PROFILE_ID_HEADER.lower().encode("latin-1"), profile_id.encode("latin-1"))
+                ]}
+            await send(message)
+
+        token = _active_profile.set(ActiveProfile(profile_id, self.store.directory, self.interval))
+        # This coroutine's frame is on the loop's stack exactly while the request's task runs
+        sampler = StackSampler(threading.get_ident(), self.interval, "event-loop", sys._getframe()).start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            counts = sampler.stop()
+            _active_profile.reset(token)
+            try:
+                await loop.run_in_executor(
+                    None, self.store.finish, profile_id, counts, time.perf_counter() - start, status
+                )
+            except OSError as e:
+                logger.warning(f"Could not store profile {profile_id}: {e}")
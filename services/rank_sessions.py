@@ -0,0 +1,189 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from models.job_model import JobRequirement, JobMatch
+from models.response_model import ResumeData
+from parser.job_profile import DEFAULT_SCORE_WEIGHTS, SCORE_COMPONENTS, JobProfile, combine_components
+from parser.vector_scoring import BatchScorer
+from services.executor import env_int
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Score given to candidates whose ranking failed (same fallback as ResumeRanker.rank_resume)
+FALLBACK_SCORE = 0.5
+
+# Components that need the spaCy pipeline, so they are recomputed by the worker processes
+CULTURAL_COMPONENTS = frozenset(("cultural", "cultural_bonus"))
+
+
+class RankingSession:
+    """Raw score components of one ranked batch, kept so it can be re-weighted without re-scoring.
+
+    When the session also keeps the batch's resumes, the job requirement can
+    be edited: the new job is diffed against the previous one and only the
+    components it affects are recomputed (adding a required skill touches
+    skill coverage and the diversity bonus, nothing else). The resumes'
+    job-independent features are encoded once, on the first edit.
+    """
+
+    def __init__(self, session_id: str, job_requirement: JobRequirement, components: Dict[str, np.ndarray],
+                 valid: np.ndarray, resumes: Optional[List[ResumeData]] = None):
+        self.id = session_id
+        self.job_requirement = job_requirement
+        self.components = components
+        self.valid = valid
+        self.resumes = resumes
+        self.weights = dict(DEFAULT_SCORE_WEIGHTS)
+        self.created = time.time()
+        self.last_access = self.created
+        self._lock = threading.Lock()
+        self._profile: Optional[JobProfile] = None
+        self._scorer: Optional[BatchScorer] = None
+        self._batch = None
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def _scores(self) -> Tuple[List[int], List[float]]:
+        scores = np.where(self.valid, combine_components(self.components, self.weights), FALLBACK_SCORE)
+        # Stable sort so ties keep batch order, like the initial ranking
+        ranking = np.argsort(-scores, kind="stable")
+        return ranking.tolist(), scores.tolist()
+
+    def rerank(self, weights: Dict[str, float]) -> Tuple[List[int], List[float]]:
+        """Ranking (batch indices, best first) and scores (batch order) under new weights."""
+        with self._lock:
+            self.weights = dict(weights)
+            return self._scores()
+
+    @staticmethod
+    def _job_profile(job_requirement: JobRequirement, ranker) -> JobProfile:
+        # Built directly rather than through the ranker's profile cache, which is not thread-safe
+        return JobProfile(job_requirement, ranker.company_values_db, ranker.cultural_keywords)
+
+    def changed_components(self, job_requirement: JobRequirement, ranker) -> Set[str]:
+        """Score components a new job requirement would change."""
+        with self._lock:
+            if self._profile is None:
+                self._profile = self._job_profile(self.job_requirement, ranker)
+            return self._job_profile(job_requirement, ranker).changed_components(self._profile)
+
+    def update_job(self, job_requirement: JobRequirement, ranker,
+                   rows: Optional[List[Optional[Dict[str, float]]]] = None) -> Tuple[Set[str], List[int], List[float]]:
+        """Switch the session to an edited job requirement, recomputing only the affected components.
+
+        rows, when given, are freshly scored components of every candidate for
+        the new job (batch order); the affected components are then taken from
+        them instead of being recomputed here. They are required whenever
+        cultural fit is affected. Returns the updated components, the new
+        ranking and the new scores (current weights).
+        """
+        if self.resumes is None:
+            raise ValueError("The session does not keep its resumes")
+        profile = self._job_profile(job_requirement, ranker)
+        with self._lock:
+            if self._profile is None:
+                self._profile = self._job_profile(self.job_requirement, ranker)
+            changed = profile.changed_components(self._profile)
+            if rows is not None:
+                components = dict(self.components)
+                for name in changed:
+                    components[name] = np.array(
+                        [row[name] if row is not None else 0.0 for row in rows], dtype=float
+                    )
+            elif changed & CULTURAL_COMPONENTS:
+                raise ValueError("Cultural fit changed, score the batch for the new job and pass its rows")
+            elif changed:
+                if self._batch is None:
+                    self._scorer = BatchScorer(ranker)
+                    self._batch = self._scorer.encode(self.resumes, cultural=False)
+                components = self._scorer.update(self._batch, profile, self.components, changed)
+            else:
+                components = self.components
+            self.components = components
+            self.job_requirement = job_requirement
+            self._profile = profile
+            ranking, scores = self._scores()
+        return changed, ranking, scores
+
+
+class RankSessionStore:
+    """In-process store of ranking sessions, evicting the least recently used and expired ones."""
+
+    def __init__(self, max_sessions: int = 256, ttl_seconds: int = 1800):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, RankingSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "RankSessionStore":
+        return cls(env_int("RANK_SESSION_MAX", 256), env_int("RANK_SESSION_TTL", 1800))
+
+    @staticmethod
+    def new_session_id() -> str:
+        return uuid.uuid4().hex
+
+    def create(self, job_requirement: JobRequirement, rows: List[Optional[Dict[str, float]]],
+               session_id: Optional[str] = None, resumes: Optional[List[ResumeData]] = None) -> RankingSession:
+        """Store the components of a ranked batch; rows are in batch order, None for failed candidates.
+
+        Keep the batch's resumes to allow editing the job requirement later.
+        """
+        valid = np.array([row is not None for row in rows], dtype=bool)
+        components = {
+            name: np.array([row[name] if row is not None else 0.0 for row in rows], dtype=float)
+            for name in SCORE_COMPONENTS
+        }
+        session = RankingSession(session_id or self.new_session_id(), job_requirement, components, valid, resumes)
+        with self._lock:
+            self._expire()
+            self._sessions[session.id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+        return session
+
+    def create_from_matches(self, job_requirement: JobRequirement, matches: List[JobMatch],
+                            session_id: Optional[str] = None,
+                            resumes: Optional[List[ResumeData]] = None) -> RankingSession:
+        """Session for JobMatch results in batch order."""
+        return self.create(
+            job_requirement, [match.match_details.get("components") for match in matches], session_id, resumes
+        )
+
+    def get(self, session_id: str) -> Optional[RankingSession]:
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_access = time.time()
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl_seconds
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_access >= cutoff:
+                break
+            del self._sessions[session_id]
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "candidates": sum(len(session) for session in self._sessions.values()),
+                "evictions": self.evictions,
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds
+            }
@@ -0,0 +1,249 @@
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from models.job_model import JobRequirement
+from models.response_model import ResumeData
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Candidates fetched from the store per query while fitting
+_FIT_BATCH = 500
+
+# Bump when the document text or vectorizer settings change, so persisted indexes are refitted
+INDEX_FORMAT = "1"
+
+
+def resume_text(resume_data: ResumeData) -> str:
+    """Text of a resume used for semantic matching."""
+    parts = [resume_data.summary or ""]
+    parts.extend(resume_data.skills)
+    parts.extend(resume_data.certifications or [])
+    for exp in resume_data.experience:
+        parts.append(exp.title)
+        parts.extend(exp.description)
+        parts.extend(exp.skills_used)
+    for edu in resume_data.education:
+        parts.append(edu.degree)
+        parts.append(edu.field_of_study or "")
+    return " ".join(part for part in parts if part)
+
+
+def job_text(job_requirement: JobRequirement) -> str:
+    """Text of a job requirement used as the semantic query."""
+    parts = [job_requirement.title, job_requirement.industry]
+    parts.extend(job_requirement.required_skills)
+    parts.extend(job_requirement.preferred_skills)
+    parts.extend(job_requirement.keywords)
+    parts.extend(job_requirement.required_certifications or [])
+    return " ".join(part for part in parts if part)
+
+
+def _new_vectorizer() -> TfidfVectorizer:
+    # Rows are L2-normalized, so a dot product is the cosine similarity
+    return TfidfVectorizer(lowercase=True, stop_words="english", ngram_range=(1, 2), sublinear_tf=True)
+
+
+class SemanticIndex:
+    """TF-IDF document matrix of the candidate pool.
+
+    The vectorizer is fitted once over the pool and kept (with the matrix) on
+    disk. New candidates are transformed with the fitted vocabulary and
+    appended; removed ones are dropped from results. Once the pool has grown
+    by refit_growth since the last fit, `needs_refit` asks the owner to fit
+    again so new terms and document frequencies are picked up. A job is
+    scored against every candidate with one sparse matrix-vector product.
+    """
+
+    def __init__(self, refit_growth: float = 0.5, path: Optional[str] = None):
+        self.refit_growth = refit_growth
+        self.path = path  # Where save() persists the index (not persisted when None)
+        self._lock = threading.Lock()
+        self.vectorizer: Optional[TfidfVectorizer] = None
+        self.matrix = sparse.csr_matrix((0, 0))
+        self.candidate_ids: List[Optional[str]] = []  # Matrix row -> candidate id (None when removed)
+        self._rows: Dict[str, int] = {}
+        self._pending: List[sparse.csr_matrix] = []   # Rows transformed since the last query
+        self.fitted_documents = 0
+        self.refits = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self._rows
+
+    @property
+    def needs_refit(self) -> bool:
+        return len(self._rows) > max(self.fitted_documents, 1) * (1 + self.refit_growth)
+
+    def fit(self, candidate_ids: List[str], texts: List[str]):
+        """Fit the vectorizer on the given documents and replace the index with them."""
+        vectorizer = _new_vectorizer()
+        try:
+            matrix = vectorizer.fit_transform(texts).tocsr() if texts else None
+        except ValueError:
+            # Every document was empty or stop words only
+            matrix = None
+        with self._lock:
+            self.vectorizer = vectorizer if matrix is not None else None
+            self.matrix = matrix if matrix is not None else sparse.csr_matrix((len(texts), 0))
+            self.candidate_ids = list(candidate_ids)
+            self._rows = {candidate_id: row for row, candidate_id in enumerate(candidate_ids)}
+            self._pending = []
+            self.fitted_documents = len(candidate_ids)
+            self.refits += 1
+
+    def fit_from_store(self, store):
+        """Fit on every candidate of a candidate store."""
+        candidate_ids, texts = [], []
+        ids = store.ids()
+        for start in range(0, len(ids), _FIT_BATCH):
+            for candidate in store.get_many(ids[start:start + _FIT_BATCH]):
+                if candidate is not None:
+                    candidate_ids.append(candidate.candidate_id)
+                    texts.append(resume_text(candidate.resume_data))
+        self.fit(candidate_ids, texts)
+        logger.info(f"Fitted semantic index on {len(candidate_ids)} candidates")
+
+    def add(self, candidate_id: str, resume_data: ResumeData):
+        """Append a candidate using the fitted vocabulary (unknown terms are ignored until the next fit)."""
+        with self._lock:
+            self._remove(candidate_id)
+            if self.vectorizer is not None:
+                row = self.vectorizer.transform([resume_text(resume_data)]).tocsr()
+            else:
+                row = sparse.csr_matrix((1, self.matrix.shape[1]))
+            self._rows[candidate_id] = len(self.candidate_ids)
+            self.candidate_ids.append(candidate_id)
+            self._pending.append(row)
+
+    def remove(self, candidate_id: str) -> bool:
+        with self._lock:
+            return self._remove(candidate_id)
+
+    def _remove(self, candidate_id: str) -> bool:
+        row = self._rows.pop(candidate_id, None)
+        if row is None:
+            return False
+        self.candidate_ids[row] = None
+        return True
+
+    def _flush(self):
+        if self._pending:
+            self.matrix = sparse.vstack([self.matrix, *self._pending], format="csr")
+            self._pending = []
+
+    def similarities(self, job_requirement: JobRequirement,
+                     candidate_ids: Optional[List[str]] = None) -> np.ndarray:
+        """Cosine similarity of the job to the given candidates (all rows when None; 0.0 when unknown)."""
+        with self._lock:
+            self._flush()
+            if self.vectorizer is None:
+                scores = np.zeros(self.matrix.shape[0])
+            else:
+                query = self.vectorizer.transform([job_text(job_requirement)])
+                scores = (self.matrix @ query.T).toarray().ravel()
+            if candidate_ids is None:
+                return scores
+            rows = np.array([self._rows.get(candidate_id, -1) for candidate_id in candidate_ids], dtype=np.int64)
+            return np.where(rows >= 0, scores[rows] if len(scores) else 0.0, 0.0)
+
+    def search(self, job_requirement: JobRequirement, limit: int = 20,
+               min_similarity: float = 0.0) -> List[Tuple[str, float]]:
+        """Live candidates more similar to the job than min_similarity, best first."""
+        scores = self.similarities(job_requirement)
+        with self._lock:
+            live = np.array([candidate_id is not None for candidate_id in self.candidate_ids[:len(scores)]], dtype=bool)
+            candidate_ids = list(self.candidate_ids)
+        scores = np.where(live, scores, -1.0)
+        eligible = np.flatnonzero(scores > min_similarity)
+        if len(eligible) > limit:
+            eligible = eligible[np.argpartition(-scores[eligible], limit - 1)[:limit]]
+        eligible = eligible[np.argsort(-scores[eligible], kind="stable")]
+        return [(candidate_ids[row], float(scores[row])) for row in eligible]
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            self._flush()
+            state = {
+                "format": INDEX_FORMAT,
+                "vectorizer": self.vectorizer,
+                "matrix": self.matrix,
+                "candidate_ids": self.candidate_ids,
+                "fitted_documents": self.fitted_documents
+            }
+        joblib.dump(state, path)
+
+    @classmethod
+    def load(cls, path: str, refit_growth: float = 0.5) -> Optional["SemanticIndex"]:
+        """Index persisted by save(), or None when missing or written by an older format."""
+        if not os.path.exists(path):
+            return None
+        try:
+            state = joblib.load(path)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable semantic index {path}: {e}")
+            return None
+        if state.get("format") != INDEX_FORMAT:
+            return None
+        index = cls(refit_growth, path)
+        index.vectorizer = state["vectorizer"]
+        index.matrix = state["matrix"]
+        index.candidate_ids = state["candidate_ids"]
+        index._rows = {
+            candidate_id: row for row, candidate_id in enumerate(index.candidate_ids) if candidate_id is not None
+        }
+        index.fitted_documents = state["fitted_documents"]
+        return index
+
+    def sync_with_store(self, store):
+        """Add candidates stored since the index was saved and drop deleted ones."""
+        stored_ids = store.ids()
+        stored = set(stored_ids)
+        for candidate_id in [candidate_id for candidate_id in self._rows if candidate_id not in stored]:
+            self.remove(candidate_id)
+        missing = [candidate_id for candidate_id in stored_ids if candidate_id not in self._rows]
+        for start in range(0, len(missing), _FIT_BATCH):
+            for candidate in store.get_many(missing[start:start + _FIT_BATCH]):
+                if candidate is not None:
+                    self.add(candidate.candidate_id, candidate.resume_data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "candidates": len(self._rows),
+                "rows": len(self.candidate_ids),
+                "terms": len(self.vectorizer.vocabulary_) if self.vectorizer is not None else 0,
+                "fitted_documents": self.fitted_documents,
+                "refits": self.refits
+            }
+
+
+def create_semantic_index(store) -> Optional[SemanticIndex]:
+    """Load the persisted semantic index (SEMANTIC_INDEX_PATH) and catch it up with the store, or fit a new one."""
+    if store is None:
+        return None
+    path = os.getenv("SEMANTIC_INDEX_PATH", "semantic_index.joblib")
+    refit_growth = float(os.getenv("SEMANTIC_REFIT_GROWTH", "0.5"))
+
+    index = SemanticIndex.load(path, refit_growth) if path else None
+    if index is not None:
+        index.sync_with_store(store)
+    else:
+        index = SemanticIndex(refit_growth, path or None)
+        index.fit_from_store(store)
+    if index.needs_refit:
+        index.fit_from_store(store)
+    index.save()
+    return index
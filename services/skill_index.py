@@ -0,0 +1,155 @@
+import logging
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from models.job_model import JobRequirement
+from models.response_model import ResumeData
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Term namespaces, so a skill and a certification with the same name stay distinct
+SKILL_PREFIX = "skill:"
+CERTIFICATION_PREFIX = "cert:"
+
+# Candidates fetched from the store per query while building the index
+_BUILD_BATCH = 500
+
+
+def candidate_terms(resume_data: ResumeData) -> Set[str]:
+    """Normalized terms a candidate is indexed under (lowercased, like the ranker's skill match)."""
+    terms = {SKILL_PREFIX + skill.lower().strip() for skill in resume_data.skills if skill.strip()}
+    terms.update(
+        CERTIFICATION_PREFIX + cert.lower().strip() for cert in resume_data.certifications or [] if cert.strip()
+    )
+    return terms
+
+
+class SkillIndex:
+    """Inverted index from normalized skill/certification terms to stored candidates.
+
+    Candidates get dense integer document ids in insertion order, so every
+    posting list is an append-only, sorted int32 array. Retrieving the
+    candidates that cover at least N of a job's required skills costs the
+    length of those posting lists, not the size of the pool. Removed or
+    re-indexed candidates leave tombstones that are compacted away once they
+    make up half of the documents.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._postings: Dict[str, array] = {}
+        self._doc_ids: Dict[str, int] = {}             # candidate id -> live document id
+        self._candidate_ids: List[Optional[str]] = []  # document id -> candidate id (None when removed)
+        self._doc_terms: List[Optional[Set[str]]] = []
+        self._live = 0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self._doc_ids
+
+    def add(self, candidate_id: str, resume_data: ResumeData):
+        """Index a candidate, replacing any previous entry for it."""
+        terms = candidate_terms(resume_data)
+        with self._lock:
+            self._remove(candidate_id)
+            doc_id = len(self._candidate_ids)
+            self._candidate_ids.append(candidate_id)
+            self._doc_terms.append(terms)
+            self._doc_ids[candidate_id] = doc_id
+            self._live += 1
+            for term in terms:
+                self._postings.setdefault(term, array("i")).append(doc_id)
+            self._maybe_compact()
+
+    def remove(self, candidate_id: str) -> bool:
+        with self._lock:
+            removed = self._remove(candidate_id)
+            self._maybe_compact()
+            return removed
+
+    def _remove(self, candidate_id: str) -> bool:
+        doc_id = self._doc_ids.pop(candidate_id, None)
+        if doc_id is None:
+            return False
+        self._candidate_ids[doc_id] = None
+        self._live -= 1
+        return True
+
+    def _maybe_compact(self):
+        """Rebuild the postings without tombstones once half of the documents are dead."""
+        if len(self._candidate_ids) < 64 or self._live * 2 > len(self._candidate_ids):
+            return
+        live = [
+            (candidate_id, terms) for candidate_id, terms in zip(self._candidate_ids, self._doc_terms)
+            if candidate_id is not None
+        ]
+        self._reset()
+        for doc_id, (candidate_id, terms) in enumerate(live):
+            self._candidate_ids.append(candidate_id)
+            self._doc_terms.append(terms)
+            self._doc_ids[candidate_id] = doc_id
+            for term in terms:
+                self._postings.setdefault(term, array("i")).append(doc_id)
+        self._live = len(live)
+
+    def postings(self, term: str) -> np.ndarray:
+        """Sorted document ids indexed under term (tombstones included)."""
+        posting = self._postings.get(term)
+        if posting is None:
+            return np.empty(0, dtype=np.int32)
+        return np.frombuffer(posting, dtype=np.int32).copy()
+
+    def retrieve(self, terms: Iterable[str], min_match: int = 1) -> List[str]:
+        """Candidate ids indexed under at least min_match of terms, in indexing order."""
+        terms = set(terms)
+        with self._lock:
+            n_docs = len(self._candidate_ids)
+            if min_match <= 0:
+                return [candidate_id for candidate_id in self._candidate_ids if candidate_id is not None]
+
+            # Count, per document, how many of the terms it is indexed under
+            lists = [self.postings(term) for term in terms]
+            lists = [posting for posting in lists if len(posting)]
+            if len(lists) < min_match:
+                return []
+            coverage = np.bincount(np.concatenate(lists), minlength=n_docs)
+            matched = (self._candidate_ids[doc_id] for doc_id in np.flatnonzero(coverage >= min_match))
+            return [candidate_id for candidate_id in matched if candidate_id is not None]
+
+    def retrieve_for_job(self, job_requirement: JobRequirement, min_required_skills: int = 1) -> List[str]:
+        """Candidates covering at least min_required_skills of the job's required skills.
+
+        A job without required skills (or min_required_skills of 0) retrieves the whole pool.
+        """
+        required = {SKILL_PREFIX + skill.lower().strip() for skill in job_requirement.required_skills if skill.strip()}
+        return self.retrieve(required, min(min_required_skills, len(required)))
+
+    @classmethod
+    def from_store(cls, store) -> "SkillIndex":
+        """Index every candidate of a candidate store."""
+        index = cls()
+        candidate_ids = store.ids()
+        for start in range(0, len(candidate_ids), _BUILD_BATCH):
+            for candidate in store.get_many(candidate_ids[start:start + _BUILD_BATCH]):
+                if candidate is not None:
+                    index.add(candidate.candidate_id, candidate.resume_data)
+        logger.info(f"Indexed {len(index)} stored candidates under {len(index._postings)} terms")
+        return index
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "candidates": self._live,
+                "documents": len(self._candidate_ids),
+                "terms": len(self._postings),
+                "postings": sum(len(posting) for posting in self._postings.values())
+            }
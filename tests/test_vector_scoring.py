@@ -0,0 +1,119 @@
+"""BatchScorer must give the same score components as ResumeRanker.rank_resume."""
+from datetime import date
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from models.job_model import JobRequirement
+from models.response_model import Education, Experience, ResumeData
+from parser.job_profile import SCORE_COMPONENTS
+from parser.resume_ranker import ResumeRanker
+from parser.vector_scoring import BatchScorer
+
+TOLERANCE = 1e-9
+
+
+class BlankRanker(ResumeRanker):
+    """Ranking only tokenizes text, so a blank English pipeline stands in for the trained model."""
+
+    _blank = None
+
+    @property
+    def nlp(self):
+        if BlankRanker._blank is None:
+            BlankRanker._blank = spacy.blank("en")
+        return BlankRanker._blank
+
+
+def _experience(title, company, start, end, description, skills):
+    return Experience(title=title, company=company, start_date=start, end_date=end,
+                      description=description, skills_used=skills)
+
+
+RESUMES = [
+    # Market trend skills, upward mobility, matching certification and cultural keywords
+    ResumeData(
+        name="Full Profile", email="full@example.com",
+        skills=["Python", "SQL", "Docker", "Cloud Computing", "AI/ML", "Blockchain", "Teamwork", "python"],
+        experience=[
+            _experience("Software Engineer", "Acme Corp", date(2015, 1, 1), date(2018, 6, 1),
+                        ["Built a data pipeline in Python", "Collaboration with the innovation team"], ["Python", "SQL"]),
+            _experience("Senior Software Engineer", "Globex", date(2018, 7, 1), date(2023, 1, 1),
+                        ["Led the payments API with integrity and excellence"], ["Docker", "Python"]),
+        ],
+        education=[Education(degree="Master's Degree", institution="State University", graduation_year=2014)],
+        certifications=["AWS Certified Solutions Architect", "PMP"],
+        summary="Customer focus and innovation"
+    ),
+    # No experience
+    ResumeData(
+        name="No Experience", email="new@example.com", skills=["Python", "Java"], experience=[],
+        education=[Education(degree="Bachelor's Degree", institution="City College", graduation_year=2023)]
+    ),
+    # No education, gaps between short jobs, no skills
+    ResumeData(
+        name="No Education", email="gaps@example.com", skills=[],
+        experience=[
+            _experience("Data Analyst", "Initech", date(2016, 1, 1), date(2016, 9, 1), ["Reporting dashboard"], []),
+            _experience("Data Analyst", "Hooli", date(2017, 6, 1), date(2018, 1, 1), ["Excel reports"], ["Excel"]),
+            _experience("Data Scientist", "Umbrella Labs", date(2019, 3, 1), date(2019, 10, 1), [], ["Pandas"]),
+            _experience("Data Scientist", "Stark Industries", date(2020, 6, 1), date(2021, 2, 1), ["Machine learning"], []),
+        ],
+        education=[]
+    ),
+    # Undated experience and an unknown degree
+    ResumeData(
+        name="Undated", email="undated@example.com", skills=["DevOps", "Kubernetes", "Go"],
+        experience=[_experience("DevOps Engineer", "Wayne Systems", None, None, ["Kubernetes clusters"], ["Go"])],
+        education=[Education(degree="Bootcamp", institution="Online", graduation_year=2020)],
+        certifications=["Certified Kubernetes Administrator"]
+    ),
+    # A misread end date (before its start): reported as an employment gap and a promotion
+    ResumeData(
+        name="Misread Dates", email="dates@example.com", skills=["Java", "Cloud Computing"],
+        experience=[
+            _experience("Senior Developer", "Acme Corp", date(2012, 1, 1), date(2014, 1, 1), ["Java services"], ["Java"]),
+            _experience("Junior Developer", "Globex", date(2020, 1, 1), date(2010, 6, 1), ["Teamwork"], ["Java"]),
+        ],
+        education=[Education(degree="Doctorate", institution="National University", graduation_year=2011)]
+    ),
+]
+
+JOBS = {
+    "certifications_and_values": JobRequirement(
+        title="Senior Software Engineer", required_skills=["Python", "SQL", "Docker"],
+        preferred_skills=["Kubernetes", "AWS"], experience_years=5, education_level="Bachelor's Degree",
+        industry="Technology", keywords=["backend"],
+        required_certifications=["AWS Certified Solutions Architect", "CISSP"],
+        company_values=["innovation", "integrity"]
+    ),
+    "no_required_skills": JobRequirement(
+        title="Data Analyst", required_skills=[], preferred_skills=["Excel"], experience_years=0,
+        education_level="High School", industry="Data Science", keywords=[]
+    ),
+    "no_skills_at_all": JobRequirement(
+        title="Engineer", required_skills=[], preferred_skills=[], experience_years=3,
+        education_level="Doctorate", industry="Unknown", keywords=[]
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def ranker():
+    return BlankRanker()
+
+
+@pytest.mark.parametrize("job_name", sorted(JOBS))
+def test_batch_scores_match_rank_resume(ranker, job_name):
+    job = JOBS[job_name]
+    scorer = BatchScorer(ranker)
+    scores = scorer.score(scorer.encode(RESUMES), ranker.job_profile(job))
+
+    for i, resume in enumerate(RESUMES):
+        match = ranker.rank_resume(resume, job)
+        assert "components" in match.match_details, match.match_details.get("error")
+        components = match.match_details["components"]
+        for name in SCORE_COMPONENTS:
+            assert scores[name][i] == pytest.approx(components[name], abs=TOLERANCE), (resume.name, name)
+        assert scores["match_score"][i] == pytest.approx(match.match_score, abs=TOLERANCE), resume.name